@@ -25,8 +25,18 @@ def upgrade() -> None:
     # Add status column to photos table
     op.add_column('photos', sa.Column('status', sa.Enum('pending_upload', 'uploaded', 'processing', 'completed', 'failed', name='photostatus'), nullable=False, server_default='pending_upload'))
 
-    # Create index on status column
-    op.create_index(op.f('ix_photos_status'), 'photos', ['status'], unique=False)
+    # Create index on status column. Built concurrently (outside the migration
+    # transaction) so reads and writes on photos are not blocked during the build,
+    # and partial because lookups only target photos that are still in flight.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_photos_status'),
+            'photos',
+            ['status'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("status IN ('pending_upload', 'uploaded', 'processing')"),
+        )
 
 
 def downgrade() -> None:
@@ -19,18 +19,23 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add password_hash column to users table
-    op.add_column('users', sa.Column('password_hash', sa.String(length=255), nullable=True))
-
-    # Set a default password hash for existing users (they will need to reset password)
-    # Using bcrypt hash of "ChangeMe123!" as temporary password
-    op.execute(
-        "UPDATE users SET password_hash = '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYqgdOwjuji' "
-        "WHERE password_hash IS NULL"
+    # Add password_hash column to users table.
+    # Existing users get a default password hash (they will need to reset password)
+    # using bcrypt hash of "ChangeMe123!" as temporary password. Adding the column
+    # as NOT NULL with a constant default is a catalog-only change on Postgres 11+,
+    # so no UPDATE backfill or SET NOT NULL validation scan is needed.
+    op.add_column(
+        'users',
+        sa.Column(
+            'password_hash',
+            sa.String(length=255),
+            nullable=False,
+            server_default='$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYqgdOwjuji',
+        ),
     )
 
-    # Make password_hash non-nullable
-    op.alter_column('users', 'password_hash', nullable=False)
+    # Drop the default so new users must provide a real hash
+    op.alter_column('users', 'password_hash', server_default=None)
 
 
 def downgrade() -> None:
@@ -33,7 +33,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['detection_id'], ['detections.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('id')
     )
     op.create_index(op.f('ix_user_feedback_detection_id'), 'user_feedback', ['detection_id'], unique=False)
     op.create_index(op.f('ix_user_feedback_feedback_type'), 'user_feedback', ['feedback_type'], unique=False)
@@ -56,14 +55,20 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['changed_by'], ['users.id'], ondelete='SET NULL'),
         sa.ForeignKeyConstraint(['detection_id'], ['detections.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('id')
     )
-    op.create_index(op.f('ix_detection_history_detection_id'), 'detection_history', ['detection_id'], unique=False)
+    # History is read as "versions of detection X, newest first"; ordering the
+    # index by version lets Postgres walk it without a separate sort
+    op.create_index(
+        'ix_detection_history_detection_id_version',
+        'detection_history',
+        ['detection_id', sa.text('version DESC')],
+        unique=False,
+    )
 
 
 def downgrade() -> None:
     # Drop indexes first
-    op.drop_index(op.f('ix_detection_history_detection_id'), table_name='detection_history')
+    op.drop_index('ix_detection_history_detection_id_version', table_name='detection_history')
     op.drop_table('detection_history')
 
     op.drop_index(op.f('ix_user_feedback_user_id'), table_name='user_feedback')
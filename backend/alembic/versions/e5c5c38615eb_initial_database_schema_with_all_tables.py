@@ -20,6 +20,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
+    # Foreign keys are DEFERRABLE INITIALLY DEFERRED so bulk loads (e.g. seed
+    # data) can insert rows in any order within a transaction; the checks run
+    # once at COMMIT.
+
     # Create organizations table
     op.create_table(
         'organizations',
@@ -40,10 +44,8 @@ def upgrade() -> None:
         sa.Column('organization_id', UUID(as_uuid=True), nullable=False),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], deferrable=True, initially='DEFERRED'),
     )
-    op.create_index('ix_users_email', 'users', ['email'])
-    op.create_index('ix_users_organization_id', 'users', ['organization_id'])
 
     # Create projects table
     op.create_table(
@@ -55,9 +57,8 @@ def upgrade() -> None:
         sa.Column('status', sa.String(50), nullable=False, server_default='active'),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], deferrable=True, initially='DEFERRED'),
     )
-    op.create_index('ix_projects_organization_id', 'projects', ['organization_id'])
 
     # Create photos table
     op.create_table(
@@ -75,12 +76,9 @@ def upgrade() -> None:
         sa.Column('uploaded_at', sa.DateTime(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], deferrable=True, initially='DEFERRED'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], deferrable=True, initially='DEFERRED'),
     )
-    op.create_index('ix_photos_user_id', 'photos', ['user_id'])
-    op.create_index('ix_photos_project_id', 'photos', ['project_id'])
-    op.create_index('ix_photos_created_at', 'photos', ['created_at'])
 
     # Create detections table
     op.create_table(
@@ -90,20 +88,16 @@ def upgrade() -> None:
         sa.Column('detection_type', sa.String(50), nullable=False),
         sa.Column('model_version', sa.String(100), nullable=True),
         sa.Column('results', JSONB(), nullable=False),
-        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('confidence', sa.REAL(), nullable=True),
         sa.Column('processing_time_ms', sa.Integer(), nullable=True),
         sa.Column('user_confirmed', sa.Boolean(), nullable=False, server_default='false'),
         sa.Column('user_feedback', JSONB(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='CASCADE', deferrable=True, initially='DEFERRED'),
         sa.CheckConstraint('confidence >= 0 AND confidence <= 1', name='check_confidence_range'),
         sa.CheckConstraint('processing_time_ms > 0', name='check_processing_time_positive'),
     )
-    op.create_index('ix_detections_photo_id', 'detections', ['photo_id'])
-    op.create_index('ix_detections_detection_type', 'detections', ['detection_type'])
-    op.create_index('ix_detections_created_at', 'detections', ['created_at'])
-    op.create_index('ix_detections_user_confirmed', 'detections', ['user_confirmed'])
 
     # Create tags table
     op.create_table(
@@ -112,16 +106,61 @@ def upgrade() -> None:
         sa.Column('photo_id', UUID(as_uuid=True), nullable=False),
         sa.Column('tag', sa.String(100), nullable=False),
         sa.Column('source', sa.String(20), nullable=False, server_default='ai'),
-        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('confidence', sa.REAL(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='CASCADE', deferrable=True, initially='DEFERRED'),
         sa.CheckConstraint(
             'confidence IS NULL OR (confidence >= 0 AND confidence <= 1)',
             name='check_tag_confidence_range'
         ),
         sa.CheckConstraint("source IN ('ai', 'user')", name='check_tag_source'),
     )
+
+    # Create indexes once all tables (with inline foreign keys) exist, so the
+    # whole schema is laid down in a single pass inside the migration transaction
+    op.create_index('ix_users_email', 'users', ['email'])
+    op.create_index('ix_users_organization_id', 'users', ['organization_id'])
+    op.create_index('ix_projects_organization_id', 'projects', ['organization_id'])
+    op.create_index('ix_photos_user_id', 'photos', ['user_id'])
+    op.create_index('ix_photos_project_id', 'photos', ['project_id'])
+    # photos is append-mostly, so created_at correlates with physical order and a
+    # BRIN index answers time-range scans at a tiny fraction of a b-tree's size
+    op.create_index(
+        'ix_photos_created_at',
+        'photos',
+        ['created_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+    # jsonb_path_ops GIN indexes are smaller and faster than the default GIN
+    # opclass, and cover the @> containment filters used on JSONB payloads
+    op.create_index(
+        'ix_photos_exif_data',
+        'photos',
+        ['exif_data'],
+        postgresql_using='gin',
+        postgresql_ops={'exif_data': 'jsonb_path_ops'},
+    )
+    # Covering index: per-photo lookups filter on type/confidence and sort by
+    # created_at, so those columns are kept in the leaf pages to allow
+    # index-only scans (and filtering before any heap fetch)
+    op.create_index(
+        'ix_detections_photo_id',
+        'detections',
+        ['photo_id'],
+        postgresql_include=['detection_type', 'confidence', 'created_at'],
+    )
+    op.create_index('ix_detections_detection_type', 'detections', ['detection_type'])
+    op.create_index('ix_detections_created_at', 'detections', ['created_at'])
+    op.create_index('ix_detections_user_confirmed', 'detections', ['user_confirmed'])
+    op.create_index(
+        'ix_detections_results',
+        'detections',
+        ['results'],
+        postgresql_using='gin',
+        postgresql_ops={'results': 'jsonb_path_ops'},
+    )
     op.create_index('ix_tags_photo_id', 'tags', ['photo_id'])
     op.create_index('ix_tags_tag', 'tags', ['tag'])
 
@@ -5,6 +5,7 @@ Creates sample organizations, users, projects, photos, detections, and tags.
 """
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -13,6 +14,7 @@ import uuid
 # Add parent directory to path to import our modules
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import async_engine, Base, AsyncSessionLocal
 from src.models import Organization, User, Project, Photo, Detection, Tag
@@ -25,224 +27,287 @@ async def create_tables():
     print("✓ Database tables created")
 
 
+async def copy_rows(session: AsyncSession, model, rows: list[dict]) -> None:
+    """
+    Bulk-load rows for a model with COPY FROM STDIN.
+
+    Streams binary tuples over the session's own connection (and therefore its
+    transaction), avoiding per-row INSERT parsing. COPY bypasses Python-side column
+    defaults, so ids and timestamps are filled in here and JSON values are encoded
+    up front.
+    """
+    now = datetime.utcnow()
+    rows = [{"id": uuid.uuid4(), **row} for row in rows]
+    columns = list(rows[0])
+    records = [
+        tuple(
+            json.dumps(row[column]) if isinstance(row[column], dict) else row[column]
+            for column in columns
+        )
+        + (now, now)
+        for row in rows
+    ]
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        model.__tablename__,
+        records=records,
+        columns=columns + ["created_at", "updated_at"],
+    )
+
+
 async def seed_data():
     """Seed the database with sample data"""
     async with AsyncSessionLocal() as session:
         try:
-            # Create organizations
-            org1 = Organization(
-                name="ACME Construction Co."
+            # Generate ids up front so child rows know their parents' keys
+            acme_id, buildright_id = uuid.uuid4(), uuid.uuid4()
+            john_id, jane_id, bob_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+            office_project_id, residential_project_id, bridge_project_id = (
+                uuid.uuid4(),
+                uuid.uuid4(),
+                uuid.uuid4(),
             )
-            org2 = Organization(
-                name="BuildRight Contractors"
+            photo1_id, photo2_id, photo3_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+            # Create organizations. Names are unique, so ON CONFLICT DO NOTHING
+            # doubles as the "already seeded" check and makes re-runs a no-op.
+            org_rows = [
+                {"id": acme_id, "name": "ACME Construction Co."},
+                {"id": buildright_id, "name": "BuildRight Contractors"},
+            ]
+            result = await session.execute(
+                pg_insert(Organization)
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(Organization.id),
+                org_rows,
             )
-            session.add_all([org1, org2])
-            await session.flush()
+            if len(result.all()) < len(org_rows):
+                await session.rollback()
+                print("✓ Sample data already present, nothing to seed")
+                return
             print("✓ Created organizations")
 
             # Create users
-            user1 = User(
-                email="john.doe@acme.com",
-                first_name="John",
-                last_name="Doe",
-                role="contractor",
-                organization_id=org1.id,
-            )
-            user2 = User(
-                email="jane.smith@acme.com",
-                first_name="Jane",
-                last_name="Smith",
-                role="project_manager",
-                organization_id=org1.id,
+            await copy_rows(
+                session,
+                User,
+                [
+                    {
+                        "id": john_id,
+                        "email": "john.doe@acme.com",
+                        "first_name": "John",
+                        "last_name": "Doe",
+                        "role": "contractor",
+                        "organization_id": acme_id,
+                    },
+                    {
+                        "id": jane_id,
+                        "email": "jane.smith@acme.com",
+                        "first_name": "Jane",
+                        "last_name": "Smith",
+                        "role": "project_manager",
+                        "organization_id": acme_id,
+                    },
+                    {
+                        "id": bob_id,
+                        "email": "bob.wilson@buildright.com",
+                        "first_name": "Bob",
+                        "last_name": "Wilson",
+                        "role": "insurance_adjuster",
+                        "organization_id": buildright_id,
+                    },
+                ],
             )
-            user3 = User(
-                email="bob.wilson@buildright.com",
-                first_name="Bob",
-                last_name="Wilson",
-                role="insurance_adjuster",
-                organization_id=org2.id,
-            )
-            session.add_all([user1, user2, user3])
-            await session.flush()
             print("✓ Created users")
 
             # Create projects
-            project1 = Project(
-                organization_id=org1.id,
-                name="Downtown Office Renovation",
-                description="Complete renovation of 5-story office building",
-                status="active",
-            )
-            project2 = Project(
-                organization_id=org1.id,
-                name="Residential Complex - Building A",
-                description="New construction of 50-unit residential building",
-                status="active",
-            )
-            project3 = Project(
-                organization_id=org2.id,
-                name="Highway Bridge Inspection",
-                description="Annual inspection and damage assessment",
-                status="completed",
+            await copy_rows(
+                session,
+                Project,
+                [
+                    {
+                        "id": office_project_id,
+                        "organization_id": acme_id,
+                        "name": "Downtown Office Renovation",
+                        "description": "Complete renovation of 5-story office building",
+                        "status": "active",
+                    },
+                    {
+                        "id": residential_project_id,
+                        "organization_id": acme_id,
+                        "name": "Residential Complex - Building A",
+                        "description": "New construction of 50-unit residential building",
+                        "status": "active",
+                    },
+                    {
+                        "id": bridge_project_id,
+                        "organization_id": buildright_id,
+                        "name": "Highway Bridge Inspection",
+                        "description": "Annual inspection and damage assessment",
+                        "status": "completed",
+                    },
+                ],
             )
-            session.add_all([project1, project2, project3])
-            await session.flush()
             print("✓ Created projects")
 
             # Create photos
-            photo1 = Photo(
-                user_id=user1.id,
-                project_id=project1.id,
-                s3_url="https://s3.amazonaws.com/companycam-photos/test/photo1.jpg",
-                s3_key="test/photo1.jpg",
-                file_size_bytes=2048576,
-                mime_type="image/jpeg",
-                width=4032,
-                height=3024,
-                exif_data={
-                    "camera": "iPhone 13 Pro",
-                    "gps": {"lat": 40.7128, "lon": -74.0060},
-                    "timestamp": "2025-11-15T10:30:00Z",
-                },
-                uploaded_at=datetime.utcnow() - timedelta(days=2),
-            )
-            photo2 = Photo(
-                user_id=user1.id,
-                project_id=project1.id,
-                s3_url="https://s3.amazonaws.com/companycam-photos/test/photo2.jpg",
-                s3_key="test/photo2.jpg",
-                file_size_bytes=1843200,
-                mime_type="image/jpeg",
-                width=4032,
-                height=3024,
-                exif_data={
-                    "camera": "iPhone 13 Pro",
-                    "gps": {"lat": 40.7129, "lon": -74.0061},
-                    "timestamp": "2025-11-15T14:20:00Z",
-                },
-                uploaded_at=datetime.utcnow() - timedelta(days=1),
-            )
-            photo3 = Photo(
-                user_id=user3.id,
-                project_id=project3.id,
-                s3_url="https://s3.amazonaws.com/companycam-photos/test/photo3.jpg",
-                s3_key="test/photo3.jpg",
-                file_size_bytes=3145728,
-                mime_type="image/jpeg",
-                width=3840,
-                height=2160,
-                exif_data={
-                    "camera": "Canon EOS R5",
-                    "gps": {"lat": 41.8781, "lon": -87.6298},
-                    "timestamp": "2025-11-10T09:15:00Z",
-                },
-                uploaded_at=datetime.utcnow() - timedelta(days=7),
+            await copy_rows(
+                session,
+                Photo,
+                [
+                    {
+                        "id": photo1_id,
+                        "user_id": john_id,
+                        "project_id": office_project_id,
+                        "s3_url": "https://s3.amazonaws.com/companycam-photos/test/photo1.jpg",
+                        "s3_key": "test/photo1.jpg",
+                        "file_size_bytes": 2048576,
+                        "mime_type": "image/jpeg",
+                        "width": 4032,
+                        "height": 3024,
+                        "exif_data": {
+                            "camera": "iPhone 13 Pro",
+                            "gps": {"lat": 40.7128, "lon": -74.0060},
+                            "timestamp": "2025-11-15T10:30:00Z",
+                        },
+                        "uploaded_at": datetime.utcnow() - timedelta(days=2),
+                    },
+                    {
+                        "id": photo2_id,
+                        "user_id": john_id,
+                        "project_id": office_project_id,
+                        "s3_url": "https://s3.amazonaws.com/companycam-photos/test/photo2.jpg",
+                        "s3_key": "test/photo2.jpg",
+                        "file_size_bytes": 1843200,
+                        "mime_type": "image/jpeg",
+                        "width": 4032,
+                        "height": 3024,
+                        "exif_data": {
+                            "camera": "iPhone 13 Pro",
+                            "gps": {"lat": 40.7129, "lon": -74.0061},
+                            "timestamp": "2025-11-15T14:20:00Z",
+                        },
+                        "uploaded_at": datetime.utcnow() - timedelta(days=1),
+                    },
+                    {
+                        "id": photo3_id,
+                        "user_id": bob_id,
+                        "project_id": bridge_project_id,
+                        "s3_url": "https://s3.amazonaws.com/companycam-photos/test/photo3.jpg",
+                        "s3_key": "test/photo3.jpg",
+                        "file_size_bytes": 3145728,
+                        "mime_type": "image/jpeg",
+                        "width": 3840,
+                        "height": 2160,
+                        "exif_data": {
+                            "camera": "Canon EOS R5",
+                            "gps": {"lat": 41.8781, "lon": -87.6298},
+                            "timestamp": "2025-11-10T09:15:00Z",
+                        },
+                        "uploaded_at": datetime.utcnow() - timedelta(days=7),
+                    },
+                ],
             )
-            session.add_all([photo1, photo2, photo3])
-            await session.flush()
             print("✓ Created photos")
 
             # Create detections
-            detection1 = Detection(
-                photo_id=photo1.id,
-                detection_type="damage",
-                model_version="yolov8-damage-v1.0",
-                results={
-                    "detections": [
-                        {
-                            "class": "crack",
-                            "confidence": 0.92,
-                            "bbox": [100, 150, 300, 400],
+            await copy_rows(
+                session,
+                Detection,
+                [
+                    {
+                        "photo_id": photo1_id,
+                        "detection_type": "damage",
+                        "model_version": "yolov8-damage-v1.0",
+                        "results": {
+                            "detections": [
+                                {
+                                    "class": "crack",
+                                    "confidence": 0.92,
+                                    "bbox": [100, 150, 300, 400],
+                                },
+                                {
+                                    "class": "water_damage",
+                                    "confidence": 0.78,
+                                    "bbox": [500, 200, 700, 500],
+                                },
+                            ]
                         },
-                        {
-                            "class": "water_damage",
-                            "confidence": 0.78,
-                            "bbox": [500, 200, 700, 500],
+                        "confidence": 0.92,
+                        "processing_time_ms": 245,
+                        "user_confirmed": False,
+                        "user_feedback": None,
+                    },
+                    {
+                        "photo_id": photo2_id,
+                        "detection_type": "material",
+                        "model_version": "yolov8-material-v1.0",
+                        "results": {
+                            "detections": [
+                                {
+                                    "class": "concrete",
+                                    "confidence": 0.95,
+                                    "bbox": [0, 0, 4032, 3024],
+                                }
+                            ]
                         },
-                    ]
-                },
-                confidence=0.92,
-                processing_time_ms=245,
-                user_confirmed=False,
-            )
-            detection2 = Detection(
-                photo_id=photo2.id,
-                detection_type="material",
-                model_version="yolov8-material-v1.0",
-                results={
-                    "detections": [
-                        {
-                            "class": "concrete",
-                            "confidence": 0.95,
-                            "bbox": [0, 0, 4032, 3024],
-                        }
-                    ]
-                },
-                confidence=0.95,
-                processing_time_ms=198,
-                user_confirmed=True,
-                user_feedback={"notes": "Correct identification"},
-            )
-            detection3 = Detection(
-                photo_id=photo3.id,
-                detection_type="damage",
-                model_version="yolov8-damage-v1.0",
-                results={
-                    "detections": [
-                        {
-                            "class": "rust",
-                            "confidence": 0.88,
-                            "bbox": [1200, 800, 1800, 1500],
-                        }
-                    ]
-                },
-                confidence=0.88,
-                processing_time_ms=312,
-                user_confirmed=True,
+                        "confidence": 0.95,
+                        "processing_time_ms": 198,
+                        "user_confirmed": True,
+                        "user_feedback": {"notes": "Correct identification"},
+                    },
+                    {
+                        "photo_id": photo3_id,
+                        "detection_type": "damage",
+                        "model_version": "yolov8-damage-v1.0",
+                        "results": {
+                            "detections": [
+                                {
+                                    "class": "rust",
+                                    "confidence": 0.88,
+                                    "bbox": [1200, 800, 1800, 1500],
+                                }
+                            ]
+                        },
+                        "confidence": 0.88,
+                        "processing_time_ms": 312,
+                        "user_confirmed": True,
+                        "user_feedback": None,
+                    },
+                ],
             )
-            session.add_all([detection1, detection2, detection3])
-            await session.flush()
             print("✓ Created detections")
 
             # Create tags
-            tag1 = Tag(
-                photo_id=photo1.id,
-                tag="crack",
-                source="ai",
-                confidence=0.92,
-            )
-            tag2 = Tag(
-                photo_id=photo1.id,
-                tag="water damage",
-                source="ai",
-                confidence=0.78,
-            )
-            tag3 = Tag(
-                photo_id=photo1.id,
-                tag="needs repair",
-                source="user",
-                confidence=None,
-            )
-            tag4 = Tag(
-                photo_id=photo2.id,
-                tag="concrete",
-                source="ai",
-                confidence=0.95,
-            )
-            tag5 = Tag(
-                photo_id=photo3.id,
-                tag="rust",
-                source="ai",
-                confidence=0.88,
-            )
-            tag6 = Tag(
-                photo_id=photo3.id,
-                tag="bridge inspection",
-                source="user",
-                confidence=None,
+            await copy_rows(
+                session,
+                Tag,
+                [
+                    {"photo_id": photo1_id, "tag": "crack", "source": "ai", "confidence": 0.92},
+                    {
+                        "photo_id": photo1_id,
+                        "tag": "water damage",
+                        "source": "ai",
+                        "confidence": 0.78,
+                    },
+                    {
+                        "photo_id": photo1_id,
+                        "tag": "needs repair",
+                        "source": "user",
+                        "confidence": None,
+                    },
+                    {"photo_id": photo2_id, "tag": "concrete", "source": "ai", "confidence": 0.95},
+                    {"photo_id": photo3_id, "tag": "rust", "source": "ai", "confidence": 0.88},
+                    {
+                        "photo_id": photo3_id,
+                        "tag": "bridge inspection",
+                        "source": "user",
+                        "confidence": None,
+                    },
+                ],
             )
-            session.add_all([tag1, tag2, tag3, tag4, tag5, tag6])
-            await session.flush()
             print("✓ Created tags")
 
             await session.commit()
@@ -1,14 +1,23 @@
 """Configuration for damage detection models"""
 
-from typing import Dict, Any
+import logging
+import os
+from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
+ENGINE_PATH_DESCRIPTION = (
+    "Path to a prebuilt TensorRT engine; preferred over model_path when the file exists"
+)
+
 
 class DetectorConfig(BaseModel):
     """Configuration for YOLOv8 damage detector"""
-    model_config = {"protected_namespaces": ()}
+    model_config = {"protected_namespaces": (), "frozen": True}
 
     model_path: str = Field(default="models/damage_yolov8.pt", description="Path to YOLOv8 model weights")
+    engine_path: Optional[str] = Field(default=None, description=ENGINE_PATH_DESCRIPTION)
     confidence_threshold: float = Field(default=0.7, ge=0.0, le=1.0)
     iou_threshold: float = Field(default=0.45, ge=0.0, le=1.0, description="NMS IoU threshold")
     input_size: int = Field(default=640, description="Model input size (square)")
@@ -18,9 +27,10 @@ class DetectorConfig(BaseModel):
 
 class SegmenterConfig(BaseModel):
     """Configuration for U-Net segmentation model"""
-    model_config = {"protected_namespaces": ()}
+    model_config = {"protected_namespaces": (), "frozen": True}
 
     model_path: str = Field(default="models/damage_unet.pt", description="Path to U-Net model weights")
+    engine_path: Optional[str] = Field(default=None, description=ENGINE_PATH_DESCRIPTION)
     confidence_threshold: float = Field(default=0.5, ge=0.0, le=1.0)
     input_size: int = Field(default=512, description="Model input size (square)")
     device: str = Field(default="cpu", description="Device for inference: 'cpu' or 'cuda'")
@@ -28,17 +38,22 @@ class SegmenterConfig(BaseModel):
 
 class SeverityClassifierConfig(BaseModel):
     """Configuration for severity classifier (ResNet50)"""
-    model_config = {"protected_namespaces": ()}
+    model_config = {"protected_namespaces": (), "frozen": True}
 
     model_path: str = Field(default="models/severity_resnet50.pt", description="Path to classifier weights")
+    engine_path: Optional[str] = Field(default=None, description=ENGINE_PATH_DESCRIPTION)
     confidence_threshold: float = Field(default=0.6, ge=0.0, le=1.0)
     input_size: int = Field(default=224, description="Model input size (square)")
     device: str = Field(default="cpu", description="Device for inference: 'cpu' or 'cuda'")
 
 
 class DamageDetectionConfig(BaseModel):
-    """Main configuration for damage detection pipeline"""
-    model_config = {"protected_namespaces": ()}
+    """
+    Main configuration for damage detection pipeline.
+
+    Configs are immutable; derive variants with model_copy(update={...}).
+    """
+    model_config = {"protected_namespaces": (), "frozen": True}
 
     detector: DetectorConfig = Field(default_factory=DetectorConfig)
     segmenter: SegmenterConfig = Field(default_factory=SegmenterConfig)
@@ -49,8 +64,20 @@ class DamageDetectionConfig(BaseModel):
     enable_severity: bool = Field(default=True, description="Enable severity classification")
 
     # Performance settings
-    batch_size: int = Field(default=1, ge=1, le=32, description="Batch size for inference")
+    batch_size: int = Field(default=8, ge=1, le=32, description="Batch size for inference")
     max_image_dimension: int = Field(default=4096, description="Max image dimension before downsampling")
+    max_detection_workers: int = Field(
+        default=16, ge=1, description="Max threads used to process detections of one image concurrently"
+    )
+    max_upload_workers: int = Field(
+        default=16, ge=1, description="Threads in the shared pool that uploads masks to S3"
+    )
+    result_cache_size: int = Field(
+        default=1024, ge=0, description="Responses cached by image content hash (0 disables)"
+    )
+    result_cache_max_detections: int = Field(
+        default=20, ge=0, description="Responses with more detections than this are not cached"
+    )
 
     # S3 settings for mask storage
     s3_bucket: str = Field(default="companycam-damage-masks", description="S3 bucket for mask storage")
@@ -61,5 +88,24 @@ class DamageDetectionConfig(BaseModel):
         return self.model_dump()
 
 
-# Default configuration instance
+def resolve_weights_path(config: BaseModel) -> str:
+    """
+    Pick the weights file a model should load.
+
+    A configured TensorRT engine wins when it exists on disk; otherwise (no engine
+    built for this host, or a missing file) fall back to the framework weights.
+    """
+    engine_path = config.engine_path
+    if engine_path:
+        if os.path.exists(engine_path):
+            return engine_path
+        logger.warning(
+            f"TensorRT engine {engine_path} not found, falling back to {config.model_path}"
+        )
+    return config.model_path
+
+
+# Default configuration instance. Shared by every component that is not given an
+# explicit config; derive overrides with default_config.model_copy(update={...})
+# rather than constructing (and re-validating) a new DamageDetectionConfig.
 default_config = DamageDetectionConfig()
@@ -7,7 +7,7 @@ from typing import List, Tuple, Optional
 from PIL import Image
 import numpy as np
 
-from .config import DetectorConfig
+from .config import DetectorConfig, default_config, resolve_weights_path
 from src.schemas.damage_detection import DamageType, BoundingBox
 
 logger = logging.getLogger(__name__)
@@ -36,7 +36,7 @@ class DamageDetector:
     """
 
     def __init__(self, config: Optional[DetectorConfig] = None):
-        self.config = config or DetectorConfig()
+        self.config = config or default_config.detector
         self.model_loaded = False
         self.inference_count = 0
         logger.info(f"Initializing DamageDetector with config: {self.config.model_dump()}")
@@ -48,8 +48,12 @@ class DamageDetector:
         In production, this would use:
         from ultralytics import YOLO
         self.model = YOLO(self.config.model_path)
+
+        When config.engine_path points at an existing TensorRT engine (FP16/INT8,
+        built offline), that engine is deserialized instead of the weights above.
         """
-        logger.info(f"Loading YOLOv8 model from {self.config.model_path}")
+        weights_path = resolve_weights_path(self.config)
+        logger.info(f"Loading YOLOv8 model from {weights_path}")
         # Simulate model loading time
         time.sleep(0.01)
         self.model_loaded = True
@@ -76,12 +80,16 @@ class DamageDetector:
 
         return image_array, original_size
 
-    def detect(self, image: Image.Image) -> List[DetectionResult]:
+    def detect(
+        self, image: Image.Image, config: Optional[DetectorConfig] = None
+    ) -> List[DetectionResult]:
         """
         Run damage detection on an image.
 
         Args:
             image: PIL Image to detect damage in
+            config: Per-call filtering settings (confidence threshold, max detections);
+                defaults to the detector's config
 
         Returns:
             List of DetectionResult objects
@@ -100,17 +108,7 @@ class DamageDetector:
 
         # MOCK: Generate realistic detections
         detections = self._generate_mock_detections(img_width, img_height)
-
-        # Filter by confidence threshold
-        filtered_detections = [
-            d for d in detections if d.confidence >= self.config.confidence_threshold
-        ]
-
-        # Apply NMS (Non-Maximum Suppression) - simplified mock version
-        final_detections = self._apply_nms(filtered_detections)
-
-        # Limit max detections
-        final_detections = final_detections[: self.config.max_detections]
+        final_detections = self._postprocess(detections, config)
 
         inference_time = (time.time() - start_time) * 1000
         self.inference_count += 1
@@ -122,6 +120,65 @@ class DamageDetector:
 
         return final_detections
 
+    def detect_batch(self, images: List[Image.Image]) -> List[List[DetectionResult]]:
+        """
+        Run damage detection on several images with a single forward pass.
+
+        Args:
+            images: PIL Images to detect damage in
+
+        Returns:
+            One list of DetectionResult objects per input image, in input order
+
+        Note:
+            This is a MOCK implementation. In production, the stacked batch would be
+            passed to YOLOv8 in one call instead of one call per image.
+        """
+        if not images:
+            return []
+
+        if not self.model_loaded:
+            self.load_model()
+
+        start_time = time.time()
+
+        # Preprocess and stack into a single [N, H, W, 3] batch
+        preprocessed = [self.preprocess_image(image) for image in images]
+        batch = np.stack([processed for processed, _ in preprocessed])
+
+        # MOCK: Generate realistic detections for every image in the batch
+        results = [
+            self._postprocess(self._generate_mock_detections(*original_size))
+            for _, original_size in preprocessed
+        ]
+
+        inference_time = (time.time() - start_time) * 1000
+        self.inference_count += len(images)
+
+        logger.debug(
+            f"YOLOv8 batch detection completed: {batch.shape[0]} images, "
+            f"{sum(len(r) for r in results)} detections in {inference_time:.2f}ms"
+        )
+
+        return results
+
+    def _postprocess(
+        self, detections: List[DetectionResult], config: Optional[DetectorConfig] = None
+    ) -> List[DetectionResult]:
+        """Apply confidence filtering, NMS and the max detection limit"""
+        config = config or self.config
+
+        # Filter by confidence threshold
+        filtered_detections = [
+            d for d in detections if d.confidence >= config.confidence_threshold
+        ]
+
+        # Apply NMS (Non-Maximum Suppression) - simplified mock version
+        final_detections = self._apply_nms(filtered_detections)
+
+        # Limit max detections
+        return final_detections[: config.max_detections]
+
     def _generate_mock_detections(self, img_width: int, img_height: int) -> List[DetectionResult]:
         """
         Generate realistic mock detections for testing.
@@ -1,18 +1,24 @@
 """End-to-end damage detection pipeline orchestrating all models"""
 
 import logging
+import threading
 import time
-from typing import List, Optional, Dict
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Dict, Hashable
 from PIL import Image
-import io
+import numpy as np
+import xxhash
 
-from .config import DamageDetectionConfig
+from .config import DamageDetectionConfig, default_config
 from .detector import DamageDetector, DetectionResult
+from .preprocessing import downscale_for_rois
 from .segmenter import DamageSegmenter
 from .severity_classifier import SeverityClassifier
 from src.schemas.damage_detection import (
     DamageDetection,
     DamageDetectionResponse,
+    DamageSeverity,
     DamageSummary,
     DamageType,
 )
@@ -28,12 +34,28 @@ class DamageDetectionPipeline:
     - ResNet50 severity classification
     """
 
+    _ALL_DAMAGE_TYPES = tuple(DamageType)
+    _EMPTY_TYPE_DISTRIBUTION = {damage_type.value: 0 for damage_type in DamageType}
+    _DAMAGE_TYPE_TAGS = {
+        DamageType.HAIL_DAMAGE: "hail_impact",
+        DamageType.WIND_DAMAGE: "wind_damage",
+        DamageType.MISSING_SHINGLES: "missing_shingles",
+    }
+
     def __init__(self, config: Optional[DamageDetectionConfig] = None):
-        self.config = config or DamageDetectionConfig()
+        self.config = config or default_config
         self.detector = DamageDetector(self.config.detector)
         self.segmenter = DamageSegmenter(self.config.segmenter)
         self.severity_classifier = SeverityClassifier(self.config.severity_classifier)
         self.pipeline_loaded = False
+        # Threads are started on first use, so this costs nothing until masks are uploaded
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=self.config.max_upload_workers,
+            thread_name_prefix="damage-mask-upload",
+        )
+        # Responses keyed by image content hash, so resubmitted photos skip inference
+        self._result_cache: "OrderedDict[Hashable, DamageDetectionResponse]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         logger.info("Initializing DamageDetectionPipeline")
 
     def load_models(self):
@@ -41,11 +63,18 @@ class DamageDetectionPipeline:
         logger.info("Loading all damage detection models...")
         start_time = time.time()
 
-        self.detector.load_model()
+        # The models are independent; load them concurrently (deserialization and
+        # device allocation release the GIL)
+        loaders = [self.detector.load_model]
         if self.config.enable_segmentation:
-            self.segmenter.load_model()
+            loaders.append(self.segmenter.load_model)
         if self.config.enable_severity:
-            self.severity_classifier.load_model()
+            loaders.append(self.severity_classifier.load_model)
+
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = [executor.submit(loader) for loader in loaders]
+            for future in futures:
+                future.result()
 
         load_time = (time.time() - start_time) * 1000
         self.pipeline_loaded = True
@@ -57,6 +86,7 @@ class DamageDetectionPipeline:
         image: Image.Image,
         s3_service=None,
         photo_id: Optional[str] = None,
+        config: Optional[DamageDetectionConfig] = None,
     ) -> DamageDetectionResponse:
         """
         Process a single image through the full damage detection pipeline.
@@ -65,6 +95,10 @@ class DamageDetectionPipeline:
             image: PIL Image to process
             s3_service: Optional S3 service for uploading segmentation masks
             photo_id: Optional photo ID for S3 key generation
+            config: Per-call configuration (e.g. request overrides), used for this
+                image only; the pipeline is shared, so its own config is left alone.
+                Detector filtering, the enable_* switches, ROI sizing and caching
+                follow it; loaded models keep the settings they were built with.
 
         Returns:
             DamageDetectionResponse with all detections and metadata
@@ -72,85 +106,278 @@ class DamageDetectionPipeline:
         if not self.pipeline_loaded:
             self.load_models()
 
+        config = config or self.config
+
         start_time = time.time()
 
         logger.info(f"Processing image through damage detection pipeline (size: {image.size})")
 
+        # Decode to an RGB array once; it is hashed for the result cache (when
+        # enabled) and every ROI is sliced from it.
+        image_array = np.asarray(image.convert("RGB"))
+        cache_key = self._result_cache_key(image_array, s3_service, photo_id, config)
+        cached = self._get_cached_response(cache_key, start_time)
+        if cached is not None:
+            return cached
+
         # Step 1: Run object detection (YOLOv8)
-        detection_results = self.detector.detect(image)
+        detection_results = self.detector.detect(image, config.detector)
         logger.debug(f"YOLOv8 detected {len(detection_results)} damage regions")
 
-        # Step 2 & 3: For each detection, run segmentation and severity classification
-        damage_detections = []
+        # Negative images (the common case) skip ROI preparation entirely
+        if not detection_results:
+            response = self._build_response([], image.size, start_time)
+            self._cache_response(cache_key, response, config, uploads_requested=False)
+            return response
 
-        for idx, detection in enumerate(detection_results):
-            # Generate segmentation mask
-            segmentation_mask_url = None
-            area_percentage = 0.0
+        # Very large photos are downscaled once for ROI extraction; boxes and
+        # masks stay in original image coordinates.
+        roi_source, roi_scale = downscale_for_rois(image_array, config.max_image_dimension)
 
-            if self.config.enable_segmentation:
-                try:
-                    mask, area_pct = self.segmenter.segment(
-                        image, detection.bounding_box
-                    )
-                    area_percentage = area_pct
-
-                    # Upload mask to S3 if service provided
-                    if s3_service and photo_id:
-                        mask_bytes = self.segmenter.mask_to_bytes(mask)
-                        mask_key = (
-                            f"{self.config.s3_prefix}{photo_id}_damage{idx}.png"
-                        )
-                        segmentation_mask_url = s3_service.upload_bytes(
-                            mask_bytes, mask_key, content_type="image/png"
-                        )
-                        logger.debug(f"Uploaded segmentation mask to {segmentation_mask_url}")
-
-                except Exception as e:
-                    logger.error(f"Segmentation failed for detection {idx}: {e}")
-
-            # Classify severity
-            severity = None
-            severity_confidence = detection.confidence
-
-            if self.config.enable_severity:
-                try:
-                    severity, severity_confidence = (
-                        self.severity_classifier.classify_severity(
-                            image,
-                            detection.bounding_box,
-                            detection.damage_type,
-                            detection.confidence,
-                        )
-                    )
-                except Exception as e:
-                    logger.error(f"Severity classification failed for detection {idx}: {e}")
-                    # Default to moderate severity
-                    from src.schemas.damage_detection import DamageSeverity
-                    severity = DamageSeverity.MODERATE
-
-            # Create damage detection object
-            damage_det = DamageDetection(
-                type=detection.damage_type,
-                confidence=detection.confidence,
-                severity=severity,
-                bounding_box=detection.bounding_box,
-                segmentation_mask=segmentation_mask_url,
-                area_percentage=area_percentage,
+        # Step 2 & 3: For each detection, run segmentation and severity classification.
+        # Detections are independent, so they run concurrently; mask uploads are
+        # network-bound and the numpy/cv2 work releases the GIL.
+
+        def process_one(indexed_detection):
+            idx, detection = indexed_detection
+            return self._process_detection(
+                idx, detection, roi_source, roi_scale, s3_service, photo_id, config
             )
 
-            damage_detections.append(damage_det)
+        max_workers = min(config.max_detection_workers, len(detection_results))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                damage_detections = list(
+                    executor.map(process_one, enumerate(detection_results))
+                )
+        else:
+            damage_detections = [
+                process_one(indexed) for indexed in enumerate(detection_results)
+            ]
+
+        # Step 4: Generate summary, tags and response
+        response = self._build_response(damage_detections, image.size, start_time)
+        self._cache_response(
+            cache_key, response, config, uploads_requested=bool(s3_service and photo_id)
+        )
+        return response
 
-        # Step 4: Generate summary and tags
-        summary = self._generate_summary(damage_detections, image.size)
-        tags = self._generate_tags(damage_detections)
+    def _result_cache_key(
+        self,
+        image_array: np.ndarray,
+        s3_service,
+        photo_id: Optional[str],
+        config: Optional[DamageDetectionConfig] = None,
+    ) -> Optional[Hashable]:
+        """
+        Build the result cache key for an image, or None when the cache is disabled.
 
-        # Calculate overall confidence (average of detection confidences)
-        overall_confidence = 0.0
+        The key covers the decoded pixels and the active (frozen, hashable) config.
+        When masks are uploaded, the photo ID is part of the key as well, because
+        mask URLs are derived from it. Pixels are hashed in place with xxh3, a
+        non-cryptographic hash that is fast enough to run on every request.
+        """
+        config = config or self.config
+        if config.result_cache_size == 0:
+            return None
+        digest = xxhash.xxh3_128_hexdigest(np.ascontiguousarray(image_array).data)
+        return (digest, image_array.shape, config, photo_id if s3_service else None)
+
+    def _get_cached_response(
+        self,
+        cache_key: Optional[Hashable],
+        start_time: float,
+    ) -> Optional[DamageDetectionResponse]:
+        """Return a copy of a cached response (with fresh timing), or None on a miss"""
+        if cache_key is None:
+            return None
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._result_cache.move_to_end(cache_key)
+
+        logger.info("Damage detection served from result cache")
+        return cached.model_copy(
+            update={"processing_time_ms": int((time.time() - start_time) * 1000)}, deep=True
+        )
+
+    def _cache_response(
+        self,
+        cache_key: Optional[Hashable],
+        response: DamageDetectionResponse,
+        config: Optional[DamageDetectionConfig] = None,
+        uploads_requested: bool = False,
+    ):
+        """
+        Remember a response for repeat submissions of the same image.
+
+        Responses with many detections are skipped to bound memory, as are responses
+        whose mask uploads failed (so a retry gets a chance to upload them).
+        """
+        config = config or self.config
+        cache_size = config.result_cache_size
+        if cache_key is None or len(response.detections) > config.result_cache_max_detections:
+            return
+        if (
+            uploads_requested
+            and config.enable_segmentation
+            and any(d.segmentation_mask is None for d in response.detections)
+        ):
+            return
+
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = response.model_copy(deep=True)
+            self._result_cache.move_to_end(cache_key)
+            while len(self._result_cache) > cache_size:
+                self._result_cache.popitem(last=False)
+
+    def _process_detection(
+        self,
+        idx: int,
+        detection: DetectionResult,
+        image_array: np.ndarray,
+        roi_scale: float = 1.0,
+        s3_service=None,
+        photo_id: Optional[str] = None,
+        config: Optional[DamageDetectionConfig] = None,
+    ) -> DamageDetection:
+        """
+        Run segmentation and severity classification for a single detection.
+
+        Args:
+            idx: Index of the detection within the image (used in the mask key)
+            detection: YOLOv8 detection result
+            image_array: Full image as an RGB uint8 array (possibly downscaled)
+            roi_scale: Scale of image_array relative to the detection's box coordinates
+            s3_service: Optional S3 service for uploading segmentation masks
+            photo_id: Optional photo ID for S3 key generation
+            config: Per-call configuration (defaults to the pipeline's)
+
+        Returns:
+            DamageDetection for this region
+        """
+        config = config or self.config
+
+        # Generate segmentation mask
+        upload_future = None
+        area_percentage = 0.0
+
+        if config.enable_segmentation:
+            try:
+                mask, area_pct = self.segmenter.segment(
+                    image_array, detection.bounding_box, roi_scale
+                )
+                area_percentage = area_pct
+
+                # Upload mask to S3 in the background while severity is classified
+                if s3_service and photo_id:
+                    upload_future = self._submit_mask_upload(mask, idx, s3_service, photo_id)
+
+            except Exception as e:
+                logger.error(f"Segmentation failed for detection {idx}: {e}")
+
+        # Classify severity
+        severity = None
+        severity_confidence = detection.confidence
+
+        if config.enable_severity:
+            try:
+                severity, severity_confidence = self.severity_classifier.classify_severity(
+                    image_array,
+                    detection.bounding_box,
+                    detection.damage_type,
+                    detection.confidence,
+                    roi_scale,
+                )
+            except Exception as e:
+                logger.error(f"Severity classification failed for detection {idx}: {e}")
+                # Default to moderate severity
+                severity = DamageSeverity.MODERATE
+
+        segmentation_mask_url = self._wait_for_mask_upload(upload_future, idx)
+
+        # Create damage detection object
+        return DamageDetection(
+            type=detection.damage_type,
+            confidence=detection.confidence,
+            severity=severity,
+            bounding_box=detection.bounding_box,
+            segmentation_mask=segmentation_mask_url,
+            area_percentage=area_percentage,
+        )
+
+    def _submit_mask_upload(
+        self, mask: Image.Image, idx: int, s3_service, photo_id: str
+    ) -> Future:
+        """
+        Queue a segmentation mask upload on the shared upload thread pool.
+
+        Uploads are network-bound, so they run on their own pool (sized by
+        config.max_upload_workers) and overlap with the remaining model work.
+
+        Returns:
+            Future resolving to the S3 URL of the uploaded mask
+        """
+        return self._upload_executor.submit(self._upload_mask, mask, idx, s3_service, photo_id)
+
+    def _wait_for_mask_upload(self, upload_future: Optional[Future], idx: int) -> Optional[str]:
+        """Wait for a queued mask upload and return its URL (None if absent or failed)"""
+        if upload_future is None:
+            return None
+        try:
+            return upload_future.result()
+        except Exception as e:
+            logger.error(f"Mask upload failed for detection {idx}: {e}")
+            return None
+
+    def _upload_mask(self, mask: Image.Image, idx: int, s3_service, photo_id: str) -> str:
+        """
+        Encode a segmentation mask as PNG and upload it to S3.
+
+        Returns:
+            S3 URL of the uploaded mask
+        """
+        mask_bytes = self.segmenter.mask_to_bytes(mask)
+        mask_key = f"{self.config.s3_prefix}{photo_id}_damage{idx}.png"
+        segmentation_mask_url = s3_service.upload_bytes(
+            mask_bytes, mask_key, content_type="image/png"
+        )
+        logger.debug(f"Uploaded segmentation mask to {segmentation_mask_url}")
+        return segmentation_mask_url
+
+    def _build_response(
+        self,
+        damage_detections: List[DamageDetection],
+        image_size: tuple,
+        start_time: float,
+    ) -> DamageDetectionResponse:
+        """
+        Assemble the response for one image from its processed detections.
+
+        Args:
+            damage_detections: Processed detections for the image
+            image_size: (width, height) of original image
+            start_time: time.time() at which processing of the image started
+
+        Returns:
+            DamageDetectionResponse with summary, tags and overall confidence
+        """
         if damage_detections:
+            summary = self._generate_summary(damage_detections, image_size)
+            tags = self._generate_tags(damage_detections)
+
+            # Calculate overall confidence (average of detection confidences)
             overall_confidence = sum(d.confidence for d in damage_detections) / len(
                 damage_detections
             )
+        else:
+            summary = DamageSummary(
+                total_damage_area_percentage=0.0,
+                damage_type_distribution=dict(self._EMPTY_TYPE_DISTRIBUTION),
+            )
+            tags = ["no_damage_detected"]
+            overall_confidence = 0.0
 
         # Calculate processing time
         processing_time_ms = int((time.time() - start_time) * 1000)
@@ -188,11 +415,11 @@ class DamageDetectionPipeline:
         # Calculate total damage area
         total_area_pct = sum(d.area_percentage for d in detections)
 
-        # Count damage types
-        damage_type_dist = {}
-        for damage_type in DamageType:
-            count = sum(1 for d in detections if d.type == damage_type)
-            damage_type_dist[damage_type.value] = count
+        # Count damage types in a single pass
+        counts = Counter(d.type for d in detections)
+        damage_type_dist = {
+            damage_type.value: counts[damage_type] for damage_type in self._ALL_DAMAGE_TYPES
+        }
 
         return DamageSummary(
             total_damage_area_percentage=min(100.0, total_area_pct),
@@ -218,24 +445,29 @@ class DamageDetectionPipeline:
         # Add base tag
         tags.append("roof_damage")
 
+        # Collect damage types and severity markers in a single pass
+        damage_types = set()
+        has_severe = False
+        has_moderate = False
+        for d in detections:
+            damage_types.add(d.type)
+            has_severe |= d.severity == DamageSeverity.SEVERE
+            has_moderate |= d.severity == DamageSeverity.MODERATE
+
         # Add damage type tags
-        damage_types = set(d.type for d in detections)
-        for damage_type in damage_types:
-            if damage_type == DamageType.HAIL_DAMAGE:
-                tags.append("hail_impact")
-            elif damage_type == DamageType.WIND_DAMAGE:
-                tags.append("wind_damage")
-            elif damage_type == DamageType.MISSING_SHINGLES:
-                tags.append("missing_shingles")
+        tags.extend(
+            tag
+            for damage_type, tag in self._DAMAGE_TYPE_TAGS.items()
+            if damage_type in damage_types
+        )
 
         # Add severity tags
-        severities = set(d.severity for d in detections)
-        if any(s.value == "severe" for s in severities):
+        if has_severe:
             tags.append("severe_damage")
             tags.append("urgent")
 
         # Check if insurance claim worthy (moderate or severe damage)
-        if any(d.severity.value in ["moderate", "severe"] for d in detections):
+        if has_moderate or has_severe:
             tags.append("insurance_claim")
 
         # Add count-based tags
@@ -253,6 +485,11 @@ class DamageDetectionPipeline:
         """
         Process multiple images in batch.
 
+        Rather than running the pipeline once per image, each model runs over
+        batches of up to ``config.batch_size`` inputs: detection across images,
+        then segmentation and severity classification across every ROI found in
+        the whole batch. Results are scattered back to their images at the end.
+
         Args:
             images: List of PIL Images to process
             s3_service: Optional S3 service for uploading masks
@@ -260,6 +497,7 @@ class DamageDetectionPipeline:
 
         Returns:
             Dictionary mapping index/photo_id to DamageDetectionResponse
+            (None for images that failed)
         """
         if not self.pipeline_loaded:
             self.load_models()
@@ -269,21 +507,144 @@ class DamageDetectionPipeline:
 
         results = {}
 
+        # Decode every image once; undecodable images fail individually and
+        # previously seen images are answered from the result cache
+        batch_items = []  # (photo_id, image, roi_source, roi_scale, cache_key)
         for idx, image in enumerate(images):
             photo_id = photo_ids[idx] if photo_ids and idx < len(photo_ids) else str(idx)
             try:
-                response = self.process_image(image, s3_service, photo_id)
-                results[photo_id] = response
+                image_array = np.asarray(image.convert("RGB"))
             except Exception as e:
                 logger.error(f"Failed to process image {photo_id}: {e}")
                 # Return error response
                 results[photo_id] = None
+                continue
+
+            cache_key = self._result_cache_key(image_array, s3_service, photo_id)
+            cached = self._get_cached_response(cache_key, start_time)
+            if cached is not None:
+                results[photo_id] = cached
+            else:
+                roi_source, roi_scale = downscale_for_rois(
+                    image_array, self.config.max_image_dimension
+                )
+                batch_items.append((photo_id, image, roi_source, roi_scale, cache_key))
+
+        # Phase 1: object detection (YOLOv8) across images
+        detections_per_image = self._run_batched(
+            "Detection",
+            self.detector.detect_batch,
+            None,
+            [image for _, image, _, _, _ in batch_items],
+        )
+
+        # Phase 2: segmentation and severity across every ROI in the batch
+        rois = []  # (image position, detection index, detection)
+        for pos, detections in enumerate(detections_per_image):
+            if detections is None:
+                photo_id = batch_items[pos][0]
+                logger.error(f"Failed to process image {photo_id}: detection failed")
+                results[photo_id] = None
+                continue
+            rois.extend((pos, idx, detection) for idx, detection in enumerate(detections))
+
+        roi_images = [batch_items[pos][2] for pos, _, _ in rois]
+        roi_scales = [batch_items[pos][3] for pos, _, _ in rois]
+        roi_boxes = [detection.bounding_box for _, _, detection in rois]
+
+        segmentations = [None] * len(rois)
+        upload_futures = [None] * len(rois)
+        if self.config.enable_segmentation:
+            segmentations = self._run_batched(
+                "Segmentation",
+                self.segmenter.segment_batch,
+                None,
+                roi_images,
+                roi_boxes,
+                roi_scales,
+            )
+
+            # Upload masks in the background while severity is classified
+            if s3_service:
+                for roi_index, segmentation in enumerate(segmentations):
+                    if segmentation is None:
+                        continue
+                    pos, idx, _ = rois[roi_index]
+                    upload_futures[roi_index] = self._submit_mask_upload(
+                        segmentation[0], idx, s3_service, batch_items[pos][0]
+                    )
+
+        severities = [None] * len(rois)
+        if self.config.enable_severity:
+            severities = self._run_batched(
+                "Severity classification",
+                self.severity_classifier.classify_severity_batch,
+                # Default to moderate severity
+                (DamageSeverity.MODERATE, None),
+                roi_images,
+                roi_boxes,
+                [detection.damage_type for _, _, detection in rois],
+                [detection.confidence for _, _, detection in rois],
+                roi_scales,
+            )
+
+        # Phase 3: scatter ROI results back to their images
+        damage_detections_per_image = [[] for _ in batch_items]
+        for roi_index, (pos, idx, detection) in enumerate(rois):
+            segmentation = segmentations[roi_index]
+            severity = severities[roi_index]
+            damage_detections_per_image[pos].append(
+                DamageDetection(
+                    type=detection.damage_type,
+                    confidence=detection.confidence,
+                    severity=severity[0] if severity else None,
+                    bounding_box=detection.bounding_box,
+                    segmentation_mask=self._wait_for_mask_upload(
+                        upload_futures[roi_index], idx
+                    ),
+                    area_percentage=segmentation[1] if segmentation else 0.0,
+                )
+            )
+
+        for pos, (photo_id, image, _, _, cache_key) in enumerate(batch_items):
+            if detections_per_image[pos] is None:
+                continue
+            results[photo_id] = self._build_response(
+                damage_detections_per_image[pos], image.size, start_time
+            )
+            self._cache_response(
+                cache_key, results[photo_id], uploads_requested=bool(s3_service)
+            )
 
         batch_time = (time.time() - start_time) * 1000
         logger.info(f"Batch processing completed in {batch_time:.2f}ms")
 
         return results
 
+    def _run_batched(self, stage: str, batch_fn, fallback, *columns: list) -> list:
+        """
+        Run a batched model method over consecutive slices of ``config.batch_size`` items.
+
+        Args:
+            stage: Stage name used in error logs
+            batch_fn: Model method taking one list per column and returning one result per item
+            fallback: Result used for every item of a slice whose call raised
+            columns: Parallel per-item argument lists
+
+        Returns:
+            One result per item, in input order
+        """
+        results = []
+        batch_size = self.config.batch_size
+        for start in range(0, len(columns[0]), batch_size):
+            chunk = [column[start : start + batch_size] for column in columns]
+            try:
+                results.extend(batch_fn(*chunk))
+            except Exception as e:
+                logger.error(f"{stage} failed for batch starting at item {start}: {e}")
+                results.extend([fallback] * len(chunk[0]))
+        return results
+
     def get_stats(self) -> dict:
         """Get pipeline statistics"""
         return {
@@ -0,0 +1,81 @@
+"""Shared image/ROI preprocessing helpers for the damage detection models"""
+
+from typing import Tuple, Union
+from PIL import Image
+import numpy as np
+import cv2
+
+from src.schemas.damage_detection import BoundingBox
+
+
+def to_rgb_array(image: Union[Image.Image, np.ndarray]) -> np.ndarray:
+    """Return the image as an RGB uint8 array, decoding PIL images if needed"""
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("RGB"))
+    return image
+
+
+def downscale_for_rois(image_array: np.ndarray, max_dimension: int) -> Tuple[np.ndarray, float]:
+    """
+    Downscale an image once so its longest side is at most max_dimension.
+
+    ROI crops are resized to small model input sizes anyway, so cropping them from
+    a reduced copy of a very large photo is much cheaper and loses nothing.
+
+    Returns:
+        (ROI source array, scale factor from original to source coordinates)
+    """
+    height, width = image_array.shape[:2]
+    longest = max(height, width)
+    if longest <= max_dimension:
+        return image_array, 1.0
+
+    scale = max_dimension / longest
+    resized = cv2.resize(
+        image_array,
+        (max(1, round(width * scale)), max(1, round(height * scale))),
+        interpolation=cv2.INTER_AREA,
+    )
+    return resized, scale
+
+
+def crop_and_resize_roi(
+    image: Union[Image.Image, np.ndarray],
+    bounding_box: BoundingBox,
+    input_size: int,
+    scale: float = 1.0,
+) -> np.ndarray:
+    """
+    Crop a bounding box from an image and resize it to a square model input.
+
+    Args:
+        image: Full image as an RGB uint8 array (HxWx3) or PIL Image
+        bounding_box: Bounding box in original image coordinates
+        input_size: Side length of the square model input
+        scale: Factor mapping original coordinates onto ``image`` (see downscale_for_rois)
+
+    Returns:
+        uint8 array of shape (input_size, input_size, 3)
+    """
+    image = to_rgb_array(image)
+
+    x, y, width, height = (
+        bounding_box.x,
+        bounding_box.y,
+        bounding_box.width,
+        bounding_box.height,
+    )
+    if scale != 1.0:
+        x, y = int(x * scale), int(y * scale)
+        width, height = max(1, round(width * scale)), max(1, round(height * scale))
+
+    # Crop ROI (view into the decoded image, no copy)
+    roi = image[y : y + height, x : x + width]
+
+    # Resize to model input size (area averaging when shrinking)
+    interpolation = (
+        cv2.INTER_AREA
+        if roi.shape[0] >= input_size and roi.shape[1] >= input_size
+        else cv2.INTER_LINEAR
+    )
+    return cv2.resize(roi, (input_size, input_size), interpolation=interpolation)
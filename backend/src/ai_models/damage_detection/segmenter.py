@@ -2,12 +2,13 @@
 
 import logging
 import time
-import io
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 from PIL import Image
 import numpy as np
+import cv2
 
-from .config import SegmenterConfig
+from .config import SegmenterConfig, default_config, resolve_weights_path
+from .preprocessing import crop_and_resize_roi
 from src.schemas.damage_detection import BoundingBox
 
 logger = logging.getLogger(__name__)
@@ -21,8 +22,11 @@ class DamageSegmenter:
     In production, this would load actual trained U-Net weights.
     """
 
+    _INV_255 = np.float32(1.0 / 255.0)
+    _PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
     def __init__(self, config: Optional[SegmenterConfig] = None):
-        self.config = config or SegmenterConfig()
+        self.config = config or default_config.segmenter
         self.model_loaded = False
         self.inference_count = 0
         logger.info(f"Initializing DamageSegmenter with config: {self.config.model_dump()}")
@@ -35,56 +39,58 @@ class DamageSegmenter:
         import torch
         self.model = torch.load(self.config.model_path)
         self.model.eval()
+
+        When config.engine_path points at an existing TensorRT engine (FP16/INT8,
+        built offline), that engine is deserialized instead of the weights above.
         """
-        logger.info(f"Loading U-Net model from {self.config.model_path}")
+        weights_path = resolve_weights_path(self.config)
+        logger.info(f"Loading U-Net model from {weights_path}")
         # Simulate model loading time
         time.sleep(0.01)
         self.model_loaded = True
         logger.info("U-Net model loaded successfully (MOCK)")
 
     def preprocess_roi(
-        self, image: Image.Image, bounding_box: BoundingBox
+        self,
+        image: Union[Image.Image, np.ndarray],
+        bounding_box: BoundingBox,
+        scale: float = 1.0,
     ) -> Tuple[np.ndarray, Tuple[int, int]]:
         """
         Crop and preprocess region of interest from image.
 
         Args:
-            image: Full PIL Image
-            bounding_box: Bounding box to crop
+            image: Full image as an RGB uint8 array (HxWx3) or PIL Image
+            bounding_box: Bounding box to crop (original image coordinates)
+            scale: Factor mapping original coordinates onto ``image`` when it has
+                been downscaled for ROI extraction
 
         Returns:
             Preprocessed ROI array and original ROI size
         """
-        # Crop ROI
-        roi = image.crop(
-            (
-                bounding_box.x,
-                bounding_box.y,
-                bounding_box.x + bounding_box.width,
-                bounding_box.y + bounding_box.height,
-            )
-        )
-
-        original_size = roi.size
+        roi = crop_and_resize_roi(image, bounding_box, self.config.input_size, scale)
 
-        # Resize to model input size
-        roi = roi.convert("RGB")
-        roi = roi.resize((self.config.input_size, self.config.input_size), Image.LANCZOS)
+        original_size = (bounding_box.width, bounding_box.height)
 
-        # Convert to numpy array and normalize
-        roi_array = np.array(roi, dtype=np.float32) / 255.0
+        # Convert to float and normalize in place
+        roi_array = roi.astype(np.float32)
+        np.multiply(roi_array, self._INV_255, out=roi_array)
 
         return roi_array, original_size
 
     def segment(
-        self, image: Image.Image, bounding_box: BoundingBox
+        self,
+        image: Union[Image.Image, np.ndarray],
+        bounding_box: BoundingBox,
+        roi_scale: float = 1.0,
     ) -> Tuple[Image.Image, float]:
         """
         Generate segmentation mask for damage region.
 
         Args:
-            image: Full PIL Image
+            image: Full image as an RGB uint8 array or PIL Image
             bounding_box: Bounding box of damage area
+            roi_scale: Scale of ``image`` relative to the box coordinates
 
         Returns:
             Tuple of (segmentation mask as PIL Image, area percentage)
@@ -98,7 +104,7 @@ class DamageSegmenter:
         start_time = time.time()
 
         # Preprocess ROI
-        roi_array, original_size = self.preprocess_roi(image, bounding_box)
+        roi_array, original_size = self.preprocess_roi(image, bounding_box, roi_scale)
 
         # MOCK: Generate segmentation mask
         mask, area_percentage = self._generate_mock_segmentation_mask(
@@ -115,6 +121,63 @@ class DamageSegmenter:
 
         return mask, area_percentage
 
+    def segment_batch(
+        self,
+        images: Sequence[Union[Image.Image, np.ndarray]],
+        bounding_boxes: Sequence[BoundingBox],
+        roi_scales: Optional[Sequence[float]] = None,
+    ) -> List[Tuple[Image.Image, float]]:
+        """
+        Generate segmentation masks for several damage regions in one forward pass.
+
+        Args:
+            images: Source image for each ROI (RGB uint8 arrays or PIL Images);
+                ROIs from the same photo should share the same array
+            bounding_boxes: Bounding box of each damage area
+            roi_scales: Scale of each source image relative to its box (default 1.0)
+
+        Returns:
+            One (segmentation mask, area percentage) tuple per ROI, in input order
+
+        Note:
+            This is a MOCK implementation. In production, the stacked ROI batch would
+            be passed to U-Net in a single call.
+        """
+        if not bounding_boxes:
+            return []
+
+        if not self.model_loaded:
+            self.load_model()
+
+        start_time = time.time()
+
+        if roi_scales is None:
+            roi_scales = [1.0] * len(bounding_boxes)
+
+        # Preprocess and stack ROIs into a single [M, S, S, 3] batch
+        batch = np.stack(
+            [
+                self.preprocess_roi(image, bounding_box, scale)[0]
+                for image, bounding_box, scale in zip(images, bounding_boxes, roi_scales)
+            ]
+        )
+
+        # MOCK: Generate segmentation masks for every ROI in the batch
+        results = [
+            self._generate_mock_segmentation_mask(bounding_box.width, bounding_box.height)
+            for bounding_box in bounding_boxes
+        ]
+
+        inference_time = (time.time() - start_time) * 1000
+        self.inference_count += len(results)
+
+        logger.debug(
+            f"U-Net batch segmentation completed: {batch.shape[0]} ROIs "
+            f"in {inference_time:.2f}ms"
+        )
+
+        return results
+
     def _generate_mock_segmentation_mask(
         self, width: int, height: int
     ) -> Tuple[Image.Image, float]:
@@ -126,29 +189,24 @@ class DamageSegmenter:
         Returns:
             Tuple of (mask image, area percentage)
         """
-        # Create binary mask
-        mask_array = np.zeros((height, width), dtype=np.uint8)
-
-        # Generate random damage region (ellipse or irregular shape)
         center_x = width // 2
         center_y = height // 2
 
-        # Create elliptical damage region
-        y_coords, x_coords = np.ogrid[:height, :width]
+        # Create elliptical damage region from broadcast row/column vectors
+        y_coords = np.arange(height, dtype=np.float32)[:, None]
+        x_coords = np.arange(width, dtype=np.float32)[None, :]
         ellipse_mask = (
-            (x_coords - center_x) ** 2 / (width / 3) ** 2
-            + (y_coords - center_y) ** 2 / (height / 3) ** 2
-        ) <= 1
-
-        # Apply mask
-        mask_array[ellipse_mask] = 255
+            (x_coords - center_x) ** 2 * (1.0 / (width / 3) ** 2)
+            + (y_coords - center_y) ** 2 * (1.0 / (height / 3) ** 2)
+        ) <= 1.0
 
         # Calculate area percentage
-        damage_pixels = np.sum(mask_array > 0)
+        damage_pixels = np.count_nonzero(ellipse_mask)
         total_pixels = width * height
         area_percentage = (damage_pixels / total_pixels) * 100
 
-        # Convert to PIL Image
+        # Convert to PIL Image (bool -> 0/255 uint8)
+        mask_array = ellipse_mask.view(np.uint8) * np.uint8(255)
         mask_image = Image.fromarray(mask_array, mode="L")
 
         return mask_image, area_percentage
@@ -157,6 +215,9 @@ class DamageSegmenter:
         """
         Convert mask image to bytes for storage.
 
+        Binary masks compress to almost nothing at any zlib level, so PNGs are
+        written with the fastest compression setting.
+
         Args:
             mask: PIL Image mask
             format: Image format (PNG, JPEG, etc.)
@@ -164,10 +225,11 @@ class DamageSegmenter:
         Returns:
             Image bytes
         """
-        buffer = io.BytesIO()
-        mask.save(buffer, format=format)
-        buffer.seek(0)
-        return buffer.getvalue()
+        params = self._PNG_PARAMS if format.upper() == "PNG" else []
+        ok, buffer = cv2.imencode(f".{format.lower()}", np.asarray(mask), params)
+        if not ok:
+            raise ValueError(f"Failed to encode mask as {format}")
+        return buffer.tobytes()
 
     def get_inference_stats(self) -> dict:
         """Get inference statistics"""
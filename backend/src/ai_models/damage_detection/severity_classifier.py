@@ -3,11 +3,12 @@
 import logging
 import random
 import time
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 from PIL import Image
 import numpy as np
 
-from .config import SeverityClassifierConfig
+from .config import SeverityClassifierConfig, default_config, resolve_weights_path
+from .preprocessing import crop_and_resize_roi
 from src.schemas.damage_detection import DamageSeverity, DamageType, BoundingBox
 
 logger = logging.getLogger(__name__)
@@ -21,10 +22,23 @@ class SeverityClassifier:
     In production, this would load actual trained ResNet50 weights.
     """
 
+    # ImageNet normalization constants scaled to the uint8 pixel range
+    _MEAN_255 = np.array([0.485, 0.456, 0.406], dtype=np.float32) * 255.0
+    _INV_STD_255 = 1.0 / (np.array([0.229, 0.224, 0.225], dtype=np.float32) * 255.0)
+
+    _SEVERITY_LEVELS = (DamageSeverity.MINOR, DamageSeverity.MODERATE, DamageSeverity.SEVERE)
+    # Mock (minor -> moderate, moderate -> severe) area thresholds per damage type
+    _SEVERITY_AREA_THRESHOLDS = {
+        DamageType.HAIL_DAMAGE: (10000, 30000),
+        DamageType.WIND_DAMAGE: (8000, 25000),
+        DamageType.MISSING_SHINGLES: (5000, 20000),
+    }
+
     def __init__(self, config: Optional[SeverityClassifierConfig] = None):
-        self.config = config or SeverityClassifierConfig()
+        self.config = config or default_config.severity_classifier
         self.model_loaded = False
         self.inference_count = 0
+        self._rng = np.random.default_rng()
         logger.info(f"Initializing SeverityClassifier with config: {self.config.model_dump()}")
 
     def load_model(self):
@@ -37,67 +51,61 @@ class SeverityClassifier:
         self.model = models.resnet50(pretrained=False)
         self.model.load_state_dict(torch.load(self.config.model_path))
         self.model.eval()
+
+        When config.engine_path points at an existing TensorRT engine (FP16/INT8,
+        built offline), that engine is deserialized instead of the weights above.
         """
-        logger.info(f"Loading ResNet50 model from {self.config.model_path}")
+        weights_path = resolve_weights_path(self.config)
+        logger.info(f"Loading ResNet50 model from {weights_path}")
         # Simulate model loading time
         time.sleep(0.01)
         self.model_loaded = True
         logger.info("ResNet50 model loaded successfully (MOCK)")
 
     def preprocess_roi(
-        self, image: Image.Image, bounding_box: BoundingBox
+        self,
+        image: Union[Image.Image, np.ndarray],
+        bounding_box: BoundingBox,
+        scale: float = 1.0,
     ) -> np.ndarray:
         """
         Crop and preprocess region of interest for classification.
 
         Args:
-            image: Full PIL Image
-            bounding_box: Bounding box to crop
+            image: Full image as an RGB uint8 array (HxWx3) or PIL Image
+            bounding_box: Bounding box to crop (original image coordinates)
+            scale: Factor mapping original coordinates onto ``image`` when it has
+                been downscaled for ROI extraction
 
         Returns:
             Preprocessed ROI array
         """
-        # Crop ROI
-        roi = image.crop(
-            (
-                bounding_box.x,
-                bounding_box.y,
-                bounding_box.x + bounding_box.width,
-                bounding_box.y + bounding_box.height,
-            )
-        )
-
-        # Resize to model input size
-        roi = roi.convert("RGB")
-        roi = roi.resize(
-            (self.config.input_size, self.config.input_size), Image.LANCZOS
-        )
-
-        # Convert to numpy array and normalize (ImageNet normalization)
-        roi_array = np.array(roi, dtype=np.float32) / 255.0
+        roi = crop_and_resize_roi(image, bounding_box, self.config.input_size, scale)
 
-        # Apply ImageNet normalization
-        mean = np.array([0.485, 0.456, 0.406])
-        std = np.array([0.229, 0.224, 0.225])
-        roi_array = (roi_array - mean) / std
+        # Apply ImageNet normalization in place; /255 is folded into the constants
+        roi_array = roi.astype(np.float32)
+        np.subtract(roi_array, self._MEAN_255, out=roi_array)
+        np.multiply(roi_array, self._INV_STD_255, out=roi_array)
 
         return roi_array
 
     def classify_severity(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, np.ndarray],
         bounding_box: BoundingBox,
         damage_type: DamageType,
         detection_confidence: float,
+        roi_scale: float = 1.0,
     ) -> Tuple[DamageSeverity, float]:
         """
         Classify severity of detected damage.
 
         Args:
-            image: Full PIL Image
+            image: Full image as an RGB uint8 array or PIL Image
             bounding_box: Bounding box of damage area
             damage_type: Type of damage detected
             detection_confidence: Confidence from damage detection
+            roi_scale: Scale of ``image`` relative to the box coordinates
 
         Returns:
             Tuple of (severity level, confidence score)
@@ -111,7 +119,7 @@ class SeverityClassifier:
         start_time = time.time()
 
         # Preprocess ROI
-        roi_array = self.preprocess_roi(image, bounding_box)
+        roi_array = self.preprocess_roi(image, bounding_box, roi_scale)
 
         # MOCK: Classify severity
         severity, confidence = self._classify_mock_severity(
@@ -128,6 +136,66 @@ class SeverityClassifier:
 
         return severity, confidence
 
+    def classify_severity_batch(
+        self,
+        images: Sequence[Union[Image.Image, np.ndarray]],
+        bounding_boxes: Sequence[BoundingBox],
+        damage_types: Sequence[DamageType],
+        detection_confidences: Sequence[float],
+        roi_scales: Optional[Sequence[float]] = None,
+    ) -> List[Tuple[DamageSeverity, float]]:
+        """
+        Classify severity of several damage regions in one forward pass.
+
+        Args:
+            images: Source image for each ROI (RGB uint8 arrays or PIL Images);
+                ROIs from the same photo should share the same array
+            bounding_boxes: Bounding box of each damage area
+            damage_types: Type of damage detected for each ROI
+            detection_confidences: Confidence from damage detection for each ROI
+            roi_scales: Scale of each source image relative to its box (default 1.0)
+
+        Returns:
+            One (severity level, confidence score) tuple per ROI, in input order
+
+        Note:
+            This is a MOCK implementation. In production, the stacked ROI batch would
+            be passed to ResNet50 in a single call.
+        """
+        if not bounding_boxes:
+            return []
+
+        if not self.model_loaded:
+            self.load_model()
+
+        start_time = time.time()
+
+        if roi_scales is None:
+            roi_scales = [1.0] * len(bounding_boxes)
+
+        # Preprocess and stack ROIs into a single [M, S, S, 3] batch
+        batch = np.stack(
+            [
+                self.preprocess_roi(image, bounding_box, scale)
+                for image, bounding_box, scale in zip(images, bounding_boxes, roi_scales)
+            ]
+        )
+
+        # MOCK: Classify severity for every ROI in the batch
+        results = self._classify_mock_severity_batch(
+            damage_types, detection_confidences, bounding_boxes
+        )
+
+        inference_time = (time.time() - start_time) * 1000
+        self.inference_count += len(results)
+
+        logger.debug(
+            f"Severity batch classification completed: {batch.shape[0]} ROIs "
+            f"in {inference_time:.2f}ms"
+        )
+
+        return results
+
     def _classify_mock_severity(
         self,
         damage_type: DamageType,
@@ -149,39 +217,20 @@ class SeverityClassifier:
 
         # Determine severity based on damage type and area
         # Different damage types have different severity thresholds
-        if damage_type == DamageType.HAIL_DAMAGE:
-            # Hail damage severity based on area
-            if area < 10000:
-                severity = DamageSeverity.MINOR
-            elif area < 30000:
-                severity = DamageSeverity.MODERATE
-            else:
-                severity = DamageSeverity.SEVERE
-
-        elif damage_type == DamageType.WIND_DAMAGE:
-            # Wind damage often more severe
-            if area < 8000:
-                severity = DamageSeverity.MINOR
-            elif area < 25000:
-                severity = DamageSeverity.MODERATE
-            else:
-                severity = DamageSeverity.SEVERE
-
-        elif damage_type == DamageType.MISSING_SHINGLES:
-            # Missing shingles severity based on count (approximated by area)
-            if area < 5000:
-                severity = DamageSeverity.MINOR
-            elif area < 20000:
-                severity = DamageSeverity.MODERATE
-            else:
-                severity = DamageSeverity.SEVERE
-
-        else:
+        # (wind damage is often more severe; missing shingles count is approximated by area)
+        thresholds = self._SEVERITY_AREA_THRESHOLDS.get(damage_type)
+        if thresholds is None:
             # Default to moderate for unknown types
             severity = DamageSeverity.MODERATE
+        elif area < thresholds[0]:
+            severity = DamageSeverity.MINOR
+        elif area < thresholds[1]:
+            severity = DamageSeverity.MODERATE
+        else:
+            severity = DamageSeverity.SEVERE
 
         # Add some randomness to make it realistic
-        severity_values = [DamageSeverity.MINOR, DamageSeverity.MODERATE, DamageSeverity.SEVERE]
+        severity_values = self._SEVERITY_LEVELS
         current_idx = severity_values.index(severity)
 
         # 20% chance to shift severity by one level
@@ -204,6 +253,53 @@ class SeverityClassifier:
 
         return severity, confidence
 
+    def _classify_mock_severity_batch(
+        self,
+        damage_types: Sequence[DamageType],
+        detection_confidences: Sequence[float],
+        bounding_boxes: Sequence[BoundingBox],
+    ) -> List[Tuple[DamageSeverity, float]]:
+        """
+        Vectorized version of _classify_mock_severity for a batch of ROIs.
+
+        Applies the same area thresholds, random one-level shift and confidence
+        rules, drawing all random numbers with one NumPy call per quantity.
+        """
+        n = len(bounding_boxes)
+        rng = self._rng
+        threshold = self.config.confidence_threshold
+
+        # Base severity index from damage type and area (unknown types -> moderate)
+        levels = np.empty(n, dtype=np.int64)
+        for i, (damage_type, bounding_box) in enumerate(zip(damage_types, bounding_boxes)):
+            thresholds = self._SEVERITY_AREA_THRESHOLDS.get(damage_type)
+            if thresholds is None:
+                levels[i] = 1
+            else:
+                area = bounding_box.width * bounding_box.height
+                levels[i] = (area >= thresholds[0]) + (area >= thresholds[1])
+
+        # 20% chance to shift severity by one level
+        shift = rng.random(n) < 0.2
+        go_down = shift & (rng.random(n) < 0.5) & (levels > 0)
+        go_up = shift & ~go_down & (levels < len(self._SEVERITY_LEVELS) - 1)
+        levels += go_up.astype(np.int64) - go_down.astype(np.int64)
+
+        # Confidence correlated with (slightly lower than) detection confidence,
+        # raised to the threshold when needed and clamped once at the end
+        confidences = np.asarray(detection_confidences, dtype=np.float64) * rng.uniform(
+            0.85, 0.98, size=n
+        )
+        confidences = np.where(
+            confidences < threshold, threshold + rng.uniform(0.0, 0.1, size=n), confidences
+        )
+        np.clip(confidences, 0.0, 1.0, out=confidences)
+
+        return [
+            (self._SEVERITY_LEVELS[level], float(confidence))
+            for level, confidence in zip(levels.tolist(), confidences.tolist())
+        ]
+
     def get_inference_stats(self) -> dict:
         """Get inference statistics"""
         return {
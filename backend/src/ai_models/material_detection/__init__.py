@@ -6,6 +6,7 @@ from .counter import MaterialCounter
 from .brand_detector import BrandDetector
 from .material_validator import MaterialValidator
 from .material_database import MaterialDatabase, get_material_database
+from .preprocessing import ImageBundle
 from .config import (
     MaterialDetectionConfig,
     DetectorConfig,
@@ -22,6 +23,7 @@ __all__ = [
     "MaterialValidator",
     "MaterialDatabase",
     "get_material_database",
+    "ImageBundle",
     "MaterialDetectionConfig",
     "DetectorConfig",
     "CounterConfig",
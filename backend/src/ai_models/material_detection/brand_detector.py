@@ -1,18 +1,160 @@
 """OCR-based brand detection for material identification (Mock Implementation)"""
 
 import logging
+import os
 import random
+import threading
 import time
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
 from PIL import Image
 import numpy as np
-
-from .config import BrandDetectorConfig
+from botocore.exceptions import (
+    ClientError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    retry_if_exception_type,
+)
+
+from .config import BrandDetectorConfig, simulate_mock_latency
 from .material_database import MaterialDatabase, BrandInfo, get_material_database
+from .preprocessing import ImageBundle
 from src.schemas.material_detection import MaterialType, BoundingBox
 
 logger = logging.getLogger(__name__)
 
+# (lowercased name, brand) pairs and (lowercased alias, brand) pairs for one material type
+_BrandIndex = Tuple[List[Tuple[str, BrandInfo]], List[Tuple[str, BrandInfo]]]
+
+_T = TypeVar("_T")
+
+# OCR input: a PIL image, or an ndarray (possibly a zero-copy view of a larger image)
+ImageInput = Union[Image.Image, np.ndarray]
+
+
+class OCRThrottledError(Exception):
+    """Transient OCR engine failure (API throttling, network error); retried with backoff"""
+
+
+# Textract error codes that are safe to retry (throttling, transient service errors)
+_THROTTLING_ERROR_CODES = frozenset(
+    {
+        "ThrottlingException",
+        "ProvisionedThroughputExceededException",
+        "LimitExceededException",
+        "InternalServerError",
+    }
+)
+
+# Network-level failures from the OCR engine clients
+_TRANSIENT_OCR_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    EndpointConnectionError,
+    ConnectTimeoutError,
+    ReadTimeoutError,
+)
+
+
+def _is_transient_ocr_error(exc: Exception) -> bool:
+    """Check whether an OCR engine error is throttling or a transient network failure"""
+    if isinstance(exc, ClientError):
+        return exc.response.get("Error", {}).get("Code") in _THROTTLING_ERROR_CODES
+    # Cloud Vision raises google.api_core ResourceExhausted / ServiceUnavailable (HTTP 429/503)
+    if getattr(exc, "code", None) in (429, 503):
+        return True
+    return isinstance(exc, _TRANSIENT_OCR_ERRORS)
+
+
+class OCRRateLimiter:
+    """
+    Process-wide guard for OCR engine calls.
+
+    Caps the number of concurrent calls with a semaphore and spaces call starts
+    to at most `requests_per_second` (0 disables rate limiting).
+    """
+
+    def __init__(self, max_concurrent: int, requests_per_second: float):
+        self.max_concurrent = max_concurrent
+        self.requests_per_second = requests_per_second
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        if self._interval:
+            # Reserve the next start slot, then wait for it outside the lock
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_slot - now
+                self._next_slot = max(now, self._next_slot) + self._interval
+            if wait > 0:
+                time.sleep(wait)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+_ocr_limiters: Dict[Tuple[int, float], OCRRateLimiter] = {}
+_ocr_limiter_lock = threading.Lock()
+
+
+def get_ocr_rate_limiter(config: BrandDetectorConfig) -> OCRRateLimiter:
+    """
+    Get the process-wide OCR rate limiter for a config's limits.
+
+    Limiters are shared per (max_concurrent_ocr, ocr_requests_per_second), so
+    detectors with the same limits share one budget and a detector configured
+    with different limits gets its own.
+
+    Args:
+        config: Brand detector config providing concurrency and rate limits
+
+    Returns:
+        Shared OCRRateLimiter instance
+    """
+    key = (config.max_concurrent_ocr, config.ocr_requests_per_second)
+    limiter = _ocr_limiters.get(key)
+    if limiter is None:
+        with _ocr_limiter_lock:
+            limiter = _ocr_limiters.get(key)
+            if limiter is None:
+                limiter = OCRRateLimiter(*key)
+                _ocr_limiters[key] = limiter
+    return limiter
+
+
+_ocr_pool: Optional[ThreadPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool for I/O-bound OCR calls, created on first use.
+
+    Worker count comes from the OCR_WORKERS environment variable (default: CPU count).
+    """
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                max_workers = int(os.environ.get("OCR_WORKERS", os.cpu_count() or 4))
+                _ocr_pool = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="material-ocr"
+                )
+    return _ocr_pool
+
 
 class BrandDetectionResult:
     """Result from brand detection"""
@@ -30,6 +172,18 @@ class BrandDetector:
     In production, this would use Tesseract, AWS Textract, or Google Cloud Vision API.
     """
 
+    # MOCK: Simulated OCR outputs
+    _MOCK_OCR_TEXTS = [
+        "CertainTeed Roofing Shingles",
+        "Owens Corning Premium Shingles",
+        "GAF Timberline HDZ",
+        "Weyerhaeuser Plywood OSB",
+        "Georgia-Pacific ToughRock Drywall",
+        "USG Sheetrock",
+        "",  # Sometimes OCR finds nothing
+        "unclear text 123",  # Sometimes OCR finds garbage
+    ]
+
     def __init__(
         self,
         config: Optional[BrandDetectorConfig] = None,
@@ -39,7 +193,14 @@ class BrandDetector:
         self.material_db = material_db or get_material_database()
         self.ocr_engine_initialized = False
         self.inference_count = 0
+        self._count_lock = threading.Lock()
+        # Lowercased brand names/aliases per material type, built on first use
+        self._brand_index: Dict[str, _BrandIndex] = {}
+        # Per-instance LRU of (material_type, normalized text, threshold) -> match
+        self._match_brand_cached = lru_cache(maxsize=4096)(self._lookup_brand)
         logger.info(f"Initializing BrandDetector with engine: {self.config.ocr_engine}")
+        # Initialize the engine up front so detection calls never need a readiness check
+        self.initialize_ocr()
 
     def initialize_ocr(self):
         """
@@ -52,13 +213,13 @@ class BrandDetector:
         """
         logger.info(f"Initializing OCR engine: {self.config.ocr_engine}")
         # Simulate initialization time
-        time.sleep(0.01)
+        simulate_mock_latency(0.01)
         self.ocr_engine_initialized = True
         logger.info(f"OCR engine {self.config.ocr_engine} initialized successfully (MOCK)")
 
     def detect_brand(
         self,
-        image: Image.Image,
+        image: Union[ImageInput, ImageBundle],
         material_type: MaterialType,
         bounding_box: Optional[BoundingBox] = None,
     ) -> BrandDetectionResult:
@@ -66,44 +227,49 @@ class BrandDetector:
         Detect brand from image using OCR.
 
         Args:
-            image: PIL Image
+            image: PIL Image, ImageBundle, or an HxW[xC] array (arrays and bundles
+                are cropped as views)
             material_type: Type of material to search brands for
             bounding_box: Optional bounding box to crop ROI for OCR
 
         Returns:
             BrandDetectionResult with brand name and confidence
         """
-        if not self.ocr_engine_initialized:
-            self.initialize_ocr()
-
         start_time = time.time()
 
+        if isinstance(image, ImageBundle):
+            image = image.rgb_uint8
+
         # Step 1: Crop ROI if bounding box provided
         roi_image = self._crop_roi(image, bounding_box)
 
         # Step 2: Run OCR to extract text
-        extracted_text = self._run_ocr(roi_image)
+        extracted_text = self._call_ocr(self._run_ocr, roi_image)
 
         # Step 3: Match extracted text against brand database
         brand_result = self._match_brand(material_type.value, extracted_text)
 
         inference_time = (time.time() - start_time) * 1000
-        self.inference_count += 1
+        with self._count_lock:
+            self.inference_count += 1
 
         logger.debug(
-            f"Brand detection completed: {brand_result.brand_name or 'None'} "
-            f"(confidence: {brand_result.confidence:.2f}) in {inference_time:.2f}ms"
+            "Brand detection completed: %s (confidence: %.2f) in %.2fms",
+            brand_result.brand_name,
+            brand_result.confidence,
+            inference_time,
         )
 
         return brand_result
 
     def _crop_roi(
-        self, image: Image.Image, bounding_box: Optional[BoundingBox]
-    ) -> Image.Image:
+        self, image: ImageInput, bounding_box: Optional[BoundingBox]
+    ) -> ImageInput:
         """
         Crop region of interest for OCR.
 
         If bounding box provided, crop and expand slightly for better OCR.
+        Arrays are cropped by slicing, which returns a view instead of copying pixels.
         """
         if bounding_box is None:
             return image
@@ -111,24 +277,55 @@ class BrandDetector:
         # Expand ROI slightly for better OCR
         expand = self.config.roi_expand_pixels
 
+        if isinstance(image, np.ndarray):
+            height, width = image.shape[:2]
+        else:
+            width, height = image.size
+
         x1 = max(0, bounding_box.x - expand)
         y1 = max(0, bounding_box.y - expand)
-        x2 = min(image.width, bounding_box.x + bounding_box.width + expand)
-        y2 = min(image.height, bounding_box.y + bounding_box.height + expand)
+        x2 = min(width, bounding_box.x + bounding_box.width + expand)
+        y2 = min(height, bounding_box.y + bounding_box.height + expand)
 
-        roi = image.crop((x1, y1, x2, y2))
+        if isinstance(image, np.ndarray):
+            roi = image[y1:y2, x1:x2]
+        else:
+            roi = image.crop((x1, y1, x2, y2))
 
-        logger.debug(f"Cropped ROI: ({x1}, {y1}, {x2}, {y2})")
+        logger.debug("Cropped ROI: (%d, %d, %d, %d)", x1, y1, x2, y2)
 
         return roi
 
-    def _run_ocr(self, image: Image.Image) -> str:
+    @retry(
+        retry=retry_if_exception_type(OCRThrottledError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=0.1, max=2.0),
+        reraise=True,
+    )
+    def _call_ocr(self, ocr_fn: Callable[[ImageInput], _T], image: ImageInput) -> _T:
+        """
+        Run an OCR engine call under the shared concurrency/rate limiter.
+
+        Throttling or transient engine errors are mapped to OCRThrottledError and
+        retried with exponential backoff, up to 3 attempts.
+        """
+        with get_ocr_rate_limiter(self.config):
+            try:
+                return ocr_fn(image)
+            except OCRThrottledError:
+                raise
+            except Exception as e:
+                if _is_transient_ocr_error(e):
+                    raise OCRThrottledError(str(e)) from e
+                raise
+
+    def _run_ocr(self, image: ImageInput) -> str:
         """
         Run OCR on image to extract text.
 
         In production, this would use actual OCR:
-        - Tesseract: pytesseract.image_to_string(image)
-        - Textract: self.textract.detect_text(...)
+        - Tesseract: pytesseract.image_to_string(image) (accepts PIL or ndarray)
+        - Textract: self.textract.detect_text(...) (encode only here, e.g. cv2.imencode)
         - Cloud Vision: self.vision_client.text_detection(...)
 
         This is a MOCK implementation.
@@ -137,27 +334,101 @@ class BrandDetector:
         # In reality, this would extract actual text from image
 
         # Simulate processing time
-        time.sleep(0.02)
+        simulate_mock_latency(0.02)
 
         # MOCK: Return simulated brand text occasionally
         # In production, this would be actual OCR output
-        mock_texts = [
-            "CertainTeed Roofing Shingles",
-            "Owens Corning Premium Shingles",
-            "GAF Timberline HDZ",
-            "Weyerhaeuser Plywood OSB",
-            "Georgia-Pacific ToughRock Drywall",
-            "USG Sheetrock",
-            "",  # Sometimes OCR finds nothing
-            "unclear text 123",  # Sometimes OCR finds garbage
-        ]
-
-        extracted_text = random.choice(mock_texts)
+        extracted_text = random.choice(self._MOCK_OCR_TEXTS)
 
-        logger.debug(f"OCR extracted text: '{extracted_text}'")
+        logger.debug("OCR extracted text: '%s'", extracted_text)
 
         return extracted_text
 
+    def _run_ocr_page(
+        self, image: Image.Image
+    ) -> List[Tuple[str, Tuple[int, int, int, int], float]]:
+        """
+        Run OCR once over the whole image and return located text.
+
+        In production, this would use the engine's page-level API, which returns
+        words/lines with their boxes in a single call:
+        - Tesseract: pytesseract.image_to_data(image, output_type=Output.DICT)
+        - Textract: self.textract.detect_document_text(...)
+        - Cloud Vision: self.vision_client.document_text_detection(...)
+
+        This is a MOCK implementation.
+
+        Returns:
+            List of (text, (x1, y1, x2, y2), ocr_confidence) tuples
+        """
+        # Simulate processing time (one OCR call for the whole page)
+        simulate_mock_latency(0.02)
+
+        # MOCK: Place a few simulated text lines at random positions
+        width, height = image.size
+        lines = []
+        for _ in range(random.randint(0, 4)):
+            text = random.choice(self._MOCK_OCR_TEXTS)
+            if not text:
+                continue
+            line_width = random.randint(1, max(1, width // 2))
+            line_height = random.randint(1, max(1, height // 10))
+            x1 = random.randint(0, width - line_width)
+            y1 = random.randint(0, height - line_height)
+            lines.append(
+                (text, (x1, y1, x1 + line_width, y1 + line_height), random.uniform(0.75, 0.95))
+            )
+
+        logger.debug("Page OCR extracted %d text lines", len(lines))
+
+        return lines
+
+    def _texts_in_boxes(
+        self,
+        ocr_lines: List[Tuple[str, Tuple[int, int, int, int], float]],
+        bounding_boxes: List[BoundingBox],
+        image_size: Tuple[int, int],
+    ) -> List[str]:
+        """
+        Collect the page OCR text that falls inside each (expanded) bounding box.
+
+        Args:
+            ocr_lines: Output of _run_ocr_page
+            bounding_boxes: Boxes to collect text for
+            image_size: (width, height) of the image, used to clip expanded boxes
+
+        Returns:
+            Space-joined text per bounding box (empty string when nothing overlaps)
+        """
+        if not ocr_lines:
+            return [""] * len(bounding_boxes)
+
+        expand = self.config.roi_expand_pixels
+        width, height = image_size
+
+        # Expanded ROI for each box, clipped to the image (same as _crop_roi)
+        boxes = np.array(
+            [[b.x, b.y, b.x + b.width, b.y + b.height] for b in bounding_boxes], dtype=np.int64
+        )
+        bx1 = np.maximum(boxes[:, 0] - expand, 0)
+        by1 = np.maximum(boxes[:, 1] - expand, 0)
+        bx2 = np.minimum(boxes[:, 2] + expand, width)
+        by2 = np.minimum(boxes[:, 3] + expand, height)
+
+        lines = np.array([line_box for _, line_box, _ in ocr_lines], dtype=np.int64)
+
+        # [boxes x lines] intersection matrix
+        overlaps = (
+            (lines[None, :, 0] < bx2[:, None])
+            & (lines[None, :, 2] > bx1[:, None])
+            & (lines[None, :, 1] < by2[:, None])
+            & (lines[None, :, 3] > by1[:, None])
+        )
+
+        return [
+            " ".join(ocr_lines[j][0] for j in np.flatnonzero(row)) for row in overlaps
+        ]
+
     def _match_brand(
         self, material_type: str, extracted_text: str
     ) -> BrandDetectionResult:
@@ -174,56 +445,187 @@ class BrandDetector:
         if not extracted_text or not extracted_text.strip():
             return BrandDetectionResult(brand_name=None, confidence=0.0)
 
-        # Search brands using fuzzy matching
-        matches = self.material_db.search_brands(
-            material_type, extracted_text, threshold=self.config.fuzzy_match_threshold
+        # Normalize case/whitespace so repeated OCR strings share one cache entry
+        text_normalized = " ".join(extracted_text.lower().split())
+        brand_name, match_confidence = self._match_brand_cached(
+            material_type, text_normalized, self.config.fuzzy_match_threshold
         )
 
-        if not matches:
-            logger.debug(f"No brand matches found for text: '{extracted_text}'")
+        if brand_name is None:
+            logger.debug("No brand matches found for text: '%s'", extracted_text)
             return BrandDetectionResult(brand_name=None, confidence=0.0)
 
-        # Take best match
-        best_brand, match_score = matches[0]
-
-        # Convert match score to confidence (0-1)
-        confidence = match_score / 100.0
-
-        # Apply OCR confidence (mock - in production, get from OCR engine)
+        # Apply OCR confidence (mock - in production, get from OCR engine).
+        # Kept outside the cached lookup so cache entries stay deterministic.
         ocr_confidence = random.uniform(0.75, 0.95)
-        final_confidence = confidence * ocr_confidence
+        final_confidence = match_confidence * ocr_confidence
 
         logger.debug(
-            f"Brand match: {best_brand.name} "
-            f"(match_score: {match_score}, final_confidence: {final_confidence:.2f})"
+            "Brand match: %s (match_confidence: %.2f, final_confidence: %.2f)",
+            brand_name,
+            match_confidence,
+            final_confidence,
         )
 
-        return BrandDetectionResult(
-            brand_name=best_brand.name, confidence=final_confidence
-        )
+        return BrandDetectionResult(brand_name=brand_name, confidence=final_confidence)
+
+    def _lookup_brand(
+        self, material_type: str, text_normalized: str, threshold: int
+    ) -> Tuple[Optional[str], float]:
+        """
+        Look up the best brand for normalized OCR text (wrapped by _match_brand_cached).
+
+        Args:
+            material_type: Material type (e.g., 'shingles')
+            text_normalized: Lowercased, whitespace-collapsed OCR text
+            threshold: Fuzzy match threshold; part of the cache key so config changes
+                never return stale matches
+
+        Returns:
+            (brand_name, match_confidence) with match_confidence in 0-1, or (None, 0.0)
+        """
+        # Exact prefilter: brand name (score 100) or alias (score 95) appears literally
+        match = self._exact_brand_match(material_type, text_normalized, threshold)
+        if match is not None:
+            matches = [match]
+        else:
+            # Fall back to the (slower) fuzzy search
+            matches = self.material_db.search_brands(
+                material_type, text_normalized, threshold=threshold
+            )
+
+        if not matches:
+            return None, 0.0
+
+        # Take best match and convert its score to confidence (0-1)
+        best_brand, match_score = matches[0]
+        return best_brand.name, match_score / 100.0
+
+    def _get_brand_index(self, material_type: str) -> _BrandIndex:
+        """Get (names, aliases) lowercased once per material type"""
+        index = self._brand_index.get(material_type)
+        if index is None:
+            brands = self.material_db.get_brands_for_material(material_type)
+            names = [(brand.name_lc, brand) for brand in brands]
+            aliases = [(alias, brand) for brand in brands for alias in brand.aliases_lc]
+            index = (names, aliases)
+            self._brand_index[material_type] = index
+        return index
+
+    def _exact_brand_match(
+        self, material_type: str, text_lower: str, threshold: int
+    ) -> Optional[Tuple[BrandInfo, int]]:
+        """
+        Find a brand whose name or alias appears literally in the text.
+
+        Scores match MaterialDatabase.search_brands (name 100, alias 95), and names are
+        checked before aliases so the best match is the same one search_brands would rank
+        first.
+
+        Returns:
+            (BrandInfo, score) or None if no literal match passes the threshold
+        """
+        names, aliases = self._get_brand_index(material_type)
+
+        for name, brand in names:
+            if name in text_lower:
+                return brand, 100
+
+        if threshold <= 95:
+            for alias, brand in aliases:
+                if alias in text_lower:
+                    return brand, 95
+
+        return None
 
     def detect_brands_batch(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, ImageBundle],
         material_type: MaterialType,
         bounding_boxes: list[BoundingBox],
     ) -> list[BrandDetectionResult]:
         """
         Detect brands for multiple bounding boxes in batch.
 
+        OCR runs once over the full image; the recognized text is then assigned to
+        each bounding box by location, instead of running OCR on every crop.
+
         Args:
-            image: PIL Image
+            image: PIL Image or ImageBundle
             material_type: Type of material
             bounding_boxes: List of bounding boxes
 
         Returns:
             List of BrandDetectionResult (one per bounding box)
         """
-        results = []
+        if not bounding_boxes:
+            return []
+
+        start_time = time.time()
 
-        for bbox in bounding_boxes:
-            result = self.detect_brand(image, material_type, bbox)
-            results.append(result)
+        bundle = ImageBundle.wrap(image)
+
+        # Step 1: Run OCR once over the whole image
+        ocr_lines = self._call_ocr(self._run_ocr_page, bundle.image)
+
+        # Step 2: Assign located text to each bounding box
+        texts = self._texts_in_boxes(ocr_lines, bounding_boxes, bundle.size)
+
+        # Step 3: Match each box's text against the brand database
+        results = [self._match_brand(material_type.value, text) for text in texts]
+
+        inference_time = (time.time() - start_time) * 1000
+        with self._count_lock:
+            self.inference_count += len(results)
+
+        logger.debug(
+            "Batch brand detection completed for %d boxes in %.2fms",
+            len(results),
+            inference_time,
+        )
+
+        return results
+
+    def detect_brands_concurrent(
+        self,
+        image: Union[Image.Image, ImageBundle],
+        targets: List[Tuple[MaterialType, Optional[BoundingBox]]],
+    ) -> List[BrandDetectionResult]:
+        """
+        Run detect_brand for several (material_type, bounding_box) ROIs concurrently.
+
+        Each ROI is a separate OCR call, which is I/O bound for real engines (Tesseract
+        subprocess, Textract/Cloud Vision HTTP), so calls overlap on the shared OCR pool.
+        A failed ROI is logged and returns an empty result instead of failing the rest.
+
+        Args:
+            image: PIL Image or ImageBundle
+            targets: (material_type, bounding_box) pairs to detect brands for
+
+        Returns:
+            List of BrandDetectionResult (one per target, in order)
+        """
+        if len(targets) <= 1:
+            futures = None
+        else:
+            # Convert once; each ROI is then a view into this array, not a copy
+            image_array = ImageBundle.wrap(image).rgb_uint8
+            pool = get_ocr_pool()
+            futures = [
+                pool.submit(self.detect_brand, image_array, material_type, bbox)
+                for material_type, bbox in targets
+            ]
+
+        results = []
+        for idx, (material_type, bbox) in enumerate(targets):
+            try:
+                if futures is None:
+                    results.append(self.detect_brand(image, material_type, bbox))
+                else:
+                    results.append(futures[idx].result())
+            except Exception as e:
+                logger.error(f"Brand detection failed for {material_type.value}: {e}")
+                results.append(BrandDetectionResult(brand_name=None, confidence=0.0))
 
         return results
 
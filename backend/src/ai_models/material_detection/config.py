@@ -1,8 +1,19 @@
 """Configuration for material detection models"""
 
+import os
+import time
 from typing import Dict, Any
 from pydantic import BaseModel, Field
 
+# Set to "1" to make the mock models sleep like real inference/OCR would
+MOCK_LATENCY_ENV_VAR = "MATERIAL_DETECT_MOCK_LATENCY"
+
+
+def simulate_mock_latency(seconds: float) -> None:
+    """Sleep for the given time only when mock latency is enabled via the environment"""
+    if os.environ.get(MOCK_LATENCY_ENV_VAR, "0") == "1":
+        time.sleep(seconds)
+
 
 class DetectorConfig(BaseModel):
     """Configuration for YOLOv8 material detector"""
@@ -36,6 +47,8 @@ class BrandDetectorConfig(BaseModel):
     fuzzy_match_threshold: int = Field(default=80, ge=0, le=100, description="Fuzzy string match threshold")
     roi_expand_pixels: int = Field(default=20, description="Pixels to expand ROI for OCR")
     aws_region: str = Field(default="us-west-2", description="AWS region for Textract")
+    max_concurrent_ocr: int = Field(default=8, ge=1, description="Max concurrent OCR engine calls per process")
+    ocr_requests_per_second: float = Field(default=100.0, ge=0.0, description="OCR request rate limit per process (0 disables)")
 
 
 class ValidatorConfig(BaseModel):
@@ -64,6 +77,9 @@ class MaterialDetectionConfig(BaseModel):
     batch_size: int = Field(default=1, ge=1, le=32, description="Batch size for inference")
     max_image_dimension: int = Field(default=4096, description="Max image dimension before downsampling")
     target_latency_ms: int = Field(default=450, description="Target P95 inference latency")
+    max_batch_workers: int = Field(
+        default=4, ge=1, description="Max threads used to process images of a batch concurrently"
+    )
 
     # Material database path
     materials_db_path: str = Field(default="backend/data/materials.json", description="Path to materials database")
@@ -2,13 +2,16 @@
 
 import logging
 import random
+import threading
 import time
-from typing import List, Tuple, Dict, Optional
+from collections import defaultdict
+from typing import List, Tuple, Dict, Optional, Union
 from PIL import Image
 import numpy as np
 
-from .config import CounterConfig
+from .config import CounterConfig, simulate_mock_latency
 from .detector import DetectionResult
+from .preprocessing import ImageBundle
 from src.schemas.material_detection import MaterialType, BoundingBox
 
 logger = logging.getLogger(__name__)
@@ -42,7 +45,11 @@ class MaterialCounter:
         self.config = config or CounterConfig()
         self.model_loaded = False
         self.inference_count = 0
-        logger.info(f"Initializing MaterialCounter with config: {self.config.model_dump()}")
+        # process_batch runs images on worker threads; guards inference_count
+        self._count_lock = threading.Lock()
+        logger.info("Initializing MaterialCounter with config: %s", self.config)
+        # Load weights up front so inference calls never need a readiness check
+        self.load_model()
 
     def load_model(self):
         """
@@ -52,30 +59,30 @@ class MaterialCounter:
         """
         logger.info(f"Loading density estimation model from {self.config.model_path}")
         # Simulate model loading time
-        time.sleep(0.01)
+        simulate_mock_latency(0.01)
         self.model_loaded = True
         logger.info("Density estimation model loaded successfully (MOCK)")
 
     def count_materials(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, ImageBundle],
         detections: List[DetectionResult],
     ) -> Dict[MaterialType, CountResult]:
         """
         Count material units using density estimation.
 
         Args:
-            image: PIL Image
+            image: PIL Image or ImageBundle (the density CNN input would be
+                bundle.normalized(config.input_size), shared with other models)
             detections: Initial detections from YOLOv8
 
         Returns:
             Dictionary mapping MaterialType to CountResult
         """
-        if not self.model_loaded:
-            self.load_model()
-
         start_time = time.time()
 
+        image = ImageBundle.wrap(image)
+
         # Group detections by material type
         detections_by_type = self._group_by_type(detections)
 
@@ -89,11 +96,13 @@ class MaterialCounter:
             count_results[material_type] = count_result
 
         inference_time = (time.time() - start_time) * 1000
-        self.inference_count += 1
+        with self._count_lock:
+            self.inference_count += 1
 
         logger.debug(
-            f"Density counting completed for {len(count_results)} material types "
-            f"in {inference_time:.2f}ms"
+            "Density counting completed for %d material types in %.2fms",
+            len(count_results),
+            inference_time,
         )
 
         return count_results
@@ -102,16 +111,14 @@ class MaterialCounter:
         self, detections: List[DetectionResult]
     ) -> Dict[MaterialType, List[DetectionResult]]:
         """Group detections by material type"""
-        grouped = {}
+        grouped = defaultdict(list)
         for detection in detections:
-            if detection.material_type not in grouped:
-                grouped[detection.material_type] = []
             grouped[detection.material_type].append(detection)
-        return grouped
+        return dict(grouped)
 
     def _estimate_density_count(
         self,
-        image: Image.Image,
+        image: ImageBundle,
         material_type: MaterialType,
         detections: List[DetectionResult],
     ) -> CountResult:
@@ -155,10 +162,11 @@ class MaterialCounter:
         count = max(1, count + adjustment)
 
         logger.debug(
-            f"Density estimation: {material_type.value} - "
-            f"Initial detections: {len(detections)}, "
-            f"Merged boxes: {len(merged_boxes)}, "
-            f"Final count: {count}"
+            "Density estimation: %s - Initial detections: %d, Merged boxes: %d, Final count: %d",
+            material_type.value,
+            len(detections),
+            len(merged_boxes),
+            count,
         )
 
         return CountResult(
@@ -179,42 +187,40 @@ class MaterialCounter:
         if not detections:
             return []
 
-        # Sort by confidence
-        sorted_detections = sorted(detections, key=lambda d: d.confidence, reverse=True)
+        # Sort by confidence (descending; stable like sorted(), so ties keep input order)
+        confidences = np.fromiter(
+            (d.confidence for d in detections), dtype=np.float64, count=len(detections)
+        )
+        order = np.argsort(-confidences, kind="stable")
+        sorted_detections = [detections[i] for i in order]
+
+        # Pairwise squared distances between box centers, computed once
+        boxes = np.array(
+            [
+                [d.bounding_box.x, d.bounding_box.y, d.bounding_box.width, d.bounding_box.height]
+                for d in sorted_detections
+            ],
+            dtype=np.float64,
+        )
+        center_x = boxes[:, 0] + boxes[:, 2] / 2
+        center_y = boxes[:, 1] + boxes[:, 3] / 2
+        dx = center_x[:, None] - center_x[None, :]
+        dy = center_y[:, None] - center_y[None, :]
+
+        # Merge if boxes are very close (compare squared distances, no sqrt)
+        threshold = max(self.config.merge_distance_threshold, 0)
+        close = dx * dx + dy * dy < threshold * threshold
 
         merged_boxes = []
-        used = set()
+        used = np.zeros(len(sorted_detections), dtype=bool)
 
         for i, detection in enumerate(sorted_detections):
-            if i in used:
+            if used[i]:
                 continue
 
-            # Start with current box
-            current_box = detection.bounding_box
-
-            # Check if it overlaps with any subsequent boxes
-            for j in range(i + 1, len(sorted_detections)):
-                if j in used:
-                    continue
-
-                other_box = sorted_detections[j].bounding_box
-
-                # Calculate distance between box centers
-                center1_x = current_box.x + current_box.width / 2
-                center1_y = current_box.y + current_box.height / 2
-                center2_x = other_box.x + other_box.width / 2
-                center2_y = other_box.y + other_box.height / 2
-
-                distance = np.sqrt(
-                    (center1_x - center2_x) ** 2 + (center1_y - center2_y) ** 2
-                )
-
-                # Merge if boxes are very close
-                if distance < self.config.merge_distance_threshold:
-                    used.add(j)
-
-            merged_boxes.append(current_box)
-            used.add(i)
+            # Keep current box and absorb any close, lower-confidence boxes
+            merged_boxes.append(detection.bounding_box)
+            used[i + 1:] |= close[i, i + 1:]
 
         return merged_boxes
 
@@ -222,26 +228,18 @@ class MaterialCounter:
         """
         Calculate Intersection over Union (IoU) between two bounding boxes.
         """
-        # Calculate intersection
+        # Calculate intersection (clamped at 0 for disjoint or degenerate boxes)
         x_left = max(box1.x, box2.x)
         y_top = max(box1.y, box2.y)
         x_right = min(box1.x + box1.width, box2.x + box2.width)
         y_bottom = min(box1.y + box1.height, box2.y + box2.height)
 
-        if x_right < x_left or y_bottom < y_top:
-            return 0.0
-
-        intersection_area = (x_right - x_left) * (y_bottom - y_top)
-
-        # Calculate union
-        box1_area = box1.width * box1.height
-        box2_area = box2.width * box2.height
-        union_area = box1_area + box2_area - intersection_area
+        intersection_area = max(0, x_right - x_left) * max(0, y_bottom - y_top)
 
-        if union_area == 0:
-            return 0.0
+        # Calculate union (integer arithmetic until the final division)
+        union_area = box1.width * box1.height + box2.width * box2.height - intersection_area
 
-        return intersection_area / union_area
+        return intersection_area / union_area if union_area > 0 else 0.0
 
     def get_inference_stats(self) -> dict:
         """Get inference statistics"""
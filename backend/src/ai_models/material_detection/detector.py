@@ -2,12 +2,14 @@
 
 import logging
 import random
+import threading
 import time
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from PIL import Image
 import numpy as np
 
-from .config import DetectorConfig
+from .config import DetectorConfig, simulate_mock_latency
+from .preprocessing import ImageBundle
 from src.schemas.material_detection import MaterialType, BoundingBox
 
 logger = logging.getLogger(__name__)
@@ -39,7 +41,11 @@ class MaterialDetector:
         self.config = config or DetectorConfig()
         self.model_loaded = False
         self.inference_count = 0
-        logger.info(f"Initializing MaterialDetector with config: {self.config.model_dump()}")
+        # process_batch runs images on worker threads; guards inference_count
+        self._count_lock = threading.Lock()
+        logger.info("Initializing MaterialDetector with config: %s", self.config)
+        # Load weights up front so inference calls never need a readiness check
+        self.load_model()
 
     def load_model(self):
         """
@@ -51,37 +57,38 @@ class MaterialDetector:
         """
         logger.info(f"Loading YOLOv8 model from {self.config.model_path}")
         # Simulate model loading time
-        time.sleep(0.01)
+        simulate_mock_latency(0.01)
         self.model_loaded = True
         logger.info("YOLOv8 material detection model loaded successfully (MOCK)")
 
-    def preprocess_image(self, image: Image.Image) -> Tuple[np.ndarray, Tuple[int, int]]:
+    def preprocess_image(
+        self, image: Union[Image.Image, ImageBundle]
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
         """
         Preprocess image for YOLOv8 inference.
 
         Args:
-            image: PIL Image
+            image: PIL Image or ImageBundle (reuses its cached resize)
 
         Returns:
-            Preprocessed image array and original size
+            Resized uint8 RGB array (input_size x input_size x 3) and original size.
+            Normalization is left to the model: ultralytics YOLOv8 accepts uint8
+            arrays and scales to [0, 1] on the inference device, so half the bytes
+            are moved compared with a float32 input.
         """
-        original_size = image.size
+        bundle = ImageBundle.wrap(image)
 
-        # Resize to model input size while maintaining aspect ratio
-        image = image.convert("RGB")
-        image = image.resize((self.config.input_size, self.config.input_size), Image.LANCZOS)
+        # Resized to model input size, kept as uint8
+        image_array = bundle.resized_rgb(self.config.input_size)
 
-        # Convert to numpy array and normalize
-        image_array = np.array(image, dtype=np.float32) / 255.0
+        return image_array, bundle.size
 
-        return image_array, original_size
-
-    def detect(self, image: Image.Image) -> List[DetectionResult]:
+    def detect(self, image: Union[Image.Image, ImageBundle]) -> List[DetectionResult]:
         """
         Run material detection on an image.
 
         Args:
-            image: PIL Image to detect materials in
+            image: PIL Image (or ImageBundle) to detect materials in
 
         Returns:
             List of DetectionResult objects
@@ -89,9 +96,6 @@ class MaterialDetector:
         Note:
             This is a MOCK implementation. In production, this would run actual YOLOv8 inference.
         """
-        if not self.model_loaded:
-            self.load_model()
-
         start_time = time.time()
 
         # Preprocess image
@@ -101,6 +105,66 @@ class MaterialDetector:
         # MOCK: Generate realistic detections
         detections = self._generate_mock_detections(img_width, img_height)
 
+        final_detections = self._postprocess(detections)
+
+        inference_time = (time.time() - start_time) * 1000
+        with self._count_lock:
+            self.inference_count += 1
+
+        logger.debug(
+            "YOLOv8 material detection completed: %d detections in %.2fms",
+            len(final_detections),
+            inference_time,
+        )
+
+        return final_detections
+
+    def detect_batch(
+        self, images: List[Union[Image.Image, ImageBundle]]
+    ) -> List[List[DetectionResult]]:
+        """
+        Run material detection on several images with a single forward pass.
+
+        Args:
+            images: PIL Images (or ImageBundles) to detect materials in
+
+        Returns:
+            One list of DetectionResult objects per input image, in input order
+
+        Note:
+            This is a MOCK implementation. In production, the stacked batch would be
+            passed to YOLOv8 in one call instead of one call per image.
+        """
+        if not images:
+            return []
+
+        start_time = time.time()
+
+        # Preprocess and stack into a single [N, H, W, 3] uint8 batch
+        preprocessed = [self.preprocess_image(image) for image in images]
+        batch = np.stack([processed for processed, _ in preprocessed])
+
+        # MOCK: Generate realistic detections for every image in the batch
+        results = [
+            self._postprocess(self._generate_mock_detections(*original_size))
+            for _, original_size in preprocessed
+        ]
+
+        inference_time = (time.time() - start_time) * 1000
+        with self._count_lock:
+            self.inference_count += len(images)
+
+        logger.debug(
+            "YOLOv8 batch material detection completed: %d images, %d detections in %.2fms",
+            batch.shape[0],
+            sum(len(r) for r in results),
+            inference_time,
+        )
+
+        return results
+
+    def _postprocess(self, detections: List[DetectionResult]) -> List[DetectionResult]:
+        """Apply confidence filtering, NMS and the max detection limit"""
         # Filter by confidence threshold
         filtered_detections = [
             d for d in detections if d.confidence >= self.config.confidence_threshold
@@ -110,17 +174,7 @@ class MaterialDetector:
         final_detections = self._apply_nms(filtered_detections)
 
         # Limit max detections
-        final_detections = final_detections[: self.config.max_detections]
-
-        inference_time = (time.time() - start_time) * 1000
-        self.inference_count += 1
-
-        logger.debug(
-            f"YOLOv8 material detection completed: {len(final_detections)} detections "
-            f"in {inference_time:.2f}ms"
-        )
-
-        return final_detections
+        return final_detections[: self.config.max_detections]
 
     def _generate_mock_detections(self, img_width: int, img_height: int) -> List[DetectionResult]:
         """
@@ -174,18 +228,52 @@ class MaterialDetector:
         """
         Apply Non-Maximum Suppression to remove overlapping detections.
 
-        This is a simplified mock version. In production, use proper NMS algorithm
-        to calculate IoU and suppress overlapping boxes.
+        Greedy, class-aware NMS: boxes are visited in descending confidence order and
+        each kept box suppresses lower-confidence boxes of the same material type whose
+        IoU with it is at least iou_threshold. IoU against all remaining boxes is
+        computed in one vectorized step per kept box.
         """
         if len(detections) <= 1:
             return detections
 
-        # Sort by confidence (descending)
-        sorted_detections = sorted(detections, key=lambda d: d.confidence, reverse=True)
+        boxes = np.array(
+            [
+                [d.bounding_box.x, d.bounding_box.y, d.bounding_box.width, d.bounding_box.height]
+                for d in detections
+            ],
+            dtype=np.float32,
+        )
+        x1 = boxes[:, 0]
+        y1 = boxes[:, 1]
+        x2 = x1 + boxes[:, 2]
+        y2 = y1 + boxes[:, 3]
+        areas = boxes[:, 2] * boxes[:, 3]
+
+        type_ids = {}
+        class_ids = np.array(
+            [type_ids.setdefault(d.material_type, len(type_ids)) for d in detections]
+        )
+        confidences = np.array([d.confidence for d in detections], dtype=np.float32)
+
+        # Sort by confidence (descending, stable for ties)
+        remaining = np.argsort(-confidences, kind="stable")
+        keep = []
+
+        while remaining.size:
+            i = remaining[0]
+            keep.append(i)
+            rest = remaining[1:]
+
+            inter_w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+            inter_h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+            inter = inter_w * inter_h
+            union = areas[i] + areas[rest] - inter
+            iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+            # Only boxes of the same material type suppress each other
+            remaining = rest[(iou < self.config.iou_threshold) | (class_ids[rest] != class_ids[i])]
 
-        # Keep top detections (simplified NMS)
-        # In production, calculate IoU and suppress overlapping boxes
-        return sorted_detections
+        return [detections[i] for i in keep]
 
     def get_inference_stats(self) -> dict:
         """Get inference statistics"""
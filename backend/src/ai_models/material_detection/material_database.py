@@ -1,14 +1,51 @@
 """Material and brand database loader and query interface"""
 
-import json
 import logging
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+import ahocorasick
+import ijson
+import orjson
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
 from src.schemas.material_detection import MaterialType, MaterialUnit
 
 logger = logging.getLogger(__name__)
 
+# Database files at least this large are stream-parsed with ijson, so the whole
+# JSON tree never coexists with the MaterialInfo/BrandInfo objects built from it;
+# smaller files are parsed in one orjson call, which is much faster
+STREAM_PARSE_MIN_BYTES = 8 * 1024 * 1024
+
+# Shorter (normalized) OCR text is too ambiguous to fuzzy-match against brands
+FUZZY_QUERY_MIN_LENGTH = 4
+
+
+def _iter_materials(path: Path) -> Iterator[dict]:
+    """Yield each entry of the top-level "materials" list"""
+    if path.stat().st_size < STREAM_PARSE_MIN_BYTES:
+        yield from orjson.loads(path.read_bytes()).get("materials", [])
+        return
+    with path.open("rb") as f:
+        yield from ijson.items(f, "materials.item", use_float=True)
+
+
+def _iter_brand_lists(path: Path) -> Iterator[Tuple[str, List[dict]]]:
+    """Yield (material_type, brand dicts) for each key of the top-level "brands" object"""
+    if path.stat().st_size < STREAM_PARSE_MIN_BYTES:
+        yield from orjson.loads(path.read_bytes()).get("brands", {}).items()
+        return
+    with path.open("rb") as f:
+        yield from ijson.kvitems(f, "brands", use_float=True)
+
+
+def make_brand_tag(brand_name: str) -> str:
+    """Response tag for a brand name, e.g. 'Owens Corning' -> 'brand_owens_corning'"""
+    return f"brand_{brand_name.lower().replace(' ', '_')}"
+
 
 class MaterialInfo:
     """Information about a material type"""
@@ -20,6 +57,11 @@ class MaterialInfo:
         self.detection_class = data["detection_class"]
         self.typical_brands = data.get("typical_brands", [])
         self.weight_per_unit_lbs = data.get("weight_per_unit_lbs", 0)
+        # Resolved once here rather than on every get_material_unit call
+        try:
+            self.unit_enum = MaterialUnit(self.unit)
+        except ValueError:
+            self.unit_enum = MaterialUnit.UNITS
 
 
 class BrandInfo:
@@ -29,13 +71,19 @@ class BrandInfo:
         self.name = data["name"]
         self.aliases = data.get("aliases", [])
         self.logo_keywords = data.get("logo_keywords", [])
+        # Lowercased once for case-insensitive matching
+        self.name_lc = self.name.lower()
+        self.aliases_lc = tuple(alias.lower() for alias in self.aliases)
+        self.logo_keywords_lc = tuple(keyword.lower() for keyword in self.logo_keywords)
+        self.tag = make_brand_tag(self.name)
 
 
 class MaterialDatabase:
     """
     Material and brand reference database.
 
-    Provides query interface for material types and brands.
+    Provides query interface for material types and brands. The JSON files are
+    loaded on construction.
     """
 
     def __init__(
@@ -47,19 +95,32 @@ class MaterialDatabase:
         self.brands_db_path = brands_db_path
         self.materials: Dict[str, MaterialInfo] = {}
         self.brands: Dict[str, List[BrandInfo]] = {}
+        # Lowercased name/alias -> brand, per material type (first brand wins on clashes)
+        self._brand_index: Dict[str, Dict[str, BrandInfo]] = {}
+        # Aho-Corasick automaton over all name/alias/keyword patterns, per material type
+        self._brand_automata: Dict[str, Optional[ahocorasick.Automaton]] = {}
+        # Normalized fuzzy match choices and their owning brands, per material type
+        self._fuzzy_choices: Dict[str, Tuple[List[str], List[BrandInfo]]] = {}
+        # Brand name -> precomputed response tag, across all material types
+        self._brand_tags: Dict[str, str] = {}
+        # Total brands across material types, maintained by load()
+        self._brand_count = 0
         self._loaded = False
+        # Loaded up front so query methods never need a lazy-load check
+        self.load()
 
     def load(self):
-        """Load materials and brands databases from JSON files"""
+        """Load materials and brands databases from JSON files (no-op once loaded)"""
+        if self._loaded:
+            return
+
         try:
             # Load materials database
             materials_path = Path(self.materials_db_path)
             if materials_path.exists():
-                with open(materials_path, "r") as f:
-                    materials_data = json.load(f)
-                    for material in materials_data.get("materials", []):
-                        material_info = MaterialInfo(material)
-                        self.materials[material_info.type] = material_info
+                for material in _iter_materials(materials_path):
+                    material_info = MaterialInfo(material)
+                    self.materials[material_info.type] = material_info
                 logger.info(f"Loaded {len(self.materials)} material types from {self.materials_db_path}")
             else:
                 logger.warning(f"Materials database not found at {self.materials_db_path}")
@@ -67,14 +128,23 @@ class MaterialDatabase:
             # Load brands database
             brands_path = Path(self.brands_db_path)
             if brands_path.exists():
-                with open(brands_path, "r") as f:
-                    brands_data = json.load(f)
-                    for material_type, brands_list in brands_data.get("brands", {}).items():
-                        self.brands[material_type] = [
-                            BrandInfo(brand) for brand in brands_list
-                        ]
-                brand_count = sum(len(brands) for brands in self.brands.values())
-                logger.info(f"Loaded {brand_count} brands from {self.brands_db_path}")
+                for material_type, brands_list in _iter_brand_lists(brands_path):
+                    self.brands[material_type] = [
+                        BrandInfo(brand) for brand in brands_list
+                    ]
+                    self._brand_count += len(self.brands[material_type])
+                    for brand in self.brands[material_type]:
+                        self._brand_tags.setdefault(brand.name, brand.tag)
+                    self._brand_index[material_type] = self._build_brand_index(
+                        self.brands[material_type]
+                    )
+                    self._brand_automata[material_type] = self._build_brand_automaton(
+                        self.brands[material_type]
+                    )
+                    self._fuzzy_choices[material_type] = self._build_fuzzy_choices(
+                        self.brands[material_type]
+                    )
+                logger.info(f"Loaded {self._brand_count} brands from {self.brands_db_path}")
             else:
                 logger.warning(f"Brands database not found at {self.brands_db_path}")
 
@@ -94,8 +164,6 @@ class MaterialDatabase:
         Returns:
             MaterialInfo or None if not found
         """
-        if not self._loaded:
-            self.load()
         return self.materials.get(material_type)
 
     def get_material_unit(self, material_type: str) -> MaterialUnit:
@@ -109,12 +177,7 @@ class MaterialDatabase:
             MaterialUnit enum value
         """
         material_info = self.get_material_info(material_type)
-        if material_info:
-            try:
-                return MaterialUnit(material_info.unit)
-            except ValueError:
-                pass
-        return MaterialUnit.UNITS
+        return material_info.unit_enum if material_info else MaterialUnit.UNITS
 
     def get_brands_for_material(self, material_type: str) -> List[BrandInfo]:
         """
@@ -126,8 +189,6 @@ class MaterialDatabase:
         Returns:
             List of BrandInfo objects
         """
-        if not self._loaded:
-            self.load()
         return self.brands.get(material_type, [])
 
     def find_brand_by_name(
@@ -143,15 +204,59 @@ class MaterialDatabase:
         Returns:
             BrandInfo or None if not found
         """
-        brands = self.get_brands_for_material(material_type)
+        return self._brand_index.get(material_type, {}).get(brand_name.lower())
+
+    def get_brand_tag(self, brand_name: str) -> str:
+        """
+        Get the response tag for a brand name.
+
+        Args:
+            brand_name: Brand name as detected (normally a BrandInfo.name)
+
+        Returns:
+            Precomputed tag for known brands, otherwise one built on the fly
+        """
+        tag = self._brand_tags.get(brand_name)
+        return tag if tag is not None else make_brand_tag(brand_name)
+
+    @staticmethod
+    def _build_brand_automaton(brands: List[BrandInfo]) -> Optional[ahocorasick.Automaton]:
+        """
+        Build an Aho-Corasick automaton matching every brand pattern in one text pass.
+
+        Each pattern maps to all (brand position, brand, score) entries that use it, since
+        the same string can be e.g. both a brand's name and its logo keyword.
+
+        Returns:
+            Automaton, or None when there are no patterns
+        """
+        patterns: Dict[str, List[Tuple[int, BrandInfo, int]]] = {}
+        for position, brand in enumerate(brands):
+            tiers = [(brand.name_lc, 100)]
+            tiers += [(alias, 95) for alias in brand.aliases_lc]
+            tiers += [(keyword, 85) for keyword in brand.logo_keywords_lc]
+            for pattern, score in tiers:
+                if pattern:
+                    patterns.setdefault(pattern, []).append((position, brand, score))
+
+        if not patterns:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for pattern, entries in patterns.items():
+            automaton.add_word(pattern, entries)
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _build_brand_index(brands: List[BrandInfo]) -> Dict[str, BrandInfo]:
+        """Map each lowercased brand name and alias to its brand, in list order"""
+        index: Dict[str, BrandInfo] = {}
         for brand in brands:
-            if brand.name.lower() == brand_name.lower():
-                return brand
-            # Check aliases
-            for alias in brand.aliases:
-                if alias.lower() == brand_name.lower():
-                    return brand
-        return None
+            index.setdefault(brand.name_lc, brand)
+            for alias in brand.aliases_lc:
+                index.setdefault(alias, brand)
+        return index
 
     def search_brands(
         self, material_type: str, text: str, threshold: int = 80
@@ -167,70 +272,135 @@ class MaterialDatabase:
         Returns:
             List of (BrandInfo, score) tuples sorted by score
         """
-        if not self._loaded:
-            self.load()
-
-        brands = self.get_brands_for_material(material_type)
-        matches = []
-
-        # Simple fuzzy matching (in production, use fuzzywuzzy library)
         text_lower = text.lower()
 
-        for brand in brands:
-            # Check exact matches first
-            if brand.name.lower() in text_lower:
-                matches.append((brand, 100))
-                continue
-
-            # Check aliases
-            for alias in brand.aliases:
-                if alias.lower() in text_lower:
-                    matches.append((brand, 95))
-                    break
-
-            # Check logo keywords
-            for keyword in brand.logo_keywords:
-                if keyword.lower() in text_lower:
-                    matches.append((brand, 85))
-                    break
-
-        # Filter by threshold and sort by score
-        matches = [(brand, score) for brand, score in matches if score >= threshold]
+        # Fast path: a brand name in the text is a literal hit, so the general path
+        # would return exactly the name hits (score 100) with no fuzzy fallback;
+        # without one, fall through so the result matches the general path
+        if threshold >= 100:
+            exact = [
+                (brand, 100)
+                for brand in self.get_brands_for_material(material_type)
+                if brand.name_lc in text_lower
+            ]
+            if exact:
+                return exact
+
+        # Literal substring matches first (cheap, and scored above fuzzy matches):
+        # one pass of the automaton finds every name (100), alias (95) and logo
+        # keyword (85) occurring in the text; keep the best score per brand
+        best: Dict[int, Tuple[BrandInfo, int]] = {}
+        automaton = self._brand_automata.get(material_type)
+        if automaton is not None:
+            for _, entries in automaton.iter(text_lower):
+                for position, brand, score in entries:
+                    if position not in best or score > best[position][1]:
+                        best[position] = (brand, score)
+
+        # Brand list order for ties, as the per-brand scan produced
+        matches = [best[position] for position in sorted(best)]
+
+        # Fall back to fuzzy matching (handles OCR typos) only when nothing matched
+        # literally. Decided before the threshold filter: a literal alias/keyword hit
+        # that misses the threshold must not be re-scored higher by the fuzzy pass.
+        if matches:
+            matches = [(brand, score) for brand, score in matches if score >= threshold]
+        else:
+            matches = self._fuzzy_search_brands(material_type, text, threshold)
+
+        # Sort by score
         matches.sort(key=lambda x: x[1], reverse=True)
 
         return matches
 
+    def _fuzzy_search_brands(
+        self, material_type: str, text: str, threshold: int
+    ) -> List[tuple[BrandInfo, int]]:
+        """
+        Fuzzy-match brand names, aliases and logo keywords against text with RapidFuzz.
+
+        Uses partial_ratio so a (possibly misspelled) brand name inside a longer OCR line
+        still scores high; score_cutoff lets RapidFuzz skip choices early. Choices are
+        normalized once at load time, so only the query is processed per call.
+
+        partial_ratio also scores 100 when the query is a fragment of a longer choice,
+        so choices longer than the query are re-scored with the full ratio, and queries
+        shorter than FUZZY_QUERY_MIN_LENGTH are not fuzzy-matched at all.
+
+        Returns:
+            List of (BrandInfo, score) tuples, best score per brand
+        """
+        choices, owners = self._fuzzy_choices.get(material_type, ([], []))
+        query = default_process(text)
+        if not choices or len(query) < FUZZY_QUERY_MIN_LENGTH:
+            return []
+
+        results = process.extract(
+            query,
+            choices,
+            scorer=fuzz.partial_ratio,
+            processor=None,
+            score_cutoff=threshold,
+            limit=None,
+        )
+
+        # ratio <= partial_ratio, so the cutoff above never drops a re-scored hit
+        scored = []
+        for choice, score, idx in results:
+            if len(choice) > len(query):
+                score = fuzz.ratio(query, choice)
+                if score < threshold:
+                    continue
+            scored.append((score, idx))
+        scored.sort(key=lambda hit: hit[0], reverse=True)
+
+        # Keep the best hit per brand
+        matches = []
+        seen = set()
+        for score, idx in scored:
+            brand = owners[idx]
+            if id(brand) not in seen:
+                seen.add(id(brand))
+                matches.append((brand, int(score)))
+        return matches
+
+    @staticmethod
+    def _build_fuzzy_choices(brands: List[BrandInfo]) -> Tuple[List[str], List[BrandInfo]]:
+        """Build normalized fuzzy-match choices (names, aliases, keywords) and their brands"""
+        choices = []
+        owners = []
+        for brand in brands:
+            for choice in [brand.name, *brand.aliases, *brand.logo_keywords]:
+                processed = default_process(choice)
+                if processed:
+                    choices.append(processed)
+                    owners.append(brand)
+        return choices, owners
+
     def get_all_material_types(self) -> List[str]:
         """Get list of all supported material types"""
-        if not self._loaded:
-            self.load()
         return list(self.materials.keys())
 
     def get_stats(self) -> dict:
         """Get database statistics"""
-        if not self._loaded:
-            self.load()
-
-        brand_count = sum(len(brands) for brands in self.brands.values())
-
         return {
             "loaded": self._loaded,
             "material_types": len(self.materials),
-            "total_brands": brand_count,
+            "total_brands": self._brand_count,
             "materials": list(self.materials.keys()),
         }
 
 
-# Singleton instance
-_material_db_instance: Optional[MaterialDatabase] = None
-
-
 def get_material_database(
     materials_db_path: str = "backend/data/materials.json",
     brands_db_path: str = "backend/data/brands.json",
 ) -> MaterialDatabase:
     """
-    Get singleton MaterialDatabase instance.
+    Get the shared, loaded MaterialDatabase for a pair of database paths.
+
+    Cached per (materials_db_path, brands_db_path), so every BrandDetector/pipeline
+    built with the same paths reuses one in-memory database (and its match indexes)
+    instead of re-reading the JSON files.
 
     Args:
         materials_db_path: Path to materials JSON file
@@ -239,8 +409,11 @@ def get_material_database(
     Returns:
         MaterialDatabase instance
     """
-    global _material_db_instance
-    if _material_db_instance is None:
-        _material_db_instance = MaterialDatabase(materials_db_path, brands_db_path)
-        _material_db_instance.load()
-    return _material_db_instance
+    # Call with positional args so default and explicit paths share one cache entry
+    return _load_material_database(materials_db_path, brands_db_path)
+
+
+@lru_cache(maxsize=None)
+def _load_material_database(materials_db_path: str, brands_db_path: str) -> MaterialDatabase:
+    """Create and load a MaterialDatabase (once per path pair)"""
+    return MaterialDatabase(materials_db_path, brands_db_path)
@@ -2,6 +2,7 @@
 
 import logging
 from typing import Optional
+import numpy as np
 
 from .config import ValidatorConfig
 from src.schemas.material_detection import QuantityAlert, AlertType
@@ -118,11 +119,57 @@ class MaterialValidator:
         Returns:
             List of QuantityAlert objects (None if no alert)
         """
-        alerts = []
+        if not detections:
+            return []
 
-        for detected_count, expected_count, unit in detections:
-            alert = self.validate_quantity(detected_count, expected_count, unit)
-            alerts.append(alert)
+        detected = np.fromiter((d[0] for d in detections), dtype=np.int64, count=len(detections))
+        has_expected = np.fromiter(
+            (d[1] is not None for d in detections), dtype=bool, count=len(detections)
+        )
+        expected = np.fromiter(
+            (d[1] if d[1] is not None else 0 for d in detections),
+            dtype=np.int64,
+            count=len(detections),
+        )
+
+        # Same arithmetic as validate_quantity, so threshold edge cases match exactly
+        variance = detected - expected
+        variance_percentage = np.zeros(len(detections), dtype=np.float64)
+        positive = expected > 0
+        variance_percentage[positive] = (variance[positive] / expected[positive]) * 100.0
+
+        underage = (
+            has_expected
+            & (variance < 0)
+            & (np.abs(variance_percentage) >= self.config.underage_threshold_pct)
+        )
+        overage = (
+            has_expected
+            & (variance > 0)
+            & (variance_percentage >= self.config.overage_threshold_pct)
+        )
+
+        # Only build alert objects for the (typically few) rows that cross a threshold
+        alerts: list[Optional[QuantityAlert]] = [None] * len(detections)
+        for idx in np.flatnonzero(underage):
+            detected_count, expected_count, unit = detections[idx]
+            alerts[idx] = self._create_underage_alert(
+                detected_count, expected_count, float(variance_percentage[idx]), unit
+            )
+        for idx in np.flatnonzero(overage):
+            detected_count, expected_count, unit = detections[idx]
+            alerts[idx] = self._create_overage_alert(
+                detected_count, expected_count, float(variance_percentage[idx]), unit
+            )
+
+        for idx in np.flatnonzero(underage | overage):
+            alert = alerts[idx]
+            logger.info(f"Quantity alert generated: {alert.type.value} - {alert.message}")
+
+        logger.debug(
+            f"Batch quantity validation: {len(detections)} items, "
+            f"{int(underage.sum())} underage, {int(overage.sum())} overage"
+        )
 
         return alerts
 
@@ -2,6 +2,9 @@
 
 import logging
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict
 from PIL import Image
 
@@ -11,6 +14,7 @@ from .counter import MaterialCounter
 from .brand_detector import BrandDetector
 from .material_validator import MaterialValidator
 from .material_database import MaterialDatabase, get_material_database
+from .preprocessing import ImageBundle
 from src.schemas.material_detection import (
     MaterialDetection,
     MaterialDetectionResponse,
@@ -21,6 +25,42 @@ from src.schemas.material_detection import (
 
 logger = logging.getLogger(__name__)
 
+# Tag string for each material type, resolved once at import
+_MATERIAL_TAGS: Dict[MaterialType, str] = {mt: mt.value for mt in MaterialType}
+
+
+@dataclass
+class _DetectionStats:
+    """Aggregates over a list of MaterialDetections, gathered in a single pass"""
+
+    total_units: int = 0
+    confidence_sum: float = 0.0
+    alert_count: int = 0
+    has_underage: bool = False
+    has_overage: bool = False
+    # Dicts used as insertion-ordered sets
+    material_types: Dict[MaterialType, None] = field(default_factory=dict)
+    brands: Dict[str, None] = field(default_factory=dict)
+
+    @classmethod
+    def collect(cls, detections: List[MaterialDetection]) -> "_DetectionStats":
+        """Scan the detections once, accumulating everything summary/tags/confidence need"""
+        stats = cls()
+        for d in detections:
+            stats.total_units += d.count
+            stats.confidence_sum += d.confidence
+            stats.material_types[d.type] = None
+            if d.brand:
+                stats.brands[d.brand] = None
+            if d.alert is not None:
+                stats.alert_count += 1
+                alert_type = d.alert.type.value
+                if alert_type == "underage":
+                    stats.has_underage = True
+                elif alert_type == "overage":
+                    stats.has_overage = True
+        return stats
+
 
 class MaterialDetectionPipeline:
     """
@@ -52,15 +92,11 @@ class MaterialDetectionPipeline:
         logger.info("Loading all material detection models...")
         start_time = time.time()
 
-        self.detector.load_model()
-        if self.config.enable_counting:
+        # The detector and counter load their weights when constructed
+        if not self.detector.model_loaded:
+            self.detector.load_model()
+        if self.config.enable_counting and not self.counter.model_loaded:
             self.counter.load_model()
-        if self.config.enable_brand_detection:
-            self.brand_detector.initialize_ocr()
-
-        # Load material database
-        if not self.material_db._loaded:
-            self.material_db.load()
 
         load_time = (time.time() - start_time) * 1000
         self.pipeline_loaded = True
@@ -89,14 +125,39 @@ class MaterialDetectionPipeline:
 
         logger.info(f"Processing image through material detection pipeline (size: {image.size})")
 
+        # Decode/resize once; the detector, counter and brand detector share these arrays
+        bundle = ImageBundle(image)
+
         # Step 1: Run object detection (YOLOv8)
-        detection_results = self.detector.detect(image)
+        detection_results = self.detector.detect(bundle)
         logger.debug(f"YOLOv8 detected {len(detection_results)} material units")
 
+        return self._process_detections(bundle, detection_results, expected_materials, start_time)
+
+    def _process_detections(
+        self,
+        bundle: ImageBundle,
+        detection_results: List[DetectionResult],
+        expected_materials: Optional[Dict[str, int]],
+        start_time: float,
+    ) -> MaterialDetectionResponse:
+        """
+        Run the per-image stages after detection: counting, brand detection,
+        quantity validation, summary and tags.
+
+        Args:
+            bundle: Image being processed
+            detection_results: YOLOv8 detections for the image
+            expected_materials: Optional dict mapping material_type -> expected_quantity
+            start_time: When processing of the image started (for processing_time_ms)
+
+        Returns:
+            MaterialDetectionResponse with all detections and metadata
+        """
         # Step 2: Count materials using density estimation
         count_results = {}
         if self.config.enable_counting and detection_results:
-            count_results = self.counter.count_materials(image, detection_results)
+            count_results = self.counter.count_materials(bundle, detection_results)
             logger.debug(f"Density counting completed for {len(count_results)} material types")
 
         # Step 3: For each material type, detect brand and validate quantity
@@ -105,6 +166,7 @@ class MaterialDetectionPipeline:
         # Group detections by material type
         detections_by_type = self._group_by_type(detection_results)
 
+        per_type = []
         for material_type, type_detections in detections_by_type.items():
             # Get count result
             if material_type in count_results:
@@ -119,19 +181,24 @@ class MaterialDetectionPipeline:
                 count = len(type_detections)
                 confidence = sum(d.confidence for d in type_detections) / len(type_detections)
                 bounding_boxes = [d.bounding_box for d in type_detections]
+            per_type.append((material_type, count, confidence, bounding_boxes))
 
-            # Detect brand
-            brand_name = None
-            if self.config.enable_brand_detection and bounding_boxes:
-                try:
-                    # Use first bounding box for brand detection
-                    brand_result = self.brand_detector.detect_brand(
-                        image, material_type, bounding_boxes[0]
-                    )
-                    if brand_result.confidence >= self.config.brand_detector.confidence_threshold:
-                        brand_name = brand_result.brand_name
-                except Exception as e:
-                    logger.error(f"Brand detection failed for {material_type.value}: {e}")
+        # Detect brands (one OCR call per material type, run concurrently)
+        brand_names = {}
+        if self.config.enable_brand_detection:
+            # Use first bounding box of each material type for brand detection
+            targets = [
+                (material_type, bounding_boxes[0])
+                for material_type, _, _, bounding_boxes in per_type
+                if bounding_boxes
+            ]
+            brand_results = self.brand_detector.detect_brands_concurrent(bundle, targets)
+            for (material_type, _), brand_result in zip(targets, brand_results):
+                if brand_result.confidence >= self.config.brand_detector.confidence_threshold:
+                    brand_names[material_type] = brand_result.brand_name
+
+        for material_type, count, confidence, bounding_boxes in per_type:
+            brand_name = brand_names.get(material_type)
 
             # Get material unit
             unit = self.material_db.get_material_unit(material_type.value)
@@ -160,15 +227,15 @@ class MaterialDetectionPipeline:
             material_detections.append(material_det)
 
         # Step 4: Generate summary and tags
-        summary = self._generate_summary(material_detections)
-        tags = self._generate_tags(material_detections)
+        # One scan of the detections feeds the summary, the tags and overall confidence
+        stats = _DetectionStats.collect(material_detections)
+        summary = self._generate_summary(material_detections, stats)
+        tags = self._generate_tags(material_detections, stats)
 
         # Calculate overall confidence (average of material confidences)
         overall_confidence = 0.0
         if material_detections:
-            overall_confidence = sum(m.confidence for m in material_detections) / len(
-                material_detections
-            )
+            overall_confidence = stats.confidence_sum / len(material_detections)
 
         # Calculate processing time
         processing_time_ms = int((time.time() - start_time) * 1000)
@@ -194,88 +261,72 @@ class MaterialDetectionPipeline:
         self, detections: List[DetectionResult]
     ) -> Dict[MaterialType, List[DetectionResult]]:
         """Group detections by material type"""
-        grouped = {}
+        grouped = defaultdict(list)
         for detection in detections:
-            if detection.material_type not in grouped:
-                grouped[detection.material_type] = []
             grouped[detection.material_type].append(detection)
-        return grouped
+        return dict(grouped)
 
     def _generate_summary(
-        self, detections: List[MaterialDetection]
+        self, detections: List[MaterialDetection], stats: Optional[_DetectionStats] = None
     ) -> MaterialSummary:
         """
         Generate summary statistics from detections.
 
         Args:
             detections: List of material detections
+            stats: Precomputed aggregates of detections (collected if omitted)
 
         Returns:
             MaterialSummary object
         """
-        # Count total units
-        total_units = sum(d.count for d in detections)
-
-        # Count discrepancy alerts
-        discrepancy_alerts = sum(1 for d in detections if d.alert is not None)
+        if stats is None:
+            stats = _DetectionStats.collect(detections)
 
         return MaterialSummary(
             total_materials_detected=len(detections),
-            total_units=total_units,
-            discrepancy_alerts=discrepancy_alerts,
+            total_units=stats.total_units,
+            discrepancy_alerts=stats.alert_count,
         )
 
-    def _generate_tags(self, detections: List[MaterialDetection]) -> List[str]:
+    def _generate_tags(
+        self, detections: List[MaterialDetection], stats: Optional[_DetectionStats] = None
+    ) -> List[str]:
         """
         Generate descriptive tags based on detections.
 
         Args:
             detections: List of material detections
+            stats: Precomputed aggregates of detections (collected if omitted)
 
         Returns:
             List of tags
         """
-        tags = []
-
         if not detections:
-            tags.append("no_materials_detected")
-            return tags
+            return ["no_materials_detected"]
 
-        # Add base tag
-        tags.append("delivery_confirmation")
+        if stats is None:
+            stats = _DetectionStats.collect(detections)
 
-        # Add material type tags
-        material_types = set(d.type for d in detections)
-        for material_type in material_types:
-            tags.append(material_type.value)
-
-        # Add brand tags
-        brands = set(d.brand for d in detections if d.brand)
-        for brand in brands:
-            # Normalize brand name for tag
-            brand_tag = brand.lower().replace(" ", "_")
-            tags.append(f"brand_{brand_tag}")
-
-        # Add alert tags
-        if any(d.alert is not None for d in detections):
-            tags.append("quantity_discrepancy")
-
-        if any(d.alert and d.alert.type.value == "underage" for d in detections):
-            tags.append("underage_alert")
-
-        if any(d.alert and d.alert.type.value == "overage" for d in detections):
-            tags.append("overage_alert")
-
-        # Add count-based tags
-        total_units = sum(d.count for d in detections)
+        # Count-based tag
+        total_units = stats.total_units
         if total_units >= 50:
-            tags.append("large_delivery")
+            size_tag = "large_delivery"
         elif total_units >= 20:
-            tags.append("medium_delivery")
+            size_tag = "medium_delivery"
         else:
-            tags.append("small_delivery")
-
-        return tags
+            size_tag = "small_delivery"
+
+        # Built as one list, in fixed order: base tag, material types, brands,
+        # alerts, size
+        return [
+            "delivery_confirmation",
+            *[_MATERIAL_TAGS[material_type] for material_type in stats.material_types],
+            *[self.material_db.get_brand_tag(brand) for brand in stats.brands],
+            *(("quantity_discrepancy",) if stats.alert_count else ()),
+            *(("underage_alert",) if stats.has_underage else ()),
+            *(("overage_alert",) if stats.has_overage else ()),
+            size_tag,
+        ]
 
     def process_batch(
         self,
@@ -285,6 +336,9 @@ class MaterialDetectionPipeline:
         """
         Process multiple images in batch.
 
+        Detection runs over batches of up to ``config.batch_size`` images in one
+        forward pass; counting, OCR and validation then run per image.
+
         Args:
             images: List of PIL Images to process
             expected_materials_list: Optional list of expected materials dicts
@@ -298,20 +352,63 @@ class MaterialDetectionPipeline:
         logger.info(f"Processing batch of {len(images)} images")
         start_time = time.time()
 
-        results = {}
-
+        # Decode/resize every image once; undecodable images fail individually
+        bundles: List[Optional[ImageBundle]] = []
         for idx, image in enumerate(images):
+            try:
+                bundle = ImageBundle(image)
+                bundle.resized_rgb(self.config.detector.input_size)
+                bundles.append(bundle)
+            except Exception as e:
+                logger.error(f"Failed to process image {idx}: {e}")
+                bundles.append(None)
+
+        # Step 1 for the whole batch: one YOLOv8 forward pass per config.batch_size images
+        valid = [idx for idx, bundle in enumerate(bundles) if bundle is not None]
+        detections: Dict[int, List[DetectionResult]] = {}
+        detect_started: Dict[int, float] = {}
+        for chunk_start in range(0, len(valid), self.config.batch_size):
+            chunk = valid[chunk_start:chunk_start + self.config.batch_size]
+            chunk_start_time = time.time()
+            try:
+                chunk_results = self.detector.detect_batch([bundles[idx] for idx in chunk])
+            except Exception as e:
+                logger.error(f"Failed to run detection for images {chunk}: {e}")
+                continue
+            for idx, detection_results in zip(chunk, chunk_results):
+                detections[idx] = detection_results
+                detect_started[idx] = chunk_start_time
+
+        def process_one(idx: int) -> Optional[MaterialDetectionResponse]:
+            if idx not in detections:
+                return None
+
             expected_materials = None
             if expected_materials_list and idx < len(expected_materials_list):
                 expected_materials = expected_materials_list[idx]
 
             try:
-                response = self.process_image(image, expected_materials)
-                results[str(idx)] = response
+                return self._process_detections(
+                    bundles[idx], detections[idx], expected_materials, detect_started[idx]
+                )
             except Exception as e:
                 logger.error(f"Failed to process image {idx}: {e}")
                 # Return None for failed images
-                results[str(idx)] = None
+                return None
+
+        # The remaining stages are per image; images are independent and
+        # inference/OCR release the GIL, so run them concurrently. map() keeps
+        # responses in input order
+        max_workers = min(self.config.max_batch_workers, len(images))
+        if max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="material-batch"
+            ) as executor:
+                responses = list(executor.map(process_one, range(len(images))))
+        else:
+            responses = [process_one(idx) for idx in range(len(images))]
+
+        results = {str(idx): response for idx, response in enumerate(responses)}
 
         batch_time = (time.time() - start_time) * 1000
         logger.info(f"Batch processing completed in {batch_time:.2f}ms")
@@ -0,0 +1,68 @@
+"""Shared image preprocessing for the material detection models"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Tuple, Union
+from PIL import Image
+import numpy as np
+import cv2
+
+
+@dataclass
+class ImageBundle:
+    """
+    A PIL image plus lazily computed array forms of it.
+
+    Built once per image at pipeline entry and passed to the detector, counter and
+    brand detector, so RGB decoding and per-input-size resizing happen once per image
+    instead of once per model. Cached arrays are read-only since they are shared.
+    """
+
+    image: Image.Image
+    _resized: Dict[int, np.ndarray] = field(default_factory=dict, repr=False)
+    _normalized: Dict[int, np.ndarray] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def wrap(cls, image: Union[Image.Image, "ImageBundle"]) -> "ImageBundle":
+        """Return the image as an ImageBundle (no-op if it already is one)"""
+        if isinstance(image, ImageBundle):
+            return image
+        return cls(image)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the original image"""
+        return self.image.size
+
+    @cached_property
+    def rgb_uint8(self) -> np.ndarray:
+        """HxWx3 uint8 RGB array of the full image"""
+        array = np.asarray(self.image.convert("RGB"))
+        array.flags.writeable = False
+        return array
+
+    def resized_rgb(self, input_size: int) -> np.ndarray:
+        """input_size x input_size x 3 uint8 RGB array (area interpolation when shrinking)"""
+        resized = self._resized.get(input_size)
+        if resized is None:
+            width, height = self.size
+            shrinking = width > input_size or height > input_size
+            resized = cv2.resize(
+                self.rgb_uint8,
+                (input_size, input_size),
+                interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR,
+            )
+            resized.flags.writeable = False
+            self._resized[input_size] = resized
+        return resized
+
+    def normalized(self, input_size: int) -> np.ndarray:
+        """Resized RGB array as float32 in [0, 1]"""
+        normalized = self._normalized.get(input_size)
+        if normalized is None:
+            # Normalize in place in float32 (no float64 temporary)
+            normalized = self.resized_rgb(input_size).astype(np.float32)
+            normalized *= 1.0 / 255.0
+            normalized.flags.writeable = False
+            self._normalized[input_size] = normalized
+        return normalized
@@ -1,11 +1,16 @@
 """Model loading and caching utilities"""
 
 import logging
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterable
 from enum import Enum
 
-from .damage_detection import DamageDetectionPipeline, DamageDetectionConfig
-from .volume_estimation import VolumeEstimationPipeline, VolumeEstimationConfig
+# Pipelines pull in torch/cv2 and their model stacks, so they are imported on first
+# use; processes that need only one model (or none) skip the others entirely
+if TYPE_CHECKING:
+    from .damage_detection import DamageDetectionPipeline, DamageDetectionConfig
+    from .volume_estimation import VolumeEstimationPipeline, VolumeEstimationConfig
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +28,40 @@ class ModelLoader:
     Implements model caching and lazy loading.
     """
 
+    # One attribute per supported model type, so the hot get_*_pipeline calls are
+    # plain attribute reads and None checks rather than dict lookups
+    __slots__ = ("damage", "material", "volume", "_locks")
+
+    # ModelType -> attribute holding that model (used by the rarely called
+    # unload/introspection methods)
+    _ATTRIBUTES = {
+        ModelType.DAMAGE_DETECTION: "damage",
+        ModelType.MATERIAL_DETECTION: "material",
+        ModelType.VOLUME_ESTIMATION: "volume",
+    }
+
     _instance: Optional["ModelLoader"] = None
-    _models: Dict[ModelType, Any] = {}
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
+        # Double-checked locking: concurrent first calls must not build two loaders
         if cls._instance is None:
-            cls._instance = super(ModelLoader, cls).__new__(cls)
-            cls._instance._models = {}
-            logger.info("Initialized ModelLoader singleton")
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(ModelLoader, cls).__new__(cls)
+                    instance.damage = None
+                    instance.material = None
+                    instance.volume = None
+                    # Per-model locks, so a slow load of one model does not block
+                    # the others; reentrant for nested get_* calls on one thread
+                    instance._locks = {model_type: threading.RLock() for model_type in ModelType}
+                    cls._instance = instance
+                    logger.info("Initialized ModelLoader singleton")
         return cls._instance
 
     def get_damage_detection_pipeline(
-        self, config: Optional[DamageDetectionConfig] = None
-    ) -> DamageDetectionPipeline:
+        self, config: Optional["DamageDetectionConfig"] = None
+    ) -> "DamageDetectionPipeline":
         """
         Get or create damage detection pipeline instance.
 
@@ -45,20 +71,28 @@ class ModelLoader:
         Returns:
             DamageDetectionPipeline instance
         """
-        if ModelType.DAMAGE_DETECTION not in self._models:
-            logger.info("Creating new DamageDetectionPipeline instance")
-            pipeline = DamageDetectionPipeline(config)
-            pipeline.load_models()
-            self._models[ModelType.DAMAGE_DETECTION] = pipeline
-            logger.info("DamageDetectionPipeline loaded and cached")
-        else:
+        # Lock-free fast path once loaded; otherwise load under the model's lock,
+        # re-checking in case a concurrent first request got there first
+        pipeline = self.damage
+        if pipeline is not None:
             logger.debug("Using cached DamageDetectionPipeline instance")
+            return pipeline
+
+        with self._locks[ModelType.DAMAGE_DETECTION]:
+            if self.damage is None:
+                from .damage_detection import DamageDetectionPipeline
 
-        return self._models[ModelType.DAMAGE_DETECTION]
+                logger.info("Creating new DamageDetectionPipeline instance")
+                pipeline = DamageDetectionPipeline(config)
+                pipeline.load_models()
+                self.damage = pipeline
+                logger.info("DamageDetectionPipeline loaded and cached")
+
+            return self.damage
 
     def get_volume_estimation_pipeline(
-        self, config: Optional[VolumeEstimationConfig] = None
-    ) -> VolumeEstimationPipeline:
+        self, config: Optional["VolumeEstimationConfig"] = None
+    ) -> "VolumeEstimationPipeline":
         """
         Get or create volume estimation pipeline instance.
 
@@ -68,16 +102,57 @@ class ModelLoader:
         Returns:
             VolumeEstimationPipeline instance
         """
-        if ModelType.VOLUME_ESTIMATION not in self._models:
-            logger.info("Creating new VolumeEstimationPipeline instance")
-            pipeline = VolumeEstimationPipeline(config)
-            pipeline.load_models()
-            self._models[ModelType.VOLUME_ESTIMATION] = pipeline
-            logger.info("VolumeEstimationPipeline loaded and cached")
-        else:
+        # Lock-free fast path once loaded; otherwise load under the model's lock,
+        # re-checking in case a concurrent first request got there first
+        pipeline = self.volume
+        if pipeline is not None:
             logger.debug("Using cached VolumeEstimationPipeline instance")
+            return pipeline
+
+        with self._locks[ModelType.VOLUME_ESTIMATION]:
+            if self.volume is None:
+                from .volume_estimation import VolumeEstimationPipeline
+
+                logger.info("Creating new VolumeEstimationPipeline instance")
+                pipeline = VolumeEstimationPipeline(config)
+                pipeline.load_models()
+                self.volume = pipeline
+                logger.info("VolumeEstimationPipeline loaded and cached")
 
-        return self._models[ModelType.VOLUME_ESTIMATION]
+            return self.volume
+
+    def prewarm(self, model_types: Iterable[ModelType]):
+        """
+        Create and load pipelines ahead of the first request.
+
+        Meant to run at process start, so the first request does not pay for model
+        loading. Pipelines load concurrently (weight loading and device setup release
+        the GIL). Model types without a loader here are skipped with a warning.
+
+        Args:
+            model_types: Model types to load
+        """
+        getters = {
+            ModelType.DAMAGE_DETECTION: self.get_damage_detection_pipeline,
+            ModelType.VOLUME_ESTIMATION: self.get_volume_estimation_pipeline,
+        }
+
+        loaders = []
+        for model_type in dict.fromkeys(model_types):
+            getter = getters.get(model_type)
+            if getter is None:
+                logger.warning(f"No pipeline loader for {model_type.value}, not prewarming it")
+            else:
+                loaders.append(getter)
+
+        if not loaders:
+            return
+
+        logger.info(f"Prewarming {len(loaders)} model pipeline(s)")
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = [executor.submit(loader) for loader in loaders]
+            for future in futures:
+                future.result()
 
     def unload_model(self, model_type: ModelType):
         """
@@ -86,26 +161,38 @@ class ModelLoader:
         Args:
             model_type: Type of model to unload
         """
-        if model_type in self._models:
-            del self._models[model_type]
-            logger.info(f"Unloaded {model_type.value} model from cache")
+        attribute = self._ATTRIBUTES[model_type]
+        with self._locks[model_type]:
+            if getattr(self, attribute) is not None:
+                setattr(self, attribute, None)
+                logger.info(f"Unloaded {model_type.value} model from cache")
 
     def unload_all_models(self):
         """Unload all cached models"""
-        self._models.clear()
+        for model_type, attribute in self._ATTRIBUTES.items():
+            with self._locks[model_type]:
+                setattr(self, attribute, None)
         logger.info("Unloaded all models from cache")
 
     def get_loaded_models(self) -> list:
         """Get list of currently loaded model types"""
-        return list(self._models.keys())
+        return [
+            model_type
+            for model_type, attribute in self._ATTRIBUTES.items()
+            if getattr(self, attribute) is not None
+        ]
 
     def get_model_stats(self) -> Dict[str, Any]:
         """Get statistics for all loaded models"""
         stats = {}
 
-        for model_type, model in self._models.items():
-            if hasattr(model, "get_stats"):
-                stats[model_type.value] = model.get_stats()
+        # Every pipeline type provides get_stats
+        if self.damage is not None:
+            stats[ModelType.DAMAGE_DETECTION.value] = self.damage.get_stats()
+        if self.material is not None:
+            stats[ModelType.MATERIAL_DETECTION.value] = self.material.get_stats()
+        if self.volume is not None:
+            stats[ModelType.VOLUME_ESTIMATION.value] = self.volume.get_stats()
 
         return stats
 
@@ -7,7 +7,8 @@ from .config import (
     ScaleDetectionConfig,
     VolumeCalculationConfig,
     ConfidenceConfig,
-    default_config
+    default_config,
+    load_config
 )
 from .pipeline import VolumeEstimationPipeline
 
@@ -19,5 +20,6 @@ __all__ = [
     "VolumeCalculationConfig",
     "ConfidenceConfig",
     "default_config",
+    "load_config",
     "VolumeEstimationPipeline"
 ]
@@ -1,37 +1,56 @@
-"""Volume Estimation Engine Configuration"""
+"""Volume Estimation Engine Configuration
+
+The configs are frozen, slotted dataclasses rather than pydantic models: they are
+built once and then read on every request, where slot access is cheapest. Use
+``load_config`` to validate untrusted (e.g. JSON) input at the boundary.
+"""
 
 import os
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
 
 
-class DepthEstimationConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class DepthEstimationConfig:
     """Configuration for depth estimation model (MiDaS/DPT)"""
 
-    model_type: str = Field(default="DPT_Large", description="DPT model variant")
-    model_path: Optional[str] = Field(default=None, description="Path to model weights")
-    input_size: int = Field(default=384, description="Model input size")
-    normalize: bool = Field(default=True, description="Normalize depth maps")
-    optimize: bool = Field(default=True, description="Optimize model for inference")
-    device: str = Field(default="cuda", description="Device to run inference on")
-
-    class Config:
-        frozen = True
-
-
-class MaterialSegmentationConfig(BaseModel):
+    model_type: str = "DPT_Large"  # DPT model variant
+    model_path: Optional[str] = None
+    input_size: int = 384
+    normalize: bool = True  # Normalize depth maps
+    optimize: bool = True  # Optimize model for inference
+    # Wrap the torch model in torch.compile (dynamic shapes); slow first requests
+    compile_model: bool = False
+    # Resize with INTER_CUBIC both ways instead of INTER_AREA down / INTER_LINEAR up
+    cubic_interpolation: bool = False
+    device: str = "cuda"
+    # Use the mock depth model instead of MiDaS/DPT from torch hub
+    use_mock_model: bool = True
+    # INT8-quantized ONNX export of the model, used instead of torch on CPU
+    onnx_model_path: Optional[str] = None
+    # Memory budget for model-resolution predictions cached by image content hash,
+    # used when VolumeEstimationConfig.enable_caching is set (0 disables)
+    result_cache_max_bytes: int = 16 * 1024 * 1024
+
+    def __post_init__(self):
+        if self.result_cache_max_bytes < 0:
+            raise ValueError("result_cache_max_bytes must be >= 0")
+
+
+@dataclass(frozen=True, slots=True)
+class MaterialSegmentationConfig:
     """Configuration for material segmentation model"""
 
-    model_type: str = Field(default="deeplabv3_resnet50", description="Segmentation model")
-    model_path: Optional[str] = Field(default=None, description="Path to model weights")
-    input_size: tuple = Field(default=(512, 512), description="Input image size")
-    num_classes: int = Field(default=5, description="Number of material classes")
-    device: str = Field(default="cuda", description="Device to run inference on")
-    threshold: float = Field(default=0.5, description="Segmentation confidence threshold")
+    model_type: str = "deeplabv3_resnet50"
+    model_path: Optional[str] = None
+    input_size: tuple = (512, 512)
+    num_classes: int = 5
+    device: str = "cuda"
+    threshold: float = 0.5  # Segmentation confidence threshold
 
     # Material class mappings
-    material_classes: Dict[int, str] = Field(
-        default={
+    material_classes: Dict[int, str] = field(
+        default_factory=lambda: {
             0: "background",
             1: "gravel",
             2: "mulch",
@@ -40,21 +59,19 @@ class MaterialSegmentationConfig(BaseModel):
         }
     )
 
-    class Config:
-        frozen = True
-
 
-class ScaleDetectionConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ScaleDetectionConfig:
     """Configuration for scale reference detection"""
 
-    model_type: str = Field(default="yolov8n", description="YOLOv8 model size")
-    model_path: Optional[str] = Field(default=None, description="Path to model weights")
-    confidence_threshold: float = Field(default=0.5, description="Detection confidence threshold")
-    device: str = Field(default="cuda", description="Device to run inference on")
+    model_type: str = "yolov8n"  # YOLOv8 model size
+    model_path: Optional[str] = None
+    confidence_threshold: float = 0.5
+    device: str = "cuda"
 
     # Reference object classes
-    reference_classes: Dict[str, int] = Field(
-        default={
+    reference_classes: Dict[str, int] = field(
+        default_factory=lambda: {
             "person": 0,
             "measuring_tape": 1,
             "ruler": 2,
@@ -63,16 +80,14 @@ class ScaleDetectionConfig(BaseModel):
         }
     )
 
-    class Config:
-        frozen = True
 
-
-class VolumeCalculationConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class VolumeCalculationConfig:
     """Configuration for volume calculation"""
 
     # Unit conversion factors (to cubic meters)
-    unit_conversions: Dict[str, float] = Field(
-        default={
+    unit_conversions: Dict[str, float] = field(
+        default_factory=lambda: {
             "cubic_meters": 1.0,
             "cubic_yards": 0.764555,
             "cubic_feet": 0.0283168,
@@ -81,11 +96,11 @@ class VolumeCalculationConfig(BaseModel):
         }
     )
 
-    default_unit: str = Field(default="cubic_yards", description="Default output unit")
+    default_unit: str = "cubic_yards"
 
     # Scale reference defaults (in cm)
-    reference_heights: Dict[str, float] = Field(
-        default={
+    reference_heights: Dict[str, float] = field(
+        default_factory=lambda: {
             "person": 170.0,
             "car": 150.0,
             "wheel": 65.0
@@ -93,62 +108,57 @@ class VolumeCalculationConfig(BaseModel):
     )
 
     # Calculation parameters
-    smoothing_kernel_size: int = Field(default=5, description="Depth map smoothing kernel")
-    depth_max_meters: float = Field(default=10.0, description="Maximum depth in meters")
-    pixel_area_threshold: int = Field(default=1000, description="Minimum material pixel area")
-
-    class Config:
-        frozen = True
+    smoothing_kernel_size: int = 5  # Depth map smoothing kernel
+    depth_max_meters: float = 10.0
+    pixel_area_threshold: int = 1000  # Minimum material pixel area
 
 
-class ConfidenceConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ConfidenceConfig:
     """Configuration for confidence scoring"""
 
     # Confidence weights for different components
-    depth_weight: float = Field(default=0.35, description="Weight for depth estimation confidence")
-    segmentation_weight: float = Field(default=0.30, description="Weight for segmentation confidence")
-    scale_weight: float = Field(default=0.35, description="Weight for scale detection confidence")
+    depth_weight: float = 0.35
+    segmentation_weight: float = 0.30
+    scale_weight: float = 0.35
 
     # Confidence thresholds
-    low_confidence_threshold: float = Field(default=0.7, description="Below this requires user confirmation")
-    high_confidence_threshold: float = Field(default=0.85, description="Above this is high confidence")
+    low_confidence_threshold: float = 0.7  # Below this requires user confirmation
+    high_confidence_threshold: float = 0.85
 
     # Uncertainty parameters
-    confidence_interval_multiplier: float = Field(default=1.96, description="95% confidence interval")
+    confidence_interval_multiplier: float = 1.96  # 95% confidence interval
 
-    class Config:
-        frozen = True
 
-
-class VolumeEstimationConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class VolumeEstimationConfig:
     """Master configuration for Volume Estimation Engine"""
 
     # Model version
-    model_version: str = Field(default="volume-v1.0.0", description="Volume estimation model version")
+    model_version: str = "volume-v1.0.0"
 
     # Sub-configurations
-    depth_estimation: DepthEstimationConfig = Field(default_factory=DepthEstimationConfig)
-    material_segmentation: MaterialSegmentationConfig = Field(default_factory=MaterialSegmentationConfig)
-    scale_detection: ScaleDetectionConfig = Field(default_factory=ScaleDetectionConfig)
-    volume_calculation: VolumeCalculationConfig = Field(default_factory=VolumeCalculationConfig)
-    confidence: ConfidenceConfig = Field(default_factory=ConfidenceConfig)
+    depth_estimation: DepthEstimationConfig = field(default_factory=DepthEstimationConfig)
+    material_segmentation: MaterialSegmentationConfig = field(
+        default_factory=MaterialSegmentationConfig
+    )
+    scale_detection: ScaleDetectionConfig = field(default_factory=ScaleDetectionConfig)
+    volume_calculation: VolumeCalculationConfig = field(default_factory=VolumeCalculationConfig)
+    confidence: ConfidenceConfig = field(default_factory=ConfidenceConfig)
 
     # Performance settings
-    max_image_size: int = Field(default=2048, description="Maximum image dimension")
-    target_latency_ms: int = Field(default=550, description="Target P95 latency")
-    enable_caching: bool = Field(default=True, description="Enable result caching")
-    cache_ttl_seconds: int = Field(default=3600, description="Cache TTL in seconds")
+    max_image_size: int = 2048  # Maximum image dimension
+    target_latency_ms: int = 550  # Target P95 latency
+    enable_caching: bool = True  # Enable result caching
+    cache_ttl_seconds: int = 3600
 
     # S3 settings for depth map storage
-    s3_bucket: str = Field(default=os.getenv("S3_BUCKET", "companycam-photos"), description="S3 bucket for depth maps")
-    s3_depth_map_prefix: str = Field(default="depth_maps/", description="S3 prefix for depth maps")
+    s3_bucket: str = os.getenv("S3_BUCKET", "companycam-photos")
+    s3_depth_map_prefix: str = "depth_maps/"
 
     # Monitoring
-    enable_metrics: bool = Field(default=True, description="Enable Prometheus metrics")
-    log_predictions: bool = Field(default=True, description="Log prediction details")
-
-    class Config:
-        frozen = True
+    enable_metrics: bool = True  # Enable Prometheus metrics
+    log_predictions: bool = True  # Log prediction details
 
     def get_device(self) -> str:
         """Get the compute device (cuda or cpu)"""
@@ -158,5 +168,25 @@ class VolumeEstimationConfig(BaseModel):
         return "cpu"
 
 
+def load_config(data: Dict[str, Any]) -> VolumeEstimationConfig:
+    """
+    Validate a config mapping (e.g. parsed JSON) into a VolumeEstimationConfig.
+
+    Validation happens here, at the boundary, so the dataclasses stay cheap to read.
+
+    Args:
+        data: Config fields, with sub-configurations as nested mappings
+
+    Returns:
+        Validated VolumeEstimationConfig
+
+    Raises:
+        pydantic.ValidationError: If a field has the wrong type
+    """
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(VolumeEstimationConfig).validate_python(data)
+
+
 # Default configuration instance
 default_config = VolumeEstimationConfig()
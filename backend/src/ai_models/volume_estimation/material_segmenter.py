@@ -2,7 +2,7 @@
 
 import logging
 import time
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 import numpy as np
 import cv2
 
@@ -28,6 +28,10 @@ class MaterialSegmenter:
         self._inference_count = 0
         self._total_inference_time = 0.0
 
+        # Per-class pixel counts come from a single bincount indexed by class id
+        self._class_ids = {name: class_id for class_id, name in config.material_classes.items()}
+        self._num_class_bins = max(config.material_classes, default=-1) + 1
+
         logger.info(f"MaterialSegmenter initialized with model_type={config.model_type}, device={config.device}")
 
     def load_model(self):
@@ -113,8 +117,12 @@ class MaterialSegmenter:
                 interpolation=cv2.INTER_NEAREST
             )
 
+            class_counts = self._count_classes(class_map)
+
             # Identify dominant material class (exclude background)
-            material_type, material_confidence = self._identify_material(class_map, class_probs)
+            material_type, material_confidence = self._identify_material(
+                class_map, class_probs, class_counts
+            )
 
             # Create binary mask for material
             mask = self._create_material_mask(class_map, material_type)
@@ -134,7 +142,7 @@ class MaterialSegmenter:
                 "material_confidence": round(material_confidence, 3),
                 "mask_coverage": round(mask.sum() / mask.size, 3),
                 "material_pixel_count": int(mask.sum()),
-                "class_distribution": self._compute_class_distribution(class_map)
+                "class_distribution": self._compute_class_distribution(class_map, class_counts)
             }
 
             logger.debug(
@@ -148,40 +156,54 @@ class MaterialSegmenter:
             logger.error(f"Material segmentation failed: {e}")
             raise
 
-    def _identify_material(self, class_map: np.ndarray, class_probs: np.ndarray) -> Tuple[str, float]:
+    def _count_classes(self, class_map: np.ndarray) -> np.ndarray:
+        """
+        Count pixels per class in one pass over the class map.
+
+        Args:
+            class_map: Class prediction map (H, W) of non-negative class ids
+
+        Returns:
+            Pixel counts indexed by class id
+        """
+        return np.bincount(class_map.ravel(), minlength=self._num_class_bins)
+
+    def _identify_material(
+        self,
+        class_map: np.ndarray,
+        class_probs: np.ndarray,
+        class_counts: Optional[np.ndarray] = None,
+    ) -> Tuple[str, float]:
         """
         Identify the dominant material type from segmentation.
 
         Args:
             class_map: Class prediction map (H, W)
             class_probs: Class probabilities (H, W, num_classes)
+            class_counts: Pixel counts per class id (computed if not given)
 
         Returns:
             Tuple of (material_type, confidence)
         """
-        # Count pixels for each class (excluding background)
-        class_counts = {}
+        if class_counts is None:
+            class_counts = self._count_classes(class_map)
+
+        # Find dominant material (excluding background)
+        material_class_id = None
+        dominant_count = 0
         for class_id, class_name in self.config.material_classes.items():
-            if class_name != "background":
-                count = (class_map == class_id).sum()
-                class_counts[class_name] = count
+            if class_name != "background" and class_counts[class_id] > dominant_count:
+                material_class_id = class_id
+                dominant_count = class_counts[class_id]
 
-        # Find dominant material
-        if not class_counts or max(class_counts.values()) == 0:
+        if material_class_id is None:
             return "unknown", 0.0
 
-        dominant_material = max(class_counts, key=class_counts.get)
-
         # Calculate confidence as average probability in material region
-        material_class_id = [k for k, v in self.config.material_classes.items() if v == dominant_material][0]
         material_mask = (class_map == material_class_id)
+        confidence = class_probs[:, :, material_class_id][material_mask].mean()
 
-        if material_mask.sum() > 0:
-            confidence = class_probs[:, :, material_class_id][material_mask].mean()
-        else:
-            confidence = 0.0
-
-        return dominant_material, float(confidence)
+        return self.config.material_classes[material_class_id], float(confidence)
 
     def _create_material_mask(self, class_map: np.ndarray, material_type: str) -> np.ndarray:
         """
@@ -194,12 +216,7 @@ class MaterialSegmenter:
         Returns:
             Binary mask
         """
-        # Get class ID for material
-        material_class_id = None
-        for class_id, class_name in self.config.material_classes.items():
-            if class_name == material_type:
-                material_class_id = class_id
-                break
+        material_class_id = self._class_ids.get(material_type)
 
         if material_class_id is None:
             return np.zeros_like(class_map, dtype=np.uint8)
@@ -237,24 +254,28 @@ class MaterialSegmenter:
 
         return mask
 
-    def _compute_class_distribution(self, class_map: np.ndarray) -> Dict[str, float]:
+    def _compute_class_distribution(
+        self, class_map: np.ndarray, class_counts: Optional[np.ndarray] = None
+    ) -> Dict[str, float]:
         """
         Compute distribution of classes in segmentation.
 
         Args:
             class_map: Class prediction map
+            class_counts: Pixel counts per class id (computed if not given)
 
         Returns:
             Dict mapping class names to pixel percentages
         """
-        total_pixels = class_map.size
-        distribution = {}
+        if class_counts is None:
+            class_counts = self._count_classes(class_map)
 
-        for class_id, class_name in self.config.material_classes.items():
-            count = (class_map == class_id).sum()
-            distribution[class_name] = round(count / total_pixels, 4)
+        total_pixels = class_map.size
 
-        return distribution
+        return {
+            class_name: round(class_counts[class_id] / total_pixels, 4)
+            for class_id, class_name in self.config.material_classes.items()
+        }
 
     def get_stats(self) -> dict:
         """Get material segmenter statistics"""
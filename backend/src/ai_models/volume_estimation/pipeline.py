@@ -35,7 +35,11 @@ class VolumeEstimationPipeline:
         self.device = self.config.get_device()
 
         # Initialize components
-        self.depth_estimator = DepthEstimator(self.config.depth_estimation)
+        self.depth_estimator = DepthEstimator(
+            self.config.depth_estimation,
+            enable_caching=self.config.enable_caching,
+            cache_ttl_seconds=self.config.cache_ttl_seconds,
+        )
         self.material_segmenter = MaterialSegmenter(self.config.material_segmentation)
         self.scale_detector = ScaleDetector(self.config.scale_detection)
         self.volume_calculator = VolumeCalculator(self.config.volume_calculation)
@@ -52,6 +52,9 @@ class Settings(BaseSettings):
     # ML Models
     ml_model_path: str = "/app/ml-models/models"
     ml_confidence_threshold: float = 0.75
+    # Comma-separated model types (e.g. "damage_detection,volume_estimation") to
+    # load at startup instead of on the first request
+    prewarm_models: str = ""
 
     # Rate Limiting
     rate_limit_per_minute: int = 60
@@ -68,6 +71,11 @@ class Settings(BaseSettings):
         """Parse CORS origins into a list"""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def prewarm_models_list(self) -> list[str]:
+        """Parse model types to prewarm into a list"""
+        return [model.strip() for model in self.prewarm_models.split(",") if model.strip()]
+
 
 # Global settings instance
 settings = Settings()
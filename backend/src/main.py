@@ -1,5 +1,8 @@
 """Main FastAPI application entry point"""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
@@ -14,6 +17,7 @@ from src.api.feedback_routes import router as feedback_router
 from src.api.report_routes import router as report_router
 from src.api.websocket_routes import router as websocket_router
 from src.config import settings
+from src.ai_models.model_loader import ModelType, model_loader
 
 # Configure logging
 logging.basicConfig(
@@ -21,10 +25,21 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load configured models before serving, so first requests skip model loading"""
+    model_types = [ModelType(model) for model in settings.prewarm_models_list]
+    if model_types:
+        await asyncio.to_thread(model_loader.prewarm, model_types)
+    yield
+
+
 app = FastAPI(
     title="CompanyCam Photo Detection API",
     description="Backend API for photo detection and classification system with JWT authentication",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
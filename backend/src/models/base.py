@@ -16,7 +16,6 @@ class BaseModel(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        unique=True,
         nullable=False,
     )
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
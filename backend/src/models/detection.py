@@ -1,6 +1,6 @@
 """Detection model"""
 
-from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Integer, REAL, Boolean, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
@@ -16,16 +16,15 @@ class Detection(BaseModel):
 
     photo_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("photos.id", ondelete="CASCADE"),
+        ForeignKey("photos.id", ondelete="CASCADE", deferrable=True, initially="DEFERRED"),
         nullable=False,
-        index=True,
     )
     detection_type = Column(
         String(50), nullable=False, index=True
     )  # damage, material, volume
     model_version = Column(String(100), nullable=True)
     results = Column(JSONB, nullable=False)  # JSON with bounding boxes, classes, etc.
-    confidence = Column(Float, nullable=True)
+    confidence = Column(REAL, nullable=True)
     processing_time_ms = Column(Integer, nullable=True)
     user_confirmed = Column(Boolean, default=False, nullable=False, index=True)
     user_feedback = Column(JSONB, nullable=True)  # User corrections and confirmations
@@ -49,6 +48,17 @@ class Detection(BaseModel):
             "processing_time_ms > 0",
             name="check_processing_time_positive",
         ),
+        Index(
+            "ix_detections_photo_id",
+            "photo_id",
+            postgresql_include=["detection_type", "confidence", "created_at"],
+        ),
+        Index(
+            "ix_detections_results",
+            "results",
+            postgresql_using="gin",
+            postgresql_ops={"results": "jsonb_path_ops"},
+        ),
     )
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 """Detection Result History model for tracking version changes"""
 
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
@@ -18,7 +18,6 @@ class DetectionHistory(BaseModel):
         UUID(as_uuid=True),
         ForeignKey("detections.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     version = Column(Integer, nullable=False)  # Incremental version number
     detection_type = Column(String(50), nullable=False)
@@ -36,5 +35,14 @@ class DetectionHistory(BaseModel):
     detection = relationship("Detection", back_populates="history")
     user = relationship("User")
 
+    # Indexes
+    __table_args__ = (
+        Index(
+            "ix_detection_history_detection_id_version",
+            detection_id,
+            version.desc(),
+        ),
+    )
+
     def __repr__(self):
         return f"<DetectionHistory(id={self.id}, detection_id={self.detection_id}, version={self.version})>"
@@ -1,6 +1,6 @@
 """Photo model"""
 
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
@@ -25,10 +25,16 @@ class Photo(BaseModel):
     __tablename__ = "photos"
 
     user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("users.id", deferrable=True, initially="DEFERRED"),
+        nullable=False,
+        index=True,
     )
     project_id = Column(
-        UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", deferrable=True, initially="DEFERRED"),
+        nullable=False,
+        index=True,
     )
     s3_url = Column(Text, nullable=False)
     s3_key = Column(String(500), nullable=True, unique=True)
@@ -43,7 +49,6 @@ class Photo(BaseModel):
         nullable=False,
         default=PhotoStatus.PENDING_UPLOAD,
         server_default=PhotoStatus.PENDING_UPLOAD.value,
-        index=True
     )
 
     # Relationships
@@ -57,5 +62,20 @@ class Photo(BaseModel):
         "ProcessingJob", back_populates="photo", cascade="all, delete-orphan"
     )
 
+    # Indexes
+    __table_args__ = (
+        Index(
+            "ix_photos_status",
+            "status",
+            postgresql_where=text("status IN ('pending_upload', 'uploaded', 'processing')"),
+        ),
+        Index(
+            "ix_photos_exif_data",
+            "exif_data",
+            postgresql_using="gin",
+            postgresql_ops={"exif_data": "jsonb_path_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<Photo(id={self.id}, s3_key={self.s3_key})>"
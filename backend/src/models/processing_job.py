@@ -1,6 +1,6 @@
 """Processing job model for tracking async message processing"""
 
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
@@ -30,7 +30,7 @@ class ProcessingJob(BaseModel):
     )
     queue_name = Column(String(100), nullable=True)
     message_id = Column(String(255), nullable=True, index=True)
-    status = Column(String(50), nullable=False, index=True)
+    status = Column(String(50), nullable=False)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
@@ -40,5 +40,15 @@ class ProcessingJob(BaseModel):
     # Relationships
     photo = relationship("Photo", back_populates="processing_jobs")
 
+    # Indexes
+    __table_args__ = (
+        Index(
+            "ix_processing_jobs_status_created_at",
+            "status",
+            "created_at",
+            postgresql_where=text("status <> 'completed'"),
+        ),
+    )
+
     def __repr__(self):
         return f"<ProcessingJob(id={self.id}, photo_id={self.photo_id}, status={self.status})>"
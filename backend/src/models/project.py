@@ -15,7 +15,10 @@ class Project(BaseModel):
     __tablename__ = "projects"
 
     organization_id = Column(
-        UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", deferrable=True, initially="DEFERRED"),
+        nullable=False,
+        index=True,
     )
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
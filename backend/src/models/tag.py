@@ -1,6 +1,6 @@
 """Tag model"""
 
-from sqlalchemy import Column, String, Float, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, REAL, ForeignKey, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
@@ -16,14 +16,14 @@ class Tag(BaseModel):
 
     photo_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("photos.id", ondelete="CASCADE"),
+        ForeignKey("photos.id", ondelete="CASCADE", deferrable=True, initially="DEFERRED"),
         nullable=False,
         index=True,
     )
     tag = Column(String(100), nullable=False, index=True)
     source = Column(String(20), default="ai", nullable=False)  # ai, user
     confidence = Column(
-        Float, nullable=True
+        REAL, nullable=True
     )  # NULL if user-generated, confidence if AI
 
     # Relationships
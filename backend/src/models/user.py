@@ -22,7 +22,10 @@ class User(BaseModel):
         String(50), default="contractor", nullable=False
     )  # contractor, insurance_adjuster, project_manager, admin
     organization_id = Column(
-        UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", deferrable=True, initially="DEFERRED"),
+        nullable=False,
+        index=True,
     )
 
     # Relationships
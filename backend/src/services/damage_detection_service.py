@@ -8,7 +8,7 @@ from PIL import Image
 import io
 
 from src.ai_models.model_loader import model_loader
-from src.ai_models.damage_detection import DamageDetectionConfig
+from src.ai_models.damage_detection import DamageDetectionConfig, default_config
 from src.schemas.damage_detection import (
     DamageDetectionResponse,
     BatchDamageDetectionRequest,
@@ -32,7 +32,7 @@ class DamageDetectionService:
         config: Optional[DamageDetectionConfig] = None,
     ):
         self.s3_service = s3_service or S3Service()
-        self.config = config or DamageDetectionConfig()
+        self.config = config or default_config
         self.pipeline = None
         logger.info("Initialized DamageDetectionService")
 
@@ -111,12 +111,14 @@ class DamageDetectionService:
             # Download image
             image = await self.download_image_from_url(photo_url)
 
-            # Update config if threshold provided
+            # Request overrides apply to this request only: derive a local config and
+            # pass it per call, leaving self.config and the shared pipeline untouched
+            overrides = {"enable_segmentation": include_segmentation}
             if confidence_threshold is not None:
-                self.config.detector.confidence_threshold = confidence_threshold
-
-            # Update segmentation flag
-            self.config.enable_segmentation = include_segmentation
+                overrides["detector"] = self.config.detector.model_copy(
+                    update={"confidence_threshold": confidence_threshold}
+                )
+            request_config = self.config.model_copy(update=overrides)
 
             # Get pipeline
             pipeline = self._get_pipeline()
@@ -129,6 +131,7 @@ class DamageDetectionService:
                 image,
                 self.s3_service if include_segmentation else None,
                 photo_id,
+                request_config,
             )
 
             logger.info(
@@ -136,6 +136,25 @@ class TestDamageDetectionService:
         for detection in response.detections:
             assert detection.confidence >= 0.9
 
+    @pytest.mark.asyncio
+    async def test_detect_damage_overrides_do_not_persist(self, service):
+        """Test request overrides apply to that request only"""
+        service_config = service.config
+        pipeline = service._get_pipeline()
+        pipeline_config = pipeline.config
+        detector_config = pipeline.detector.config
+
+        await service.detect_damage(
+            photo_url="s3://test-bucket/photo.jpg",
+            confidence_threshold=0.95,
+            include_segmentation=False,
+        )
+
+        # Neither the service nor the shared pipeline picked up the overrides
+        assert service.config is service_config
+        assert pipeline.config is pipeline_config
+        assert pipeline.detector.config is detector_config
+
     @pytest.mark.asyncio
     async def test_detect_damage_batch(self, service):
         """Test batch damage detection"""
@@ -76,7 +76,9 @@ class TestDamageDetector:
 
     def test_detect_filters_by_confidence(self, detector, sample_image):
         """Test that detections are filtered by confidence threshold"""
-        detector.config.confidence_threshold = 0.9  # High threshold
+        detector.config = detector.config.model_copy(
+            update={"confidence_threshold": 0.9}  # High threshold
+        )
         detections = detector.detect(sample_image)
 
         # All detections should meet threshold
@@ -84,7 +86,7 @@ class TestDamageDetector:
 
     def test_detect_respects_max_detections(self, detector, sample_image):
         """Test that max detections limit is respected"""
-        detector.config.max_detections = 3
+        detector.config = detector.config.model_copy(update={"max_detections": 3})
         detections = detector.detect(sample_image)
 
         assert len(detections) <= 3
@@ -142,6 +144,14 @@ class TestDamageDetector:
         assert stats["model_loaded"] is True
         assert stats["inference_count"] > 0
 
+    def test_get_inference_stats_config_is_a_copy(self, detector):
+        """Test mutating one stats dump does not leak into later ones"""
+        stats = detector.get_inference_stats()
+        stats["config"]["confidence_threshold"] = 0.0
+        stats["config"].clear()
+
+        assert detector.get_inference_stats()["config"]["confidence_threshold"] == 0.7
+
     def test_detect_with_different_image_sizes(self, detector):
         """Test detection with various image sizes"""
         test_sizes = [
@@ -193,3 +203,34 @@ class TestDamageDetector:
         # Should keep highest confidence detections
         assert len(result) <= len(detections)
         assert all(isinstance(d, DetectionResult) for d in result)
+
+    def test_detect_batch_returns_results_per_image(self, detector, sample_image):
+        """Test batch detection returns one filtered result list per image"""
+        images = [sample_image, sample_image.copy(), sample_image.copy()]
+
+        results = detector.detect_batch(images)
+
+        assert len(results) == len(images)
+        assert detector.inference_count == len(images)
+        for detections in results:
+            assert all(isinstance(d, DetectionResult) for d in detections)
+            assert all(
+                d.confidence >= detector.config.confidence_threshold for d in detections
+            )
+
+    def test_detect_batch_empty(self, detector):
+        """Test batch detection with no images"""
+        assert detector.detect_batch([]) == []
+
+    def test_load_model_prefers_existing_engine(self, detector, tmp_path):
+        """Test a configured TensorRT engine is used only when the file exists"""
+        from src.ai_models.damage_detection.config import resolve_weights_path
+
+        engine_path = tmp_path / "damage_yolov8.engine"
+        config = detector.config.model_copy(update={"engine_path": str(engine_path)})
+
+        # Missing engine falls back to the framework weights
+        assert resolve_weights_path(config) == config.model_path
+
+        engine_path.write_bytes(b"engine")
+        assert resolve_weights_path(config) == str(engine_path)
@@ -89,10 +89,73 @@ class TestDamageDetectionPipeline:
         if response.detections:
             assert mock_s3_service.upload_bytes.called
 
+    def test_process_image_uploads_one_mask_per_detection_in_order(
+        self, pipeline, sample_image, mock_s3_service
+    ):
+        """Test concurrent detection processing keeps detection order and mask keys"""
+        response = pipeline.process_image(
+            sample_image, s3_service=mock_s3_service, photo_id="test_photo"
+        )
+
+        uploaded_keys = sorted(
+            call.args[1] for call in mock_s3_service.upload_bytes.call_args_list
+        )
+        expected_keys = sorted(
+            f"{pipeline.config.s3_prefix}test_photo_damage{idx}.png"
+            for idx in range(len(response.detections))
+        )
+        assert uploaded_keys == expected_keys
+
+    def test_process_image_reuses_cached_result_for_same_image(self, pipeline, sample_image):
+        """Test resubmitting identical pixels is answered from the result cache"""
+        first = pipeline.process_image(sample_image)
+        detector_calls = pipeline.detector.inference_count
+
+        second = pipeline.process_image(sample_image.copy())
+
+        assert pipeline.detector.inference_count == detector_calls
+        assert second.detections == first.detections
+        assert second.tags == first.tags
+
+    def test_result_cache_disabled(self, pipeline, sample_image):
+        """Test a zero cache size always runs inference"""
+        config = pipeline.config.model_copy(update={"result_cache_size": 0})
+
+        pipeline.process_image(sample_image, config=config)
+        pipeline.process_image(sample_image, config=config)
+
+        assert pipeline.detector.inference_count == 2
+
+    def test_result_cache_disabled_skips_hashing(self, pipeline, sample_image):
+        """Test a zero cache size does not hash the image at all"""
+        config = pipeline.config.model_copy(update={"result_cache_size": 0})
+
+        with patch("src.ai_models.damage_detection.pipeline.xxhash") as mock_xxhash:
+            pipeline.process_image(sample_image, config=config)
+
+        mock_xxhash.xxh3_128_hexdigest.assert_not_called()
+
+    def test_process_image_without_detections(self, pipeline, sample_image):
+        """Test negative images short-circuit to an empty response"""
+        pipeline.load_models()
+        pipeline.detector.detect = Mock(return_value=[])
+        pipeline.segmenter.segment = Mock()
+        pipeline.severity_classifier.classify_severity = Mock()
+
+        response = pipeline.process_image(sample_image)
+
+        assert response.detections == []
+        assert response.tags == ["no_damage_detected"]
+        assert response.confidence == 0.0
+        assert response.summary.total_damage_area_percentage == 0.0
+        assert set(response.summary.damage_type_distribution.values()) == {0}
+        pipeline.segmenter.segment.assert_not_called()
+        pipeline.severity_classifier.classify_severity.assert_not_called()
+
     def test_process_image_without_segmentation(self, pipeline, sample_image):
         """Test processing without segmentation"""
-        pipeline.config.enable_segmentation = False
-        response = pipeline.process_image(sample_image)
+        config = pipeline.config.model_copy(update={"enable_segmentation": False})
+        response = pipeline.process_image(sample_image, config=config)
 
         # Segmentation masks should be None
         for detection in response.detections:
@@ -100,8 +163,8 @@ class TestDamageDetectionPipeline:
 
     def test_process_image_without_severity(self, pipeline, sample_image):
         """Test processing without severity classification"""
-        pipeline.config.enable_severity = False
-        response = pipeline.process_image(sample_image)
+        config = pipeline.config.model_copy(update={"enable_severity": False})
+        response = pipeline.process_image(sample_image, config=config)
 
         # Should still return valid response
         assert isinstance(response, DamageDetectionResponse)
@@ -178,6 +241,30 @@ class TestDamageDetectionPipeline:
         for photo_id in photo_ids:
             assert photo_id in results
 
+    def test_batch_processing_uploads_masks(self, pipeline, mock_s3_service):
+        """Test batched processing uploads one mask per detection with per-photo keys"""
+        images = [
+            Image.fromarray(
+                np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8), mode="RGB"
+            )
+            for _ in range(3)
+        ]
+        photo_ids = ["photo1", "photo2", "photo3"]
+
+        results = pipeline.process_batch(
+            images, s3_service=mock_s3_service, photo_ids=photo_ids
+        )
+
+        expected_keys = sorted(
+            f"{pipeline.config.s3_prefix}{photo_id}_damage{idx}.png"
+            for photo_id in photo_ids
+            for idx in range(len(results[photo_id].detections))
+        )
+        uploaded_keys = sorted(
+            call.args[1] for call in mock_s3_service.upload_bytes.call_args_list
+        )
+        assert uploaded_keys == expected_keys
+
     def test_batch_processing_error_handling(self, pipeline):
         """Test batch processing handles errors gracefully"""
         # Mix of valid and invalid images
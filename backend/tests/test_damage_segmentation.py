@@ -186,3 +186,47 @@ class TestDamageSegmenter:
         mask2, area2 = segmenter.segment(sample_image, edge_box)
         assert isinstance(mask2, Image.Image)
         assert 0.0 <= area2 <= 100.0
+
+    def test_segment_batch_matches_single_segmentation(self, segmenter, sample_image):
+        """Test batch segmentation returns one mask per ROI in input order"""
+        image_array = np.asarray(sample_image)
+        boxes = [
+            BoundingBox(x=10, y=10, width=50, height=50),
+            BoundingBox(x=100, y=100, width=200, height=150),
+        ]
+
+        results = segmenter.segment_batch([image_array] * len(boxes), boxes)
+
+        assert len(results) == len(boxes)
+        assert segmenter.inference_count == len(boxes)
+        for (mask, area_pct), bbox in zip(results, boxes):
+            assert mask.size == (bbox.width, bbox.height)
+            _, expected_area = segmenter.segment(image_array, bbox)
+            assert area_pct == pytest.approx(expected_area)
+
+    def test_preprocess_roi_from_downscaled_source(
+        self, segmenter, sample_image, sample_bounding_box
+    ):
+        """Test ROIs can be cropped from a downscaled copy of the image"""
+        from src.ai_models.damage_detection.preprocessing import downscale_for_rois
+
+        source, scale = downscale_for_rois(np.asarray(sample_image), max_dimension=320)
+
+        assert scale == pytest.approx(0.5)
+        assert source.shape == (240, 320, 3)
+
+        processed, original_size = segmenter.preprocess_roi(source, sample_bounding_box, scale)
+
+        assert processed.shape == (512, 512, 3)
+        # Original size is still reported in full-resolution coordinates
+        assert original_size == (sample_bounding_box.width, sample_bounding_box.height)
+
+    def test_downscale_for_rois_keeps_small_images(self, sample_image):
+        """Test images within the limit are returned unchanged"""
+        from src.ai_models.damage_detection.preprocessing import downscale_for_rois
+
+        image_array = np.asarray(sample_image)
+        source, scale = downscale_for_rois(image_array, max_dimension=4096)
+
+        assert source is image_array
+        assert scale == 1.0
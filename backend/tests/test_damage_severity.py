@@ -247,3 +247,41 @@ class TestSeverityClassifier:
 
             assert isinstance(severity, DamageSeverity)
             assert 0.0 <= confidence <= 1.0
+
+    def test_classify_severity_batch(self, classifier, sample_image):
+        """Test batch classification returns one result per ROI"""
+        image_array = np.asarray(sample_image)
+        boxes = [
+            BoundingBox(x=10, y=10, width=30, height=30),
+            BoundingBox(x=100, y=100, width=250, height=200),
+        ]
+
+        results = classifier.classify_severity_batch(
+            [image_array] * len(boxes),
+            boxes,
+            [DamageType.HAIL_DAMAGE, DamageType.WIND_DAMAGE],
+            [0.85, 0.9],
+        )
+
+        assert len(results) == len(boxes)
+        assert classifier.inference_count == len(boxes)
+        for severity, confidence in results:
+            assert isinstance(severity, DamageSeverity)
+            assert classifier.config.confidence_threshold <= confidence <= 1.0
+
+    def test_mock_severity_batch_area_based(self, classifier):
+        """Test vectorized mock classification follows the same area thresholds"""
+        small_box = BoundingBox(x=0, y=0, width=50, height=50)
+        large_box = BoundingBox(x=0, y=0, width=300, height=300)
+        boxes = [small_box] * 20 + [large_box] * 20
+
+        results = classifier._classify_mock_severity_batch(
+            [DamageType.HAIL_DAMAGE] * len(boxes), [0.85] * len(boxes), boxes
+        )
+
+        for severity, _ in results[:20]:
+            assert severity in [DamageSeverity.MINOR, DamageSeverity.MODERATE]
+        for severity, _ in results[20:]:
+            assert severity in [DamageSeverity.MODERATE, DamageSeverity.SEVERE]
+        for _, confidence in results:
+            assert classifier.config.confidence_threshold <= confidence <= 1.0
@@ -20,6 +20,14 @@ def depth_estimator(depth_config):
     return estimator
 
 
+@pytest.fixture
+def caching_depth_estimator(depth_config):
+    """Create and load depth estimator with the prediction cache enabled"""
+    estimator = DepthEstimator(depth_config, enable_caching=True)
+    estimator.load_model()
+    return estimator
+
+
 @pytest.fixture
 def sample_image():
     """Create a sample RGB image"""
@@ -53,6 +61,41 @@ def test_preprocess_image(depth_estimator, sample_image):
     assert preprocessed.dtype == np.float32
 
 
+def test_preprocess_image_imagenet_normalization(depth_estimator, sample_image):
+    """Test fused normalization matches the reference ImageNet formula"""
+    import cv2
+
+    preprocessed = depth_estimator.preprocess_image(sample_image)
+
+    h, w = sample_image.shape[:2]
+    scale = depth_estimator.config.input_size / max(h, w)
+    resized = cv2.resize(
+        sample_image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA
+    )
+    mean = np.array([0.485, 0.456, 0.406])
+    std = np.array([0.229, 0.224, 0.225])
+    expected = (resized / 255.0 - mean) / std
+
+    assert np.allclose(preprocessed, expected, atol=1e-4)
+
+
+def test_preprocess_image_cubic_interpolation(sample_image):
+    """Test cubic_interpolation keeps INTER_CUBIC for quality-sensitive callers"""
+    import cv2
+
+    estimator = DepthEstimator(
+        DepthEstimationConfig(device="cpu", normalize=False, cubic_interpolation=True)
+    )
+
+    preprocessed = estimator.preprocess_image(sample_image)
+
+    scale = estimator.config.input_size / 640
+    expected = cv2.resize(
+        sample_image, (int(640 * scale), int(480 * scale)), interpolation=cv2.INTER_CUBIC
+    )
+    assert np.allclose(preprocessed, expected / 255.0, atol=1e-6)
+
+
 def test_estimate_depth(depth_estimator, sample_image):
     """Test depth estimation"""
     depth_map, metadata = depth_estimator.estimate_depth(sample_image)
@@ -82,6 +125,25 @@ def test_normalize_depth_map(depth_estimator):
     assert normalized.shape == depth_map.shape
 
 
+def test_normalize_depth_map_matches_percentile_clipping(depth_estimator):
+    """Test in-place normalization matches clip-then-rescale on a copy"""
+    depth_map = np.random.rand(120, 80).astype(np.float32) * 50 + 10
+
+    p_min, p_max = np.percentile(depth_map, [2, 98])
+    clipped = np.clip(depth_map, p_min, p_max)
+    expected = (clipped - clipped.min()) / (clipped.max() - clipped.min())
+
+    normalized = depth_estimator._normalize_depth_map(depth_map)
+
+    assert normalized is depth_map
+    assert normalized.min() == 0.0
+    assert normalized.max() == 1.0
+    assert np.allclose(normalized, expected, atol=1e-5)
+
+    flat = depth_estimator._normalize_depth_map(np.full((10, 10), 3.0, dtype=np.float32))
+    assert not flat.any()
+
+
 def test_estimate_confidence(depth_estimator):
     """Test confidence estimation"""
     # Good depth map - medium variance
@@ -96,6 +158,35 @@ def test_estimate_confidence(depth_estimator):
     assert confidence_flat < confidence_good  # Should have lower confidence
 
 
+@pytest.mark.parametrize(
+    "std,expected",
+    [(0.05, 0.6), (0.15, 0.9), (0.25, 0.9), (0.35, 0.9), (0.5, 0.75)],
+)
+def test_estimate_confidence_bands(depth_estimator, std, expected):
+    """Test confidence bands from precomputed stats, including the band edges"""
+    stats = {"min": 0.0, "max": 1.0, "mean": 0.5, "std": std}
+    assert depth_estimator._estimate_confidence(None, stats) == expected
+
+
+def test_normalized_depth_stats(depth_estimator):
+    """Test single-pass depth stats agree with the full numpy reductions"""
+    depth_map = depth_estimator._normalize_depth_map(
+        np.random.rand(120, 160).astype(np.float32) * 10
+    )
+
+    stats = depth_estimator._normalized_depth_stats(depth_map)
+
+    assert stats["min"] == float(depth_map.min())
+    assert stats["max"] == float(depth_map.max())
+    assert stats["mean"] == pytest.approx(float(depth_map.mean()), abs=1e-6)
+    assert stats["std"] == pytest.approx(float(depth_map.std()), abs=1e-5)
+
+    flat = np.zeros((10, 10), dtype=np.float32)
+    flat_stats = depth_estimator._normalized_depth_stats(flat)
+    assert flat_stats == {"min": 0.0, "max": 0.0, "mean": 0.0, "std": 0.0}
+    assert depth_estimator._estimate_confidence(flat, flat_stats) == 0.3
+
+
 def test_create_depth_visualization(depth_estimator, sample_image):
     """Test depth map visualization"""
     depth_map, _ = depth_estimator.estimate_depth(sample_image)
@@ -109,9 +200,9 @@ def test_create_depth_visualization(depth_estimator, sample_image):
 
 def test_get_stats(depth_estimator, sample_image):
     """Test statistics retrieval"""
-    # Run some inferences
-    depth_estimator.estimate_depth(sample_image)
+    # Run some inferences (distinct images, so neither is a cache hit)
     depth_estimator.estimate_depth(sample_image)
+    depth_estimator.estimate_depth(255 - sample_image)
 
     stats = depth_estimator.get_stats()
 
@@ -132,3 +223,125 @@ def test_mock_depth_model():
     assert depth_map.shape == image.shape[:2]
     assert depth_map.dtype == np.float32
     assert depth_map.min() >= 0.0
+
+
+def test_mock_depth_model_gradient():
+    """Test mock depth increases from top (far) to bottom (near)"""
+    model = MockDepthModel("DPT_Large", "cpu")
+
+    # Uniform mid-gray image, so only the gradient and noise vary
+    image = np.full((200, 300, 3), 0.5, dtype=np.float32)
+
+    depth_map = model.predict(image)
+    row_means = depth_map.mean(axis=1)
+
+    # Expected row means follow 0.6 * gradient + 0.4 * (1 - luminance)
+    assert row_means[2] == pytest.approx(0.6 * 0.3 + 0.4 * 0.5, abs=0.02)
+    assert row_means[-3] == pytest.approx(0.6 * 1.0 + 0.4 * 0.5, abs=0.02)
+
+    # A second image of the same height reuses the cached gradient
+    model.predict(image)
+    assert list(model._row_offsets) == [200]
+
+
+def test_estimate_depth_native_resolution(depth_estimator, sample_image):
+    """Test depth map can be returned at model resolution without upscaling"""
+    depth_map, metadata = depth_estimator.estimate_depth(
+        sample_image, return_native_resolution=True
+    )
+
+    input_size = depth_estimator.config.input_size
+    assert max(depth_map.shape) == input_size
+    assert metadata["output_size"] == depth_map.shape
+    assert metadata["original_size"] == sample_image.shape[:2]
+    assert metadata["resolution_scale"] == pytest.approx(input_size / 640)
+    assert depth_map.min() >= 0.0
+    assert depth_map.max() <= 1.0
+
+
+def test_estimate_depth_result_cache(caching_depth_estimator, sample_image):
+    """Test repeat images reuse the cached model-resolution prediction"""
+    estimator = caching_depth_estimator
+    depth_map, metadata = estimator.estimate_depth(sample_image)
+    cached_map, cached_metadata = estimator.estimate_depth(sample_image.copy())
+
+    assert estimator._inference_count == 1
+    assert cached_metadata["cached"] is True
+    assert "cached" not in metadata
+    assert np.array_equal(cached_map, depth_map)
+
+    # Callers get their own copy
+    cached_map[:] = 0
+    again, _ = estimator.estimate_depth(sample_image)
+    assert np.array_equal(again, depth_map)
+
+    # Native-resolution output comes from the same cached prediction
+    native_map, native_metadata = estimator.estimate_depth(
+        sample_image, return_native_resolution=True
+    )
+    assert estimator._inference_count == 1
+    assert native_metadata["cached"] is True
+    assert max(native_map.shape) == estimator.config.input_size
+
+    # Only the model-resolution prediction is stored
+    assert estimator._result_cache_bytes == native_map.nbytes
+
+
+def test_estimate_depth_result_cache_disabled(depth_config, sample_image):
+    """Test predictions are not cached unless caching is enabled with a byte budget"""
+    no_budget = DepthEstimationConfig(device="cpu", result_cache_max_bytes=0)
+    for estimator in (
+        DepthEstimator(depth_config),
+        DepthEstimator(no_budget, enable_caching=True),
+    ):
+        estimator.load_model()
+
+        estimator.estimate_depth(sample_image)
+        estimator.estimate_depth(sample_image)
+
+        assert estimator._inference_count == 2
+        assert not estimator._result_cache
+
+
+def test_estimate_depth_result_cache_byte_budget(sample_image):
+    """Test the prediction cache evicts least recently used entries past its byte budget"""
+    # A 640x480 image is predicted at 384x288 float32 (442,368 bytes): room for one
+    config = DepthEstimationConfig(device="cpu", result_cache_max_bytes=500_000)
+    estimator = DepthEstimator(config, enable_caching=True)
+    estimator.load_model()
+
+    estimator.estimate_depth(sample_image)
+    estimator.estimate_depth(255 - sample_image)
+    assert len(estimator._result_cache) == 1
+    assert estimator._result_cache_bytes == 384 * 288 * 4
+
+    estimator.estimate_depth(sample_image)
+    assert estimator._inference_count == 3
+
+
+def test_estimate_depth_batch(caching_depth_estimator, sample_image):
+    """Test batched depth estimation letterboxes mixed sizes into one forward pass"""
+    depth_estimator = caching_depth_estimator
+    portrait = np.random.randint(0, 255, (300, 200, 3), dtype=np.uint8)
+    small = np.random.randint(0, 255, (100, 150, 3), dtype=np.uint8)
+
+    # Cached images skip the batch
+    depth_estimator.estimate_depth(small)
+
+    results = depth_estimator.estimate_depth_batch([sample_image, portrait, small])
+
+    assert len(results) == 3
+    for image, (depth_map, metadata) in zip([sample_image, portrait, small], results):
+        assert depth_map.shape == image.shape[:2]
+        assert depth_map.dtype == np.float32
+        assert depth_map.min() >= 0.0
+        assert depth_map.max() <= 1.0
+        assert 0.0 <= metadata["confidence"] <= 1.0
+
+    assert results[1][1]["input_size"] == (384, 256, 3)
+    assert results[2][1]["cached"] is True
+    assert depth_estimator._inference_count == 3
+
+    native = depth_estimator.estimate_depth_batch([portrait], return_native_resolution=True)
+    assert native[0][0].shape == (384, 256)
+    assert depth_estimator.estimate_depth_batch([]) == []
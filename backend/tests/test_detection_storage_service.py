@@ -54,7 +54,7 @@ class TestDetectionStorageService:
         assert detection.detection_type == "damage"
         assert detection.model_version == "damage-v1.2.0"
         assert detection.results == results
-        assert detection.confidence == 0.92
+        assert detection.confidence == pytest.approx(0.92)
         assert detection.processing_time_ms == 500
         assert detection.user_confirmed is False
 
@@ -107,7 +107,7 @@ class TestDetectionStorageService:
 
         assert updated.id == detection.id
         assert updated.results == updated_results
-        assert updated.confidence == 0.92
+        assert updated.confidence == pytest.approx(0.92)
 
         # Check history was created
         history = storage_service.get_detection_history(detection.id)
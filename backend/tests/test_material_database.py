@@ -3,6 +3,7 @@
 import pytest
 
 from src.ai_models.material_detection import MaterialDatabase, get_material_database
+from src.ai_models.material_detection.material_database import MaterialInfo, make_brand_tag
 from src.schemas.material_detection import MaterialUnit
 
 
@@ -17,10 +18,21 @@ def material_db():
 
 
 def test_database_initialization(material_db):
-    """Test database initializes correctly"""
-    assert not material_db._loaded
-    assert material_db.materials == {}
-    assert material_db.brands == {}
+    """Test database loads on construction"""
+    assert material_db._loaded
+    assert len(material_db.materials) > 0
+    assert len(material_db.brands) > 0
+
+
+def test_database_load_is_idempotent(material_db):
+    """Test calling load again keeps the already loaded data"""
+    materials = dict(material_db.materials)
+    brand_count = material_db.get_stats()["total_brands"]
+
+    material_db.load()
+
+    assert material_db.materials == materials
+    assert material_db.get_stats()["total_brands"] == brand_count
 
 
 def test_database_load(material_db):
@@ -59,6 +71,19 @@ def test_database_get_material_unit(material_db):
     assert unit == MaterialUnit.SHEETS
 
 
+def test_material_info_unknown_unit_falls_back_to_units():
+    """Test unrecognized units resolve to the generic units enum"""
+    info = MaterialInfo({
+        "type": "gravel",
+        "unit": "scoops",
+        "description": "Loose gravel",
+        "detection_class": "gravel",
+    })
+
+    assert info.unit == "scoops"
+    assert info.unit_enum == MaterialUnit.UNITS
+
+
 def test_database_get_brands_for_material(material_db):
     """Test getting brands for material type"""
     material_db.load()
@@ -135,6 +160,74 @@ def test_database_search_brands_threshold(material_db):
         assert score >= 95
 
 
+def test_database_search_brands_best_score_per_brand(material_db):
+    """Test a brand matched by several patterns is returned once with its best score"""
+    material_db.load()
+
+    # "owens" is both an alias (95) and a logo keyword (85) of Owens Corning
+    matches = material_db.search_brands("shingles", "owens shingles")
+
+    assert [(brand.name, score) for brand, score in matches] == [("Owens Corning", 95)]
+
+
+def test_database_search_brands_exact_threshold(material_db):
+    """Test threshold 100 only returns literal brand-name matches"""
+    material_db.load()
+
+    # Alias ("Owens") and misspelled name must not match at threshold 100
+    assert material_db.search_brands("shingles", "Owens Tamk0", threshold=100) == []
+
+    matches = material_db.search_brands("shingles", "GAF Timberline", threshold=100)
+    assert [(brand.name, score) for brand, score in matches] == [("GAF", 100)]
+
+
+def test_database_search_brands_fuzzy_typo(material_db):
+    """Test fuzzy search matches a misspelled brand name"""
+    material_db.load()
+
+    # "Weyerhaeuser" with a dropped letter, so no literal substring match
+    matches = material_db.search_brands("plywood", "Weyerhaeusr OSB", threshold=80)
+
+    assert len(matches) > 0
+    best_brand, score = matches[0]
+    assert best_brand.name == "Weyerhaeuser"
+    assert 80 <= score < 100
+
+    # One entry per brand even when several of its aliases match
+    assert len({id(brand) for brand, _ in matches}) == len(matches)
+
+
+def test_database_search_brands_short_query_no_fuzzy_match(material_db):
+    """Test short OCR fragments do not fuzzy-match longer brand names"""
+    # "in" is a substring of "Owens Corning", which partial_ratio alone scores 100
+    assert material_db.search_brands("shingles", "in") == []
+    assert material_db.search_brands("shingles", "rni") == []
+
+
+def test_database_search_brands_keyword_below_threshold(material_db):
+    """Test a literal keyword hit below the threshold is not re-scored by the fuzzy pass"""
+    # "corning" is only a logo keyword (85) of Owens Corning
+    assert material_db.search_brands("shingles", "corning shingles", threshold=90) == []
+
+    matches = material_db.search_brands("shingles", "corning shingles", threshold=80)
+    assert [(brand.name, score) for brand, score in matches] == [("Owens Corning", 85)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["GAF Timberline", "Owens Tamk0", "Weyerhaeusr OSB", "Tamko Heritage", "certainteed", "xyz"],
+)
+def test_database_search_brands_exact_threshold_is_subset(material_db, text):
+    """Test threshold 100 returns a subset of threshold 99 for the same text"""
+    for material_type in ("shingles", "plywood"):
+        strict = material_db.search_brands(material_type, text, threshold=100)
+        loose = material_db.search_brands(material_type, text, threshold=99)
+
+        assert all(score == 100 for _, score in strict)
+        loose_hits = {(brand.name, score) for brand, score in loose}
+        assert {(brand.name, score) for brand, score in strict} <= loose_hits
+
+
 def test_database_get_all_material_types(material_db):
     """Test getting all material types"""
     material_db.load()
@@ -229,3 +322,48 @@ def test_database_case_insensitive_search(material_db):
     assert len(matches1) > 0
     assert len(matches2) > 0
     assert len(matches3) > 0
+
+
+def test_database_brand_tags(material_db):
+    """Test brand tags are precomputed for known brands and built for unknown ones"""
+    brand = material_db.get_brands_for_material("shingles")[0]
+
+    assert brand.tag == make_brand_tag(brand.name)
+    assert material_db.get_brand_tag(brand.name) is brand.tag
+    assert material_db.get_brand_tag("Acme Roofing Co") == "brand_acme_roofing_co"
+
+
+def test_database_shared_per_paths():
+    """Test explicit default paths reuse the same cached database"""
+    db = get_material_database()
+
+    assert get_material_database(db.materials_db_path, db.brands_db_path) is db
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_database_load_streaming_matches_full_parse(tmp_path, monkeypatch, stream):
+    """Test large (stream-parsed) and small database files load identically"""
+    from src.ai_models.material_detection import material_database
+
+    if stream:
+        monkeypatch.setattr(material_database, "STREAM_PARSE_MIN_BYTES", 0)
+
+    materials_path = tmp_path / "materials.json"
+    materials_path.write_text(
+        '{"materials": [{"type": "shingles", "unit": "bundles", "description": "Shingles",'
+        ' "detection_class": "shingles", "weight_per_unit_lbs": 72.5}]}'
+    )
+    brands_path = tmp_path / "brands.json"
+    brands_path.write_text(
+        '{"brands": {"shingles": [{"name": "GAF", "aliases": ["G.A.F."]},'
+        ' {"name": "Tamko"}], "plywood": [{"name": "Weyerhaeuser"}]}}'
+    )
+
+    db = MaterialDatabase(str(materials_path), str(brands_path))
+
+    shingles = db.get_material_info("shingles")
+    assert shingles.weight_per_unit_lbs == 72.5
+    assert isinstance(shingles.weight_per_unit_lbs, float)
+    assert [b.name for b in db.get_brands_for_material("shingles")] == ["GAF", "Tamko"]
+    assert db.find_brand_by_name("shingles", "g.a.f.").name == "GAF"
+    assert db.get_stats()["total_brands"] == 3
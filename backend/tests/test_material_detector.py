@@ -35,7 +35,7 @@ def sample_image():
 def test_detector_initialization(detector, detector_config):
     """Test detector initializes correctly"""
     assert detector.config == detector_config
-    assert not detector.model_loaded
+    assert detector.model_loaded
     assert detector.inference_count == 0
 
 
@@ -45,6 +45,22 @@ def test_detector_load_model(detector):
     assert detector.model_loaded
 
 
+def test_detector_mock_latency_env_flag(detector, monkeypatch):
+    """Test mock sleeps only run when MATERIAL_DETECT_MOCK_LATENCY=1"""
+    from src.ai_models.material_detection import config as config_module
+
+    sleeps = []
+    monkeypatch.setattr(config_module.time, "sleep", sleeps.append)
+
+    monkeypatch.delenv(config_module.MOCK_LATENCY_ENV_VAR, raising=False)
+    detector.load_model()
+    assert sleeps == []
+
+    monkeypatch.setenv(config_module.MOCK_LATENCY_ENV_VAR, "1")
+    detector.load_model()
+    assert sleeps == [0.01]
+
+
 def test_detector_preprocess_image(detector, sample_image):
     """Test image preprocessing"""
     processed_img, original_size = detector.preprocess_image(sample_image)
@@ -55,9 +71,50 @@ def test_detector_preprocess_image(detector, sample_image):
     # Check preprocessed image shape
     assert processed_img.shape == (640, 640, 3)
 
-    # Check normalization (values should be 0-1)
-    assert processed_img.min() >= 0.0
-    assert processed_img.max() <= 1.0
+    # Kept as uint8; normalization happens in the model
+    assert processed_img.dtype == np.uint8
+
+
+def test_detector_preprocess_reuses_image_bundle(detector, sample_image):
+    """Test preprocessing an ImageBundle reuses its cached resize"""
+    from src.ai_models.material_detection import ImageBundle
+
+    bundle = ImageBundle(sample_image)
+
+    first, original_size = detector.preprocess_image(bundle)
+    second, _ = detector.preprocess_image(bundle)
+
+    assert first is second
+    assert original_size == sample_image.size
+    assert np.array_equal(first, detector.preprocess_image(sample_image)[0])
+
+
+def test_detector_apply_nms(detector):
+    """Test NMS suppresses overlapping boxes of the same material type only"""
+    from src.ai_models.material_detection.detector import DetectionResult
+    from src.schemas.material_detection import BoundingBox
+
+    def make(material_type, x, confidence):
+        return DetectionResult(
+            material_type=material_type,
+            confidence=confidence,
+            bounding_box=BoundingBox(x=x, y=0, width=100, height=100, confidence=confidence),
+        )
+
+    detections = [
+        make(MaterialType.SHINGLES, 0, 0.80),
+        make(MaterialType.SHINGLES, 10, 0.90),  # IoU ~0.82 with the box above
+        make(MaterialType.PLYWOOD, 5, 0.85),  # Overlaps, but a different type
+        make(MaterialType.SHINGLES, 300, 0.70),  # No overlap
+    ]
+
+    kept = detector._apply_nms(detections)
+
+    assert [(d.material_type, d.confidence) for d in kept] == [
+        (MaterialType.SHINGLES, 0.90),
+        (MaterialType.PLYWOOD, 0.85),
+        (MaterialType.SHINGLES, 0.70),
+    ]
 
 
 def test_detector_detect(detector, sample_image):
@@ -67,7 +124,7 @@ def test_detector_detect(detector, sample_image):
     # Should return list
     assert isinstance(detections, list)
 
-    # Model should be loaded after first detection
+    # Model is loaded at construction
     assert detector.model_loaded
 
     # Should have run inference
@@ -128,11 +185,34 @@ def test_detector_multiple_images(detector):
     assert detector.inference_count == 3
 
 
+def test_detector_detect_batch(detector):
+    """Test batched detection returns per-image results in input order"""
+    sizes = [(640, 480), (320, 240), (1024, 768)]
+    images = [
+        Image.fromarray(np.random.randint(0, 255, (height, width, 3), dtype=np.uint8))
+        for width, height in sizes
+    ]
+
+    results = detector.detect_batch(images)
+
+    assert len(results) == 3
+    for (width, height), detections in zip(sizes, results):
+        assert len(detections) <= detector.config.max_detections
+        for detection in detections:
+            assert detection.confidence >= detector.config.confidence_threshold
+            assert detection.bounding_box.x + detection.bounding_box.width <= width
+            assert detection.bounding_box.y + detection.bounding_box.height <= height
+
+    # One inference counted per image
+    assert detector.inference_count == 3
+    assert detector.detect_batch([]) == []
+
+
 def test_detector_stats(detector, sample_image):
     """Test getting detector stats"""
-    # Before detection
+    # Before detection (the model is loaded at construction)
     stats = detector.get_inference_stats()
-    assert not stats["model_loaded"]
+    assert stats["model_loaded"]
     assert stats["inference_count"] == 0
 
     # After detection
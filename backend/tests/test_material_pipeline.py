@@ -9,7 +9,13 @@ from src.ai_models.material_detection import (
     MaterialDetectionConfig,
     MaterialDatabase,
 )
-from src.schemas.material_detection import MaterialType
+from src.schemas.material_detection import (
+    AlertType,
+    MaterialDetection,
+    MaterialType,
+    MaterialUnit,
+    QuantityAlert,
+)
 
 
 @pytest.fixture
@@ -208,6 +214,24 @@ def test_pipeline_batch_processing(pipeline):
         assert hasattr(response, "materials")
 
 
+def test_pipeline_batch_concurrent_keeps_order_and_failures(pipeline):
+    """Test concurrent batch processing keeps input order and isolates failures"""
+    pipeline.config.max_batch_workers = 3
+    images = [
+        Image.fromarray(np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)),
+        None,  # Invalid image fails on its own
+        Image.fromarray(np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)),
+    ]
+
+    results = pipeline.process_batch(images)
+
+    assert list(results.keys()) == ["0", "1", "2"]
+    assert results["0"] is not None
+    assert results["1"] is None
+    assert results["2"] is not None
+    assert pipeline.detector.inference_count == 2
+
+
 def test_pipeline_batch_with_expected_materials(pipeline):
     """Test batch processing with expected materials"""
     images = [
@@ -382,3 +406,41 @@ def test_pipeline_delivery_size_tags(pipeline, sample_image):
     # Only if materials detected
     if response.materials:
         assert has_size_tag
+
+
+def test_pipeline_summary_and_tags_from_single_scan(pipeline):
+    """Test summary and tags derived from the one-pass detection aggregates"""
+    detections = [
+        MaterialDetection(
+            type=MaterialType.SHINGLES, brand="Owens Corning", count=20, confidence=0.9,
+            unit=MaterialUnit.BUNDLES,
+            alert=QuantityAlert(
+                type=AlertType.UNDERAGE, message="short", variance_percentage=-20.0
+            ),
+        ),
+        MaterialDetection(
+            type=MaterialType.PLYWOOD, brand="Owens Corning", count=15, confidence=0.8,
+            unit=MaterialUnit.SHEETS,
+        ),
+        MaterialDetection(
+            type=MaterialType.SHINGLES, count=5, confidence=0.7, unit=MaterialUnit.BUNDLES,
+        ),
+    ]
+
+    summary = pipeline._generate_summary(detections)
+    assert summary.total_materials_detected == 3
+    assert summary.total_units == 40
+    assert summary.discrepancy_alerts == 1
+
+    tags = pipeline._generate_tags(detections)
+    assert tags == [
+        "delivery_confirmation",
+        "shingles",
+        "plywood",
+        "brand_owens_corning",
+        "quantity_discrepancy",
+        "underage_alert",
+        "medium_delivery",
+    ]
+
+    assert pipeline._generate_tags([]) == ["no_materials_detected"]
@@ -128,6 +128,31 @@ def test_compute_class_distribution(material_segmenter):
     assert distribution["background"] == 0.5
 
 
+def test_count_classes_shared_across_steps(material_segmenter):
+    """Test one bincount feeds both material identification and class distribution"""
+    class_map = np.zeros((100, 100), dtype=np.uint8)
+    class_map[:30, :] = 3  # Sand
+    class_map[30:40, :] = 2  # Mulch
+
+    class_counts = material_segmenter._count_classes(class_map)
+    assert class_counts.tolist() == [6000, 0, 1000, 3000, 0]
+
+    class_probs = np.full((100, 100, 5), 0.2, dtype=np.float32)
+    material_type, confidence = material_segmenter._identify_material(
+        class_map, class_probs, class_counts
+    )
+    assert material_type == "sand"
+    assert confidence == pytest.approx(0.2)
+
+    distribution = material_segmenter._compute_class_distribution(class_map, class_counts)
+    assert distribution == {
+        "background": 0.6, "gravel": 0.0, "mulch": 0.1, "sand": 0.3, "other_material": 0.0
+    }
+
+    empty = np.zeros((10, 10), dtype=np.uint8)
+    assert material_segmenter._identify_material(empty, class_probs[:10, :10]) == ("unknown", 0.0)
+
+
 def test_get_stats(material_segmenter, sample_image):
     """Test statistics retrieval"""
     # Run some segmentations
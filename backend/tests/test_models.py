@@ -177,7 +177,7 @@ class TestDetectionModel:
 
         assert detection.id is not None
         assert detection.detection_type == "damage"
-        assert detection.confidence == 0.95
+        assert detection.confidence == pytest.approx(0.95)
         assert detection.processing_time_ms == 250
         assert detection.user_confirmed is False
 
@@ -246,7 +246,7 @@ class TestTagModel:
         assert tag.id is not None
         assert tag.tag == "concrete"
         assert tag.source == "ai"
-        assert tag.confidence == 0.92
+        assert tag.confidence == pytest.approx(0.92)
 
     @pytest.mark.asyncio
     async def test_create_tag_user(self, db_session: AsyncSession, sample_photo: Photo):
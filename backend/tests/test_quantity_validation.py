@@ -197,6 +197,32 @@ def test_validator_batch_validation(validator):
     assert alerts[3].type == AlertType.OVERAGE
 
 
+def test_validator_batch_matches_single_validation(validator):
+    """Test batch validation agrees with per-item validation, including edge cases"""
+    detections = [
+        (95, 100, "bundles"),  # Exactly at the underage threshold
+        (105, 100, "bundles"),  # Exactly at the overage threshold
+        (3, None, "sheets"),   # No expected count
+        (2, 0, "bags"),        # Zero expected count
+        (0, 25, "sheets"),     # Nothing detected
+        (25, 25, "sheets"),    # Exact match
+    ]
+
+    alerts = validator.validate_batch(detections)
+    expected_alerts = [validator.validate_quantity(*d) for d in detections]
+
+    assert len(alerts) == len(expected_alerts)
+    for alert, expected in zip(alerts, expected_alerts):
+        if expected is None:
+            assert alert is None
+        else:
+            assert alert.type == expected.type
+            assert alert.variance_percentage == expected.variance_percentage
+            assert alert.message == expected.message
+
+    assert validator.validate_batch([]) == []
+
+
 def test_validator_custom_thresholds():
     """Test validator with custom thresholds"""
     # Strict thresholds (2%)
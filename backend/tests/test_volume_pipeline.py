@@ -5,7 +5,11 @@ import numpy as np
 from PIL import Image
 import io
 from src.ai_models.volume_estimation.pipeline import VolumeEstimationPipeline
-from src.ai_models.volume_estimation.config import VolumeEstimationConfig
+from src.ai_models.volume_estimation.config import (
+    DepthEstimationConfig,
+    VolumeEstimationConfig,
+    load_config,
+)
 
 
 @pytest.fixture
@@ -240,3 +244,36 @@ def test_requires_confirmation_flag(pipeline, sample_image):
         assert result["requires_confirmation"] is True
     else:
         assert result["requires_confirmation"] is False
+
+
+def test_load_config_validates_nested_mappings():
+    """Test load_config builds frozen dataclass configs from plain mappings"""
+    import dataclasses
+    from pydantic import ValidationError
+
+    config = load_config({
+        "depth_estimation": {"device": "cpu", "input_size": "256"},
+        "enable_caching": False,
+    })
+
+    assert isinstance(config.depth_estimation, DepthEstimationConfig)
+    assert config.depth_estimation.input_size == 256
+    assert config.depth_estimation.device == "cpu"
+    assert config.enable_caching is False
+    assert config.volume_calculation.default_unit == "cubic_yards"
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.enable_caching = True
+
+    with pytest.raises(ValidationError):
+        load_config({"max_image_size": "large"})
+
+
+def test_depth_cache_follows_enable_caching():
+    """Test the depth prediction cache honours VolumeEstimationConfig.enable_caching"""
+    uncached = VolumeEstimationPipeline(VolumeEstimationConfig(enable_caching=False))
+    assert uncached.depth_estimator._cache_enabled is False
+
+    cached = VolumeEstimationPipeline(VolumeEstimationConfig(cache_ttl_seconds=60))
+    assert cached.depth_estimator._cache_enabled is True
+    assert cached.depth_estimator._cache_ttl_seconds == 60